@@ -14,6 +14,7 @@ Built-in Actions:
     - push_pending_branches: Push branches with unpushed commits
     - check_manager_stages: Process issues in manager stages
     - check_custom_agent_stages: Spawn custom agents
+    - compact_archive: Pack long-finished issues into issues/archive/
 
 Naming convention: Action names match function names exactly.
 """
@@ -111,15 +112,17 @@ def ensure_stage_agents(agents_dir: Path, max_stage_age_min: int = 10, **kwargs:
     from datetime import datetime, timezone
     from agenttree.api import send_message
     from agenttree.config import load_config
-    from agenttree.issues import list_issues
+    from agenttree.issues import list_issue_summaries
     from agenttree.tmux import session_exists
 
-    config = load_config()
+    snapshot = kwargs.get("_snapshot")
+    config = snapshot.config if snapshot is not None else load_config()
 
     if not config.manager.nudge_agents:
         return
 
-    issues = list_issues(sync=False)
+    issues = snapshot.issues if snapshot is not None else list_issue_summaries()
+    has_session = snapshot.session_exists if snapshot is not None else session_exists
     ensured = 0
     now = datetime.now(timezone.utc)
 
@@ -135,8 +138,8 @@ def ensure_stage_agents(agents_dir: Path, max_stage_age_min: int = 10, **kwargs:
 
         # Only ensure if the issue recently entered its current stage.
         # Old issues without agents are handled by the stall detector.
-        if issue.history:
-            last_entry = issue.history[-1]
+        last_entry = issue.last_history
+        if last_entry:
             try:
                 stage_start = datetime.fromisoformat(
                     last_entry.timestamp.replace("Z", "+00:00")
@@ -158,7 +161,7 @@ def ensure_stage_agents(agents_dir: Path, max_stage_age_min: int = 10, **kwargs:
                 continue
 
         session_name = config.get_issue_tmux_session(issue.id, role)
-        if session_exists(session_name):
+        if has_session(session_name):
             continue
 
         console.print(f"[cyan]Ensuring agent for issue #{issue.id} ({issue.stage})...[/cyan]")
@@ -238,60 +241,19 @@ def stop_all_agents(agents_dir: Path, **kwargs: Any) -> None:
 @register_action("sync")
 def sync(agents_dir: Path, pull_only: bool = True, **kwargs: Any) -> None:
     """Sync _agenttree repo with remote (pull and optionally push).
-    
-    Note: This is a lightweight sync that doesn't run post-sync hooks.
-    Use this action within heartbeat to avoid recursive hook calls.
-    
+
+    Goes through sync_agents_repo(), so the heartbeat shares the sync
+    service, lock and freshness checks with every other sync in the
+    process. Doesn't run post-sync hooks; the heartbeat runs those as
+    their own actions.
+
     Args:
         agents_dir: Path to _agenttree directory
         pull_only: If True, only pull changes (default)
     """
-    from agenttree.environment import is_running_in_container
-    import subprocess
-    
-    if is_running_in_container():
-        return
-    
-    if not agents_dir.exists() or not (agents_dir / ".git").exists():
-        return
-    
-    # Commit any local changes first
-    status_result = subprocess.run(
-        ["git", "-C", str(agents_dir), "status", "--porcelain"],
-        capture_output=True,
-        text=True,
-        timeout=10,
-    )
-    
-    if status_result.stdout.strip():
-        subprocess.run(
-            ["git", "-C", str(agents_dir), "add", "-A"],
-            capture_output=True,
-            timeout=10,
-        )
-        subprocess.run(
-            ["git", "-C", str(agents_dir), "commit", "-m", "Auto-sync: update issue data"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-    
-    # Pull
-    subprocess.run(
-        ["git", "-C", str(agents_dir), "pull", "--no-rebase"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    
-    # Push if not pull_only
-    if not pull_only:
-        subprocess.run(
-            ["git", "-C", str(agents_dir), "push"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+    from agenttree.agents_repo import sync_agents_repo
+
+    sync_agents_repo(agents_dir, pull_only=pull_only)
 
 
 @register_action("check_stalled_agents")
@@ -306,7 +268,8 @@ def check_stalled_agents(
     Role-aware: uses config.role_for(stage) instead of hardcoding "developer".
     Skips parking lots, human review stages, and manager stages.
     Notifies manager up to max_notifications times per issue+stage, then stops.
-    Tracks notification state in .heartbeat_state.yaml (stall_notifications key).
+    Tracks notification state in .heartbeat_state.yaml (stall_notifications key),
+    pruned to issues still in the stage they were notified about.
 
     Args:
         agents_dir: Path to _agenttree directory
@@ -315,18 +278,20 @@ def check_stalled_agents(
     """
     from datetime import datetime, timezone
     from agenttree.config import load_config
-    from agenttree.events import load_event_state, save_event_state
-    from agenttree.issues import list_issues
+    from agenttree.events import event_state_lock, load_event_state, save_event_state
+    from agenttree.issues import list_issue_summaries
     from agenttree.tmux import session_exists, send_message
 
-    config = load_config()
+    snapshot = kwargs.get("_snapshot")
+    config = snapshot.config if snapshot is not None else load_config()
 
     if not config.manager.nudge_agents:
         return
 
     manager_session = config.get_manager_tmux_session()
 
-    issues = list_issues(sync=False)
+    issues = snapshot.issues if snapshot is not None else list_issue_summaries()
+    has_session = snapshot.session_exists if snapshot is not None else session_exists
     needs_attention: list[str] = []
 
     # Use dispatcher's state if available to avoid write-after-write race;
@@ -334,7 +299,8 @@ def check_stalled_agents(
     # independently, the dispatcher's final save overwrites our changes.
     shared_state: dict[str, Any] | None = kwargs.get("_event_state")
     state: dict[str, Any] = shared_state if shared_state is not None else load_event_state(agents_dir)
-    stall_state: dict[int | str, Any] = state.get("stall_notifications", {})
+    with event_state_lock:
+        stall_state: dict[int | str, Any] = dict(state.get("stall_notifications", {}))
     now = datetime.now(timezone.utc)
 
     for issue in issues:
@@ -350,9 +316,9 @@ def check_stalled_agents(
             continue
 
         # Compute time-in-stage from history
-        if not issue.history:
+        last_entry = issue.last_history
+        if not last_entry:
             continue
-        last_entry = issue.history[-1]
         try:
             stage_start = datetime.fromisoformat(
                 last_entry.timestamp.replace("Z", "+00:00")
@@ -366,7 +332,7 @@ def check_stalled_agents(
 
         # Check if the correct role's agent is running
         session_name = config.get_issue_tmux_session(issue.id, role)
-        agent_running = session_exists(session_name)
+        agent_running = has_session(session_name)
 
         if agent_running and elapsed_min < threshold_min * 2:
             # Agent is running, not stalled long enough for extra concern
@@ -406,7 +372,15 @@ def check_stalled_agents(
             f"  #{issue.id}: {issue.title[:40]} — {status} at {issue.stage} ({elapsed_min}min)"
         )
 
-    state["stall_notifications"] = stall_state
+    # Drop entries for issues that are gone or have moved on: a stage change
+    # resets the count anyway, and old entries would pile up forever
+    current_stages = {issue.id: issue.stage for issue in issues}
+    stall_state = {
+        issue_id: entry for issue_id, entry in stall_state.items()
+        if isinstance(entry, dict) and current_stages.get(issue_id) == entry.get("stage")
+    }
+    with event_state_lock:
+        state["stall_notifications"] = stall_state
     if shared_state is None:
         save_event_state(agents_dir, state)
 
@@ -475,7 +449,7 @@ def check_ci_status(agents_dir: Path, **kwargs: Any) -> None:
     """
     from agenttree.agents_repo import check_ci_status as do_check_ci
     
-    count = do_check_ci(agents_dir)
+    count = do_check_ci(agents_dir, cancel=kwargs.get("_cancel"), snapshot=kwargs.get("_snapshot"))
     if count > 0:
         console.print(f"[dim]Processed {count} CI failure(s)[/dim]")
 
@@ -489,7 +463,7 @@ def check_merged_prs(agents_dir: Path, **kwargs: Any) -> None:
     """
     from agenttree.agents_repo import check_merged_prs as do_check_merged
 
-    count = do_check_merged(agents_dir)
+    count = do_check_merged(agents_dir, snapshot=kwargs.get("_snapshot"))
     if count > 0:
         console.print(f"[dim]Processed {count} merged PR(s)[/dim]")
 
@@ -540,7 +514,7 @@ def ensure_review_branches(agents_dir: Path, **kwargs: Any) -> None:
     """
     from agenttree.agents_repo import ensure_review_branches as do_ensure
 
-    count = do_ensure(agents_dir)
+    count = do_ensure(agents_dir, snapshot=kwargs.get("_snapshot"))
     if count > 0:
         console.print(f"[dim]Processed {count} review branch(es)[/dim]")
 
@@ -554,7 +528,7 @@ def check_manager_stages(agents_dir: Path, **kwargs: Any) -> None:
     """
     from agenttree.agents_repo import check_manager_stages as do_check
     
-    count = do_check(agents_dir)
+    count = do_check(agents_dir, snapshot=kwargs.get("_snapshot"))
     if count > 0:
         console.print(f"[dim]Processed {count} manager stage issue(s)[/dim]")
 
@@ -568,7 +542,7 @@ def check_custom_agent_stages(agents_dir: Path, **kwargs: Any) -> None:
     """
     from agenttree.agents_repo import check_custom_agent_stages as do_check
     
-    count = do_check(agents_dir)
+    count = do_check(agents_dir, snapshot=kwargs.get("_snapshot"))
     if count > 0:
         console.print(f"[dim]Spawned {count} custom agent(s)[/dim]")
 
@@ -595,6 +569,24 @@ def cleanup_resources(
             f.write(f"{datetime.now().isoformat()}: cleanup_resources executed\n")
 
 
+@register_action("compact_archive")
+def compact_archive(agents_dir: Path, max_age_days: float = 30, **kwargs: Any) -> None:
+    """Move issues finished more than max_age_days ago into the monthly archive packs.
+
+    Keeps the issues/ tree that every scan walks proportional to active
+    work. See agenttree.archive.
+
+    Args:
+        agents_dir: Path to _agenttree directory
+        max_age_days: Minimum days since an accepted/abandoned issue was last updated
+    """
+    from agenttree.archive import compact_issues
+
+    archived = compact_issues(agents_dir, max_age_days=max_age_days)
+    if archived:
+        console.print(f"[dim]Archived {len(archived)} finished issue(s)[/dim]")
+
+
 @register_action("trigger_cleanup")
 def trigger_cleanup(
     agents_dir: Path,
@@ -611,12 +603,13 @@ def trigger_cleanup(
         agents_dir: Path to _agenttree directory
         threshold: Number of accepted issues before triggering cleanup (default: 10)
     """
-    from agenttree.events import load_event_state, save_event_state
+    from agenttree.events import event_state_lock, load_event_state, save_event_state
     from agenttree.issues import list_issues, create_issue, Priority
 
     # Load state
     state = load_event_state(agents_dir)
-    cleanup_state = state.get("cleanup_trigger", {})
+    with event_state_lock:
+        cleanup_state = dict(state.get("cleanup_trigger", {}))
     last_batch_end = cleanup_state.get("last_batch_end", 0)
 
     # Get all issues
@@ -686,7 +679,8 @@ This is an automated cleanup issue created after {len(issue_ids)} issues were ac
 
     # Update state
     cleanup_state["last_batch_end"] = new_batch_end
-    state["cleanup_trigger"] = cleanup_state
+    with event_state_lock:
+        state["cleanup_trigger"] = cleanup_state
     save_event_state(agents_dir, state)
 
 
@@ -766,14 +760,14 @@ def load_rate_limit_state(agents_dir: Path) -> dict[str, Any] | None:
     Returns:
         State dict or None if no state file
     """
-    import yaml
+    from agenttree.yamlio import yaml_load
     
     state_file = agents_dir / "rate_limit_state.yaml"
     if not state_file.exists():
         return None
     
     try:
-        data = yaml.safe_load(state_file.read_text())
+        data = yaml_load(state_file.read_text())
         if isinstance(data, dict):
             return data
         return None
@@ -788,10 +782,10 @@ def save_rate_limit_state(agents_dir: Path, state: dict[str, Any]) -> None:
         agents_dir: Path to _agenttree directory
         state: State dict to save
     """
-    import yaml
+    from agenttree.yamlio import yaml_dump
     
     state_file = agents_dir / "rate_limit_state.yaml"
-    state_file.write_text(yaml.dump(state, default_flow_style=False))
+    state_file.write_text(yaml_dump(state, sort_keys=True))
 
 
 def clear_rate_limit_state(agents_dir: Path) -> None:
@@ -958,7 +952,8 @@ def check_rate_limits(agents_dir: Path, **kwargs: Any) -> None:
     from agenttree.config import load_config
     from agenttree.tmux import session_exists, list_sessions
     
-    config = load_config()
+    snapshot = kwargs.get("_snapshot")
+    config = snapshot.config if snapshot is not None else load_config()
     
     # First, check for recovery (reset time has passed)
     state = load_rate_limit_state(agents_dir)
@@ -998,11 +993,13 @@ def check_rate_limits(agents_dir: Path, **kwargs: Any) -> None:
                 return  # Don't check for new limits right after recovery
     
     # Get all active sessions for this project
-    all_sessions = list_sessions()
-    project_sessions = [
-        s.name for s in all_sessions 
-        if s.name.startswith(f"{config.project}-developer-")
-    ]
+    session_names = (
+        snapshot.tmux_sessions if snapshot is not None else [s.name for s in list_sessions()]
+    )
+    project_sessions = sorted(
+        name for name in session_names
+        if name.startswith(f"{config.project}-developer-")
+    )
     
     if not project_sessions:
         return
@@ -1069,15 +1066,18 @@ DEFAULT_EVENT_CONFIGS: dict[str, list[str] | dict[str, Any]] = {
         "actions": [
             "sync",
             {"start_manager": {"min_interval_s": 30}},  # Ensure manager stays alive
-            {"push_pending_branches": {}},
-            {"check_manager_stages": {}},
-            {"ensure_review_branches": {"min_interval_s": 60}},
-            {"check_custom_agent_stages": {}},
-            {"check_rate_limits": {"min_interval_s": 30}},  # Check for rate limits
+            # Everything that writes issues or commits runs after sync's pull
+            {"push_pending_branches": {"after": "sync"}},
+            # Stage events trigger these right away; the scans are a safety net
+            {"check_manager_stages": {"min_interval_s": 120, "after": "sync"}},
+            {"ensure_review_branches": {"min_interval_s": 300, "after": "sync"}},
+            {"check_custom_agent_stages": {"min_interval_s": 120, "after": "sync"}},
+            {"check_rate_limits": {"min_interval_s": 30, "after": "sync"}},  # Check for rate limits
             {"check_stalled_agents": {"min_interval_s": 180}},
-            {"check_ci_status": {"min_interval_s": 60}},
-            {"check_merged_prs": {"min_interval_s": 30}},
+            {"check_ci_status": {"min_interval_s": 60, "after": "sync"}},
+            {"check_merged_prs": {"min_interval_s": 30, "after": "sync"}},
             {"check_pr_health": {"min_interval_s": 60}},  # Monitor PR health at all stages
+            {"compact_archive": {"min_interval_s": 3600, "after": "sync"}},  # Pack long-finished issues
         ],
     },
 }
@@ -6,25 +6,19 @@ Manages the _agenttree/ git repository (separate from main project).
 from __future__ import annotations
 
 import fcntl
+import functools
+import json
 import logging
 import shutil
 import subprocess
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Optional, TYPE_CHECKING
+from typing import IO, Any, Optional, TYPE_CHECKING
 from rich.console import Console
 
-log = logging.getLogger("agenttree.agents_repo")
-console = Console()
-
-if TYPE_CHECKING:
-    from agenttree.issues import Issue
-    from agenttree.config import RoleConfig, StageConfig
-    from agenttree.github import CheckStatus, PRComment
-
-# Global lock file handle (kept open during sync)
-_sync_lock_fd = None
-
+from agenttree.blob_store import BLOB_STORE_DIR, write_artifact
 from agenttree.dependencies import GH_CLI_INSTALL_INSTRUCTIONS
 from agenttree.frontmatter import (
     create_frontmatter,
@@ -32,26 +26,94 @@ from agenttree.frontmatter import (
     utc_now,
 )
 from agenttree.ids import slugify
+from agenttree.merge_driver import register_merge_drivers
+from agenttree.push_queue import push_in_background, push_now, request_push, retry_soon
+
+if TYPE_CHECKING:
+    from agenttree.issues import Issue
+    from agenttree.config import RoleConfig, StageConfig
+    from agenttree.github import CheckStatus, PRComment
+    from agenttree.snapshot import TickSnapshot
+
+log = logging.getLogger("agenttree.agents_repo")
+console = Console()
+
+# How long a write sync waits for an in-flight sync before giving up
+SYNC_WAIT_DEADLINE = 30.0
+
+# Start time and result of the last sync; kept in .git so it's never committed
+_LAST_SYNC_FILE = "agenttree-last-sync.json"
+
+# Monotonic time of this process's last successful sync, per _agenttree dir
+_last_remote_check: dict[Path, float] = {}
+
+# Files each thread wrote under each _agenttree dir since its last write sync.
+# Per thread, so a sync only commits files its own caller wrote, not the
+# half-finished writes of a concurrent heartbeat action or request.
+_touched_paths = threading.local()
+
+
+def register_touched_paths(agents_dir: Path, *paths: Path) -> None:
+    """Record files written under agents_dir for the next write sync.
+
+    A write sync from the same thread then stages and checks only the
+    registered files instead of walking the whole tree with `git add -A`.
+    Writers that don't register anything get the full walk as before.
+    """
+    touched = _thread_touched_paths().setdefault(agents_dir, set())
+    for path in paths:
+        try:
+            touched.add(path.relative_to(agents_dir).as_posix())
+        except ValueError:
+            log.debug("Ignoring %s: not under %s", path, agents_dir)
+
+
+def _thread_touched_paths() -> dict[Path, set[str]]:
+    registered: Optional[dict[Path, set[str]]] = getattr(_touched_paths, "by_dir", None)
+    if registered is None:
+        registered = _touched_paths.by_dir = {}
+    return registered
+
+
+def _take_touched_paths(agents_dir: Path) -> Optional[list[str]]:
+    """Pop this thread's registered paths for agents_dir (None if there are none)."""
+    touched = _thread_touched_paths().pop(agents_dir, None)
+    return sorted(touched) if touched else None
 
 
 def sync_agents_repo(
     agents_dir: Path,
     pull_only: bool = False,
     commit_message: Optional[str] = None,
+    wait: Optional[float] = None,
 ) -> bool:
     """Sync _agenttree repo with remote.
 
-    Uses a file lock to prevent concurrent syncs from multiple agents.
+    If a sync service is running (see agenttree.sync_service), the request
+    is handed to it and batched with others: writes return once queued,
+    reads wait for a fresh pull. Otherwise syncs inline under a file lock
+    to prevent concurrent syncs from multiple agents.
+
+    Writes commit only the files this thread registered with
+    register_touched_paths() when there are any; otherwise (and for reads)
+    every change is committed. If the sync fails, the registrations are
+    restored so the next write sync commits them.
+
+    The push after a write is queued for a background pusher (see
+    agenttree.push_queue), so writers never wait on it.
 
     Args:
         agents_dir: Path to _agenttree directory
         pull_only: If True, only pull changes (for read operations)
         commit_message: Commit message for write operations
+        wait: Seconds to wait for an in-flight inline sync before giving up
+            (default: SYNC_WAIT_DEADLINE for writes, no wait for reads)
 
     Returns:
         True if sync succeeded, False otherwise
     """
-    global _sync_lock_fd
+    # Taken even when skipping, so registrations don't pile up
+    paths = None if pull_only else _take_touched_paths(agents_dir)
 
     # Skip sync in containers - no SSH access, host handles syncing
     from agenttree.environment import is_running_in_container
@@ -62,42 +124,202 @@ def sync_agents_repo(
     if not agents_dir.exists() or not (agents_dir / ".git").exists():
         return False
 
-    # Acquire lock to prevent concurrent syncs
-    lock_file = agents_dir / ".sync.lock"
+    from agenttree.sync_service import request_sync
+    ok = request_sync(agents_dir, pull_only, commit_message, paths)
+    if ok is None:
+        ok = _sync_inline(agents_dir, pull_only, commit_message, wait, paths)
+    if not ok and paths:
+        register_touched_paths(agents_dir, *(agents_dir / path for path in paths))
+    return ok
+
+
+def _sync_inline(
+    agents_dir: Path,
+    pull_only: bool = False,
+    commit_message: Optional[str] = None,
+    wait: Optional[float] = None,
+    paths: Optional[list[str]] = None,
+    fresh: bool = False,
+) -> bool:
+    """Commit, pull and (unless pull_only) push in this process.
+
+    Syncs are serialized by a file lock. If another sync holds it, wait up
+    to `wait` seconds for it. Once the lock is ours, if the last sync
+    started after this call and committed at least our paths, it already
+    committed and pulled (and pushed, for writes) our changes, so its
+    result is reused. Otherwise exactly one follow-up sync runs.
+
+    paths limits the commit to those files (relative to agents_dir); None
+    commits every change. fresh skips the sync_min_interval_s shortcut for
+    reads, for callers that promised a fresh pull (the sync service).
+    """
+    requested_ns = time.time_ns()
+    if pull_only and not fresh and _checked_remote_recently(agents_dir):
+        return True
+    if wait is None:
+        wait = 0.0 if pull_only else SYNC_WAIT_DEADLINE
+
+    lock_fd = _acquire_sync_lock(agents_dir, wait)
+    if lock_fd is None:
+        # Another sync is still running, skip this one
+        return False
+
+    try:
+        last = _read_last_sync(agents_dir)
+        if (
+            last is not None
+            and last["started_ns"] >= requested_ns
+            and (pull_only or not last["pull_only"])
+            and _covers(last.get("paths"), paths)
+        ):
+            log.debug("Reusing result of a sync that started after this request")
+            return bool(last["ok"])
+
+        started_ns = time.time_ns()
+        ok = _run_git_sync(agents_dir, pull_only, commit_message, paths)
+        _write_last_sync(
+            agents_dir, {"started_ns": started_ns, "pull_only": pull_only, "paths": paths, "ok": ok}
+        )
+        if ok:
+            _last_remote_check[agents_dir] = time.monotonic()
+        return ok
+    finally:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        lock_fd.close()
+
+
+def _covers(committed: Optional[list[str]], wanted: Optional[list[str]]) -> bool:
+    """True if a sync that committed `committed` (None = everything) covers `wanted`."""
+    if committed is None:
+        return True
+    return wanted is not None and set(wanted) <= set(committed)
+
+
+def _checked_remote_recently(agents_dir: Path) -> bool:
+    """True if this process synced within sync_min_interval_s."""
+    last = _last_remote_check.get(agents_dir)
+    if last is None:
+        return False
+    from agenttree.config import load_config
     try:
-        _sync_lock_fd = open(lock_file, "w")
-        fcntl.flock(_sync_lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-    except (IOError, OSError):
-        # Another sync is running, skip this one
-        if _sync_lock_fd:
-            _sync_lock_fd.close()
-            _sync_lock_fd = None
+        interval = load_config(agents_dir.parent).sync_min_interval_s
+    except Exception:
         return False
+    return time.monotonic() - last < interval
+
+
+def _upstream_unchanged(agents_dir: Path) -> bool:
+    """Cheap freshness probe: has the upstream branch moved since our last fetch?
+
+    Compares the remote-tracking ref with `git ls-remote`, which costs one
+    round-trip and no object transfer. Returns False whenever unsure (no
+    upstream, probe failed, local branch behind), so callers fall back to a
+    full pull.
+    """
+    result = subprocess.run(
+        ["git", "-C", str(agents_dir), "rev-parse", "HEAD", "@{u}", "--symbolic-full-name", "@{u}"],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+    lines = result.stdout.split() if result.returncode == 0 else []
+    if len(lines) != 3 or not lines[2].startswith("refs/remotes/"):
+        return False
+    head, upstream, upstream_ref = lines
+    remote, _, branch = upstream_ref[len("refs/remotes/"):].partition("/")
+
+    ls_remote = subprocess.run(
+        ["git", "-C", str(agents_dir), "ls-remote", remote, f"refs/heads/{branch}"],
+        capture_output=True,
+        text=True,
+        timeout=15,
+    )
+    if ls_remote.returncode != 0 or ls_remote.stdout.split()[:1] != [upstream]:
+        return False
+    if head == upstream:
+        return True
+
+    # Local commits on top of upstream are fine; being behind it is not
+    ancestor = subprocess.run(
+        ["git", "-C", str(agents_dir), "merge-base", "--is-ancestor", upstream, head],
+        capture_output=True,
+        timeout=10,
+    )
+    return ancestor.returncode == 0
+
+
+def _acquire_sync_lock(agents_dir: Path, wait: float) -> Optional[IO[str]]:
+    """Lock .sync.lock, polling for up to `wait` seconds if it's held.
+
+    Returns:
+        The open, locked file, or None if the deadline passed
+    """
+    try:
+        lock_fd = open(agents_dir / ".sync.lock", "w")
+    except OSError:
+        return None
+
+    deadline = time.monotonic() + wait
+    delay = 0.05
+    while True:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_fd
+        except OSError:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                lock_fd.close()
+                return None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+
+
+def _read_last_sync(agents_dir: Path) -> Optional[dict[str, Any]]:
+    """Start time and result of the last completed sync, if recorded."""
+    try:
+        data = json.loads((agents_dir / ".git" / _LAST_SYNC_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("started_ns"), int):
+        return None
+    return data
+
+
+def _write_last_sync(agents_dir: Path, data: dict[str, Any]) -> None:
+    try:
+        (agents_dir / ".git" / _LAST_SYNC_FILE).write_text(json.dumps(data))
+    except OSError as e:
+        log.debug("Could not record sync result: %s", e)
+
+
+def _run_git_sync(
+    agents_dir: Path,
+    pull_only: bool,
+    commit_message: Optional[str],
+    paths: Optional[list[str]] = None,
+) -> bool:
+    """The git side of a sync; the caller holds the sync lock."""
+    from agenttree.git_backend import get_git_backend
 
     try:
         # First, commit any local changes (prevents "unstaged changes" error on pull)
         # Check for ANY changes (staged or unstaged)
-        status_result = subprocess.run(
-            ["git", "-C", str(agents_dir), "status", "--porcelain"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if status_result.stdout.strip():
+        git = get_git_backend()
+        message = commit_message or "Auto-sync: update issue data"
+        if paths is not None:
+            # Only look at (and stage) the files the writer registered
+            changed = git.changed_files(agents_dir, paths)
+            if changed:
+                git.commit_all(agents_dir, message, changed)
+        elif git.is_dirty(agents_dir):
             # There are changes - stage and commit them
-            subprocess.run(
-                ["git", "-C", str(agents_dir), "add", "-A"],
-                capture_output=True,
-                timeout=10,
-            )
-            message = commit_message or "Auto-sync: update issue data"
-            subprocess.run(
-                ["git", "-C", str(agents_dir), "commit", "-m", message],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+            git.commit_all(agents_dir, message)
+
+        # Read syncs skip the pull when upstream hasn't moved
+        if pull_only and _upstream_unchanged(agents_dir):
+            return True
+
+        head_before = _git_head(agents_dir)
 
         # Pull with merge (rebase causes issues with concurrent syncs)
         result = subprocess.run(
@@ -114,8 +336,10 @@ def sync_agents_repo(
                 # Offline mode - continue without syncing
                 return False
             elif "conflict" in result.stderr.lower():
-                # Merge conflict - log error and fail
+                # Conflict outside issue.yaml/history.jsonl (those have merge
+                # drivers). Abort so later syncs aren't stuck mid-merge.
                 log.warning("Merge conflict in _agenttree repo: %s", result.stderr)
+                subprocess.run(["git", "-C", str(agents_dir), "merge", "--abort"], capture_output=True, timeout=10)
                 return False
             elif "local changes" in result.stderr.lower() or "overwritten" in result.stderr.lower():
                 # Shouldn't happen after auto-commit, but try stash as fallback
@@ -129,27 +353,19 @@ def sync_agents_repo(
                 log.warning("Failed to pull _agenttree repo: %s", result.stderr)
                 return False
 
+        _evict_pulled_paths(agents_dir, head_before)
+
         # If pull-only, we're done (hooks run separately by caller)
         if pull_only:
             return True
 
-        # Push changes (local commits + any we just made)
-        push_result = subprocess.run(
-            ["git", "-C", str(agents_dir), "push"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-
-        if push_result.returncode != 0:
-            # Push failed - could be offline or permission issue
-            if "Could not resolve host" in push_result.stderr:
-                log.warning("Offline - changes committed locally but not pushed")
-            else:
-                log.warning("Failed to push changes: %s", push_result.stderr)
-            return False
-
-        return True
+        # Push changes (local commits + any we just made). Normally queued
+        # for a background pusher so writers don't wait on the network.
+        if push_in_background():
+            retry_soon(agents_dir)  # the pull just reached the remote
+            request_push(agents_dir)
+            return True
+        return push_now(agents_dir)
 
     except subprocess.TimeoutExpired:
         log.warning("Git operation timed out")
@@ -157,18 +373,74 @@ def sync_agents_repo(
     except Exception as e:
         log.warning("Error syncing _agenttree repo: %s", e)
         return False
-    finally:
-        # Always release the lock and reset the global
-        if _sync_lock_fd:
-            try:
-                fcntl.flock(_sync_lock_fd, fcntl.LOCK_UN)
-                _sync_lock_fd.close()
-            except (IOError, OSError, ValueError):
-                pass  # Already closed or invalid
-            _sync_lock_fd = None
 
 
-def check_manager_stages(agents_dir: Path) -> int:
+def _git_head(agents_dir: Path) -> Optional[str]:
+    """Commit hash of HEAD, or None if it can't be resolved (e.g. empty repo)."""
+    from agenttree.git_backend import get_git_backend
+    return get_git_backend().head(agents_dir)
+
+
+def pulled_paths(agents_dir: Path, head_before: Optional[str]) -> Optional[list[str]]:
+    """Paths changed between head_before and the current HEAD.
+
+    Args:
+        agents_dir: Path to _agenttree directory
+        head_before: HEAD commit recorded before the pull
+
+    Returns:
+        Repo-relative paths (empty for a no-op pull), or None if the change
+        set can't be determined and callers should assume everything changed
+    """
+    head_after = _git_head(agents_dir)
+    if head_after == head_before:
+        return []
+    if head_before is None or head_after is None:
+        return None
+
+    result = subprocess.run(
+        ["git", "-C", str(agents_dir), "diff", "--name-only", "--no-renames", head_before, head_after],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def _evict_pulled_paths(agents_dir: Path, head_before: Optional[str]) -> None:
+    """Drop cached issue data for files the pull just changed."""
+    from agenttree import issues
+
+    paths = pulled_paths(agents_dir, head_before)
+    if paths is None:
+        issues.invalidate_issues_cache()
+    elif paths:
+        log.debug("Pull changed %d path(s) in _agenttree", len(paths))
+        issues.evict_issue_paths(agents_dir, paths)
+
+
+def _one_at_a_time(fn: Any) -> Any:
+    """Let only one thread at a time run a stage scan.
+
+    The heartbeat and the stage event dispatcher (agenttree.stage_events)
+    can both run a scan at once, and its re-entry flags are read and then
+    written, not claimed atomically. Re-entrant, since hooks run by a scan
+    may sync and trigger it again in the same thread.
+    """
+    lock = threading.RLock()
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with lock:
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+@_one_at_a_time
+def check_manager_stages(agents_dir: Path, snapshot: Optional[TickSnapshot] = None) -> int:
     """Execute post_start hooks for issues in manager stages.
 
     Manager stages (role: manager) have their hooks executed by the host,
@@ -178,6 +450,7 @@ def check_manager_stages(agents_dir: Path) -> int:
 
     Args:
         agents_dir: Path to _agenttree directory
+        snapshot: Heartbeat tick snapshot; only its issues in manager stages are read
 
     Returns:
         Number of issues processed
@@ -187,6 +460,7 @@ def check_manager_stages(agents_dir: Path) -> int:
     from agenttree.hooks import execute_enter_hooks, StageRedirect
     from agenttree.config import load_config
     from agenttree.issues import Issue
+    from agenttree.snapshot import issue_dirs
 
     if is_running_in_container():
         return 0
@@ -195,7 +469,7 @@ def check_manager_stages(agents_dir: Path) -> int:
     if not issues_dir.exists():
         return 0
 
-    config = load_config()
+    config = snapshot.config if snapshot is not None else load_config()
     manager_stages = config.get_manager_stages()
 
     if not manager_stages:
@@ -203,7 +477,7 @@ def check_manager_stages(agents_dir: Path) -> int:
 
     processed = 0
 
-    for issue_dir in issues_dir.iterdir():
+    for issue_dir in issue_dirs(agents_dir, snapshot, manager_stages):
         if not issue_dir.is_dir():
             continue
 
@@ -272,7 +546,8 @@ def check_manager_stages(agents_dir: Path) -> int:
     return processed
 
 
-def ensure_review_branches(agents_dir: Path) -> int:
+@_one_at_a_time
+def ensure_review_branches(agents_dir: Path, snapshot: Optional[TickSnapshot] = None) -> int:
     """Ensure PRs exist and branches are up-to-date for issues in implement.review.
 
     Runs on every sync heartbeat. For each issue at implement.review:
@@ -282,6 +557,7 @@ def ensure_review_branches(agents_dir: Path) -> int:
 
     Args:
         agents_dir: Path to _agenttree directory
+        snapshot: Heartbeat tick snapshot; only its issues at implement.review are read
 
     Returns:
         Number of issues processed
@@ -290,6 +566,7 @@ def ensure_review_branches(agents_dir: Path) -> int:
     from agenttree.environment import is_running_in_container
     from agenttree.pr_actions import ensure_pr_for_issue
     from agenttree.issues import Issue
+    from agenttree.snapshot import issue_dirs
 
     if is_running_in_container():
         return 0
@@ -300,7 +577,7 @@ def ensure_review_branches(agents_dir: Path) -> int:
 
     processed = 0
 
-    for issue_dir in issues_dir.iterdir():
+    for issue_dir in issue_dirs(agents_dir, snapshot, {"implement.review"}):
         if not issue_dir.is_dir():
             continue
 
@@ -369,7 +646,8 @@ def ensure_review_branches(agents_dir: Path) -> int:
     return processed
 
 
-def check_custom_agent_stages(agents_dir: Path) -> int:
+@_one_at_a_time
+def check_custom_agent_stages(agents_dir: Path, snapshot: Optional[TickSnapshot] = None) -> int:
     """Spawn custom role agents for issues in custom agent stages.
 
     Custom agent stages (role: <custom_role_name>) have their agents
@@ -380,6 +658,8 @@ def check_custom_agent_stages(agents_dir: Path) -> int:
 
     Args:
         agents_dir: Path to _agenttree directory
+        snapshot: Heartbeat tick snapshot; supplies the issues in custom agent
+            stages and the running tmux sessions and containers
 
     Returns:
         Number of agents spawned
@@ -387,6 +667,7 @@ def check_custom_agent_stages(agents_dir: Path) -> int:
     from agenttree.environment import is_running_in_container
     from agenttree.config import load_config
     from agenttree.issues import Issue
+    from agenttree.snapshot import issue_dirs
 
     # Bail early if running in a container - host operations only
     if is_running_in_container():
@@ -396,17 +677,21 @@ def check_custom_agent_stages(agents_dir: Path) -> int:
     if not issues_dir.exists():
         return 0
 
-    config = load_config()
+    config = snapshot.config if snapshot is not None else load_config()
     custom_agent_stages = config.get_custom_role_stages()
 
     if not custom_agent_stages:
         return 0
 
+    from agenttree.container import is_container_running
     from agenttree.tmux import session_exists
 
+    has_session = snapshot.session_exists if snapshot is not None else session_exists
+    container_running = snapshot.container_running if snapshot is not None else is_container_running
+
     spawned = 0
 
-    for issue_dir in issues_dir.iterdir():
+    for issue_dir in issue_dirs(agents_dir, snapshot, custom_agent_stages):
         if not issue_dir.is_dir():
             continue
 
@@ -437,7 +722,7 @@ def check_custom_agent_stages(agents_dir: Path) -> int:
 
             from agenttree.tmux import is_claude_running, send_message
 
-            if session_exists(custom_agent_session):
+            if has_session(custom_agent_session):
                 if is_claude_running(custom_agent_session):
                     result = send_message(
                         custom_agent_session,
@@ -454,9 +739,8 @@ def check_custom_agent_stages(agents_dir: Path) -> int:
                     console.print(f"[yellow]{role_name} agent for issue #{issue_id} exited, restarting...[/yellow]")
                     needs_force = True
             else:
-                from agenttree.container import is_container_running
                 container_name = config.get_issue_container_name(issue_id)
-                if is_container_running(container_name):
+                if container_running(container_name):
                     console.print(f"[yellow]Orphaned container for issue #{issue_id}, cleaning up...[/yellow]")
                     needs_force = True
                 else:
@@ -494,8 +778,16 @@ def check_custom_agent_stages(agents_dir: Path) -> int:
     return spawned
 
 
+def _pr_issue_dirs(agents_dir: Path, snapshot: Optional[TickSnapshot]) -> list[Path]:
+    """Issue directories that may have a PR: with a snapshot, only issues with a pr_number."""
+    from agenttree.snapshot import issue_dirs
+
+    if snapshot is None:
+        return issue_dirs(agents_dir)
+    return [issue.dir for issue in snapshot.issues if issue.pr_number and issue.dir is not None]
 
-def check_merged_prs(agents_dir: Path) -> int:
+
+def check_merged_prs(agents_dir: Path, snapshot: Optional[TickSnapshot] = None) -> int:
     """Check for issues with PRs that were merged/closed externally.
 
     If a human merges or closes a PR via GitHub UI or `gh pr merge` instead of
@@ -511,6 +803,7 @@ def check_merged_prs(agents_dir: Path) -> int:
 
     Args:
         agents_dir: Path to _agenttree directory
+        snapshot: Heartbeat tick snapshot; only its issues with a PR are read
 
     Returns:
         Number of issues advanced
@@ -528,14 +821,14 @@ def check_merged_prs(agents_dir: Path) -> int:
     from agenttree.config import load_config
     from agenttree.issues import Issue
 
-    config = load_config()
+    config = snapshot.config if snapshot is not None else load_config()
 
     # Stages where the issue is already done - no need to check PR
     parking_lot_stages = {name for name, s in config.stages.items() if s.is_parking_lot}
 
     issues_advanced = 0
 
-    for issue_dir in issues_dir.iterdir():
+    for issue_dir in _pr_issue_dirs(agents_dir, snapshot):
         if not issue_dir.is_dir():
             continue
 
@@ -619,7 +912,8 @@ def check_pr_health(agents_dir: Path, **kwargs: Any) -> int:
 
     Args:
         agents_dir: Path to _agenttree directory
-        **kwargs: Additional arguments (for action compatibility)
+        **kwargs: Additional arguments (for action compatibility); `_snapshot`
+            is the heartbeat tick snapshot
 
     Returns:
         Number of issues with health issues detected
@@ -634,11 +928,12 @@ def check_pr_health(agents_dir: Path, **kwargs: Any) -> int:
 
     from agenttree.api import _notify_agent
     from agenttree.config import load_config
-    from agenttree.events import load_event_state, save_event_state
+    from agenttree.events import event_state_lock, load_event_state, save_event_state
     from agenttree.github import get_pr_checks, is_pr_mergeable
     from agenttree.issues import Issue
 
-    config = load_config()
+    snapshot: Optional[TickSnapshot] = kwargs.get("_snapshot")
+    config = snapshot.config if snapshot is not None else load_config()
 
     # Stages where the issue is already done - no need to check PR
     parking_lot_stages = {name for name, s in config.stages.items() if s.is_parking_lot}
@@ -648,11 +943,15 @@ def check_pr_health(agents_dir: Path, **kwargs: Any) -> int:
 
     # Load state for rate limiting
     state = load_event_state(agents_dir)
-    pr_health_state = state.get("pr_health_notifications", {})
+    with event_state_lock:
+        pr_health_state = dict(state.get("pr_health_notifications", {}))
 
     issues_with_problems = 0
 
-    for issue_dir in issues_dir.iterdir():
+    cancel: Optional[threading.Event] = kwargs.get("_cancel")
+    for issue_dir in _pr_issue_dirs(agents_dir, snapshot):
+        if cancel is not None and cancel.is_set():
+            break
         if not issue_dir.is_dir():
             continue
 
@@ -732,7 +1031,8 @@ def check_pr_health(agents_dir: Path, **kwargs: Any) -> int:
             continue
 
     # Save updated state
-    state["pr_health_notifications"] = pr_health_state
+    with event_state_lock:
+        state["pr_health_notifications"] = pr_health_state
     save_event_state(agents_dir, state)
 
     return issues_with_problems
@@ -851,7 +1151,11 @@ def _generate_escalation_report(
     return content
 
 
-def check_ci_status(agents_dir: Path) -> int:
+def check_ci_status(
+    agents_dir: Path,
+    cancel: Optional[threading.Event] = None,
+    snapshot: Optional[TickSnapshot] = None,
+) -> int:
     """Check CI status for issues at ci_wait or review and handle results.
 
     For issues at implement.ci_wait with a PR:
@@ -865,6 +1169,8 @@ def check_ci_status(agents_dir: Path) -> int:
 
     Args:
         agents_dir: Path to _agenttree directory
+        cancel: Stops between issues once set (heartbeat deadline)
+        snapshot: Heartbeat tick snapshot; only its issues at ci_wait/review are read
 
     Returns:
         Number of issues processed
@@ -884,11 +1190,14 @@ def check_ci_status(agents_dir: Path) -> int:
     from agenttree.config import load_config
     from agenttree.tmux import TmuxManager
     from agenttree.issues import Issue
+    from agenttree.snapshot import issue_dirs
 
-    config = load_config()
+    config = snapshot.config if snapshot is not None else load_config()
     issues_notified = 0
 
-    for issue_dir in issues_dir.iterdir():
+    for issue_dir in issue_dirs(agents_dir, snapshot, ("implement.ci_wait", "implement.review")):
+        if cancel is not None and cancel.is_set():
+            break
         if not issue_dir.is_dir():
             continue
 
@@ -1023,7 +1332,7 @@ def check_ci_status(agents_dir: Path) -> int:
                     logs_sections=logs_sections,
                     comments=comments,
                 )
-                feedback_file.write_text(escalation_content)
+                write_artifact(issue_dir, feedback_file.name, escalation_content)
 
                 console.print(f"[red]CI failed {ci_bounce_count}x for issue #{issue_id} — escalating to human review[/red]")
                 from agenttree.issues import update_issue_stage
@@ -1038,7 +1347,7 @@ def check_ci_status(agents_dir: Path) -> int:
                 continue
 
             feedback_content += "\n---\n\nPlease fix these issues and run `agenttree next` to re-submit.\n"
-            feedback_file.write_text(feedback_content)
+            write_artifact(issue_dir, feedback_file.name, feedback_content)
 
             console.print(f"[yellow]CI failed for PR #{pr_number} (attempt {ci_bounce_count + 1}/{max_ci_bounces}), notifying issue #{issue_id}[/yellow]")
 
@@ -1205,9 +1514,13 @@ class AgentsRepository:
         self.project_name = project_path.name
 
     def ensure_repo(self) -> None:
-        """Ensure _agenttree/ repo exists, create if needed."""
+        """Ensure _agenttree/ repo exists, create if needed.
+
+        Also (re)registers the issue merge drivers (see agenttree.merge_driver).
+        """
         # Check if _agenttree/.git exists
         if (self.agents_path / ".git").exists():
+            register_merge_drivers(self.agents_path)
             return
 
         # Ensure gh CLI is authenticated
@@ -1219,6 +1532,8 @@ class AgentsRepository:
         # Clone it locally
         self._clone_repo()
 
+        register_merge_drivers(self.agents_path)
+
         # Add to parent .gitignore
         self._add_to_gitignore()
 
@@ -1298,11 +1613,17 @@ class AgentsRepository:
 
         console.print(f"[cyan]Cloning {repo_name} to _agenttree/[/cyan]")
 
-        # Clone
-        subprocess.run(
-            ["gh", "repo", "clone", f"{username}/{repo_name}", str(self.agents_path)],
-            check=True,
-        )
+        # Clone (partial and sparse if configured; see agenttree.sparse_checkout)
+        from agenttree.config import load_config
+        from agenttree.sparse_checkout import CLONE_ARGS, init_sparse_checkout
+
+        sparse = load_config(self.project_path).sparse_agents_repo
+        clone_cmd = ["gh", "repo", "clone", f"{username}/{repo_name}", str(self.agents_path)]
+        if sparse:
+            clone_cmd += ["--", *CLONE_ARGS]
+        subprocess.run(clone_cmd, check=True)
+        if sparse:
+            init_sparse_checkout(self.agents_path)
 
         # Add upstream remote pointing to template repo (for upgrades)
         console.print("[dim]Setting up upstream remote for upgrades...[/dim]")
@@ -1743,7 +2064,7 @@ See [README.md](README.md) for structure overview.
         )
 
     def _add_to_gitignore(self) -> None:
-        """Add _agenttree/ and .worktrees/ to parent .gitignore."""
+        """Add _agenttree/, .worktrees/ and the blob store to parent .gitignore."""
         gitignore = self.project_path / ".gitignore"
 
         entries_to_add = []
@@ -1754,6 +2075,8 @@ See [README.md](README.md) for structure overview.
                 entries_to_add.append("_agenttree/")
             if ".worktrees/" not in content:
                 entries_to_add.append(".worktrees/")
+            if f"{BLOB_STORE_DIR}/" not in content:
+                entries_to_add.append(f"{BLOB_STORE_DIR}/")
 
             if entries_to_add:
                 with open(gitignore, "a") as f:
@@ -1761,8 +2084,8 @@ See [README.md](README.md) for structure overview.
                     for entry in entries_to_add:
                         f.write(f"{entry}\n")
         else:
-            gitignore.write_text("# AgentTree directories\n_agenttree/\n.worktrees/\n")
-            entries_to_add = ["_agenttree/", ".worktrees/"]
+            entries_to_add = ["_agenttree/", ".worktrees/", f"{BLOB_STORE_DIR}/"]
+            gitignore.write_text("# AgentTree directories\n" + "".join(f"{e}\n" for e in entries_to_add))
 
         if entries_to_add:
             console.print(f"[green]✓ Added {', '.join(entries_to_add)} to .gitignore[/green]")
@@ -948,23 +948,23 @@ def cleanup_all_agenttree_containers(quiet: bool = False) -> int:
 
 
 def _clean_issue_files(issue_id: int, keep_files: set[str] | None = None) -> list[str]:
-    """Remove generated files from an issue directory, keeping issue.yaml.
+    """Remove generated files from an issue directory, keeping issue state.
 
     Args:
         issue_id: Issue ID
-        keep_files: Set of filenames to keep (in addition to issue.yaml).
-                    If None, only issue.yaml is kept.
+        keep_files: Set of filenames to keep (in addition to issue.yaml and
+                    history.jsonl). If None, only those two are kept.
 
     Returns:
         List of filenames that were removed
     """
-    from agenttree.issues import get_issue_dir
+    from agenttree.issues import HISTORY_FILENAME, get_issue_dir
 
     issue_dir = get_issue_dir(issue_id)
     if not issue_dir or not issue_dir.exists():
         return []
 
-    keep = {"issue.yaml"}
+    keep = {"issue.yaml", HISTORY_FILENAME}
     if keep_files:
         keep.update(keep_files)
 
@@ -0,0 +1,244 @@
+"""Compaction of finished issues into archive packs.
+
+Accepted and not_doing issues used to stay in _agenttree/issues/ forever,
+so every listing, heartbeat scan and sync walked a tree that only grew.
+compact_issues() moves issues that have sat in a completion or abandon
+stage for longer than max_age_days into packs under issues/archive/ (a
+directory the issue scans already skip):
+
+    issues/archive/2026-01-10-3f9c2a7e.tar.gz   every file of the issues
+    issues/archive/2026-02-01-8b41d0c5.tar.gz   archived by one run, one
+                                                directory each
+    issues/archive/index.jsonl                  one line per archived issue
+
+Packs and the index are only ever added to, never rewritten, so hosts that
+compact at the same time don't conflict on pull: each run writes its own
+uniquely named pack, and index.jsonl lines are appended and merged with
+git's union driver (see merge_driver.register_merge_drivers). Packs are
+built deterministically (no timestamps or owners), so the same input
+always gives the same bytes.
+
+The index keeps each issue's id, title, slug, stage, labels, dates and
+pack, so archived issues can still be searched (`agenttree issue list
+--archived --search ...`), satisfy dependencies and reserve their IDs
+without opening a pack. read_archived_file() pulls a single file back out.
+
+Runs as the compact_archive heartbeat action and as
+`agenttree issue archive`.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import tarfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from agenttree.fileio import append_text
+from agenttree.issue_index import FileSignature, file_signature
+
+if TYPE_CHECKING:
+    from agenttree.issues import Issue
+
+log = logging.getLogger("agenttree.archive")
+
+ARCHIVE_DIRNAME = "archive"
+INDEX_FILENAME = "index.jsonl"
+DEFAULT_MAX_AGE_DAYS = 30
+
+# agents_dir -> (signature of index.jsonl, entries by issue id)
+_index_cache: dict[Path, tuple[FileSignature, dict[int, dict[str, Any]]]] = {}
+
+
+def archive_dir(agents_dir: Path) -> Path:
+    return agents_dir / "issues" / ARCHIVE_DIRNAME
+
+
+def pack_name(now: datetime) -> str:
+    """A new, unique pack file name for a run at `now`, e.g. "2026-01-10-3f9c2a7e.tar.gz"."""
+    return f"{now:%Y-%m-%d}-{uuid.uuid4().hex[:8]}.tar.gz"
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def load_archive_index(agents_dir: Path) -> dict[int, dict[str, Any]]:
+    """Archived issues by id, cached until index.jsonl changes."""
+    path = archive_dir(agents_dir) / INDEX_FILENAME
+    try:
+        sig = file_signature(path.stat())
+    except OSError:
+        _index_cache.pop(agents_dir, None)
+        return {}
+    cached = _index_cache.get(agents_dir)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    # Later lines win: an issue archived again (e.g. by two hosts) keeps its newest entry
+    entries: dict[int, dict[str, Any]] = {}
+    for line in path.read_text().splitlines():
+        try:
+            entry = json.loads(line)
+            entries[int(entry["id"])] = entry
+        except (ValueError, KeyError, TypeError):
+            continue
+    _index_cache[agents_dir] = (sig, entries)
+    return entries
+
+
+def search_archive(agents_dir: Path, query: str = "") -> list[dict[str, Any]]:
+    """Archived issues whose title, slug or labels contain query (case-insensitive).
+
+    Returns:
+        Index entries, newest issue first
+    """
+    query = query.lower()
+    matches = [
+        entry for entry in load_archive_index(agents_dir).values()
+        if not query
+        or query in str(entry.get("title", "")).lower()
+        or query in str(entry.get("slug", "")).lower()
+        or any(query in str(label).lower() for label in entry.get("labels") or [])
+    ]
+    return sorted(matches, key=lambda e: -int(e["id"]))
+
+
+def read_archived_file(agents_dir: Path, issue_id: int, filename: str) -> Optional[str]:
+    """Read one file of an archived issue, e.g. its spec.md."""
+    entry = load_archive_index(agents_dir).get(issue_id)
+    if entry is None:
+        return None
+    try:
+        with tarfile.open(archive_dir(agents_dir) / entry["pack"], "r:gz") as tar:
+            member = tar.extractfile(f"{entry['dir']}/{filename}")
+            return member.read().decode() if member is not None else None
+    except (OSError, KeyError, tarfile.TarError):
+        return None
+
+
+def compactable_issues(
+    agents_dir: Path, max_age_days: float = DEFAULT_MAX_AGE_DAYS, now: Optional[datetime] = None
+) -> list["Issue"]:
+    """Issues finished (completion or abandon stage) more than max_age_days ago."""
+    from agenttree.config import load_config
+    from agenttree.issues import Issue
+
+    config = load_config(agents_dir.parent)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max_age_days)
+    issues = []
+    for yaml_path in sorted((agents_dir / "issues").glob("*/issue.yaml")):
+        if yaml_path.parent.name == ARCHIVE_DIRNAME:
+            continue
+        try:
+            issue = Issue.from_yaml(yaml_path)
+        except Exception as e:
+            log.debug("Skipping %s: %s", yaml_path, e)
+            continue
+        if not (config.is_completion_stage(issue.stage) or config.is_abandon_stage(issue.stage)):
+            continue
+        updated = _parse_time(issue.updated)
+        if updated is not None and updated < cutoff:
+            issues.append(issue)
+    return issues
+
+
+def _normalize_member(member: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Drop the host-specific parts of a tar header."""
+    member.mtime = 0
+    member.uid = member.gid = 0
+    member.uname = member.gname = ""
+    member.mode = 0o755 if member.isdir() else 0o644
+    return member
+
+
+def _write_pack(pack: Path, issue_dirs: list[Path]) -> None:
+    """Write issue directories to a new pack, byte-for-byte reproducibly."""
+    tmp = pack.with_name(f".{pack.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp, "wb") as raw, \
+                gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as gz, \
+                tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as out:
+            for issue_dir in sorted(issue_dirs):
+                out.add(issue_dir, arcname=issue_dir.name, filter=_normalize_member)
+        os.replace(tmp, pack)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def compact_issues(
+    agents_dir: Path,
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> list["Issue"]:
+    """Move long-finished issues out of issues/ into a new archive pack.
+
+    The issues' directories go into one pack for this run and are appended
+    to index.jsonl, then removed from issues/. The change is committed with
+    a normal write sync.
+
+    Args:
+        agents_dir: Path to _agenttree
+        max_age_days: Only archive issues finished at least this many days ago
+        dry_run: Report what would be archived without changing anything
+        now: Current time (for tests)
+
+    Returns:
+        The issues archived (or that would be)
+    """
+    from agenttree.agents_repo import register_touched_paths, sync_agents_repo
+    from agenttree.issues import evict_issue_paths
+    from agenttree.sparse_checkout import ensure_issue_materialized
+
+    issues = compactable_issues(agents_dir, max_age_days, now)
+    if dry_run or not issues:
+        return issues
+
+    target = archive_dir(agents_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    name = pack_name(now or datetime.now(timezone.utc))
+    dirs: list[Path] = []
+    lines: list[str] = []
+    for issue in issues:
+        assert issue.dir is not None
+        ensure_issue_materialized(issue.dir)
+        dirs.append(issue.dir)
+        lines.append(json.dumps({
+            "id": issue.id,
+            "slug": issue.slug,
+            "title": issue.title,
+            "stage": issue.stage,
+            "labels": list(issue.labels),
+            "created": issue.created,
+            "updated": issue.updated,
+            "pack": name,
+            "dir": issue.dir.name,
+        }, sort_keys=True) + "\n")
+    _write_pack(target / name, dirs)
+    touched: list[Path] = [target / name]
+
+    index_path = target / INDEX_FILENAME
+    append_text(index_path, "".join(lines))
+
+    removed: list[str] = []
+    for issue in issues:
+        assert issue.dir is not None
+        shutil.rmtree(issue.dir)
+        touched.append(issue.dir)
+        removed.append(f"issues/{issue.dir.name}/issue.yaml")
+    evict_issue_paths(agents_dir, removed)
+
+    register_touched_paths(agents_dir, index_path, *touched)
+    sync_agents_repo(agents_dir, commit_message=f"Archive {len(issues)} finished issue(s)")
+    log.info("Archived %d issue(s) into %s", len(issues), name)
+    return issues
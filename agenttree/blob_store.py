@@ -0,0 +1,235 @@
+"""Content-addressed store for large issue artifacts kept out of git.
+
+Terminal transcripts (tmux_history.log) can run to megabytes and grow with
+every stage. Committed into _agenttree, they get pushed and pulled by every
+sync and stay in the clone's history forever.
+
+Instead, their content goes into a local store beside _agenttree:
+
+    <project>/.agenttree-blobs/objects/ab/cdef0123....zst
+
+Objects are named by the SHA-256 of their uncompressed content, so storing
+the same text twice costs nothing, and compressed with zstd (zlib when the
+zstandard package isn't installed; `pip install zstandard`). The issue
+directory only holds a small YAML pointer, e.g. tmux_history.log.blob:
+
+    name: tmux_history.log
+    segments:
+    - sha256: 9f86d081...
+      size: 48213
+
+Appends add a segment instead of rewriting the whole artifact.
+
+The store is local to the host: another host or a fresh clone has the
+pointers but not the objects, so read_artifact() returns None there. Only
+transcripts, which are kept for humans browsing a host's history, go to the
+store. Small artifacts that agents and other hosts need (ci_feedback.md)
+stay plain files in git.
+
+Issue directories that aren't inside an _agenttree/issues tree (e.g. in
+tests) just get plain files, as before.
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+from agenttree.fileio import atomic_write_text
+from agenttree.yamlio import yaml_dump, yaml_load
+
+log = logging.getLogger("agenttree.blob_store")
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+    HAS_ZSTD = False
+
+BLOB_STORE_DIR = ".agenttree-blobs"
+POINTER_SUFFIX = ".blob"
+
+# Artifacts that are stored as blobs; everything else is a plain file
+STORED_ARTIFACTS = {"tmux_history.log"}
+
+_ZSTD_LEVEL = 10
+
+
+class BlobStore:
+    """Compressed, deduplicated objects keyed by SHA-256."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _object_path(self, digest: str, suffix: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}{suffix}"
+
+    def _find(self, digest: str) -> Optional[Path]:
+        for suffix in (".zst", ".z"):
+            path = self._object_path(digest, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def has(self, digest: str) -> bool:
+        return self._find(digest) is not None
+
+    def put(self, data: bytes) -> str:
+        """Store data (if not already present) and return its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.has(digest):
+            return digest
+
+        if HAS_ZSTD:
+            path = self._object_path(digest, ".zst")
+            compressed = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+        else:
+            path = self._object_path(digest, ".z")
+            compressed = zlib.compress(data, 9)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(compressed)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the content of an object.
+
+        Raises:
+            KeyError: If the object isn't in this store
+            RuntimeError: If it's zstd-compressed and zstandard isn't installed
+        """
+        path = self._find(digest)
+        if path is None:
+            raise KeyError(digest)
+        compressed = path.read_bytes()
+        if path.suffix == ".z":
+            return zlib.decompress(compressed)
+        if not HAS_ZSTD:
+            raise RuntimeError(f"{path} is zstd-compressed; pip install zstandard to read it")
+        data: bytes = zstandard.ZstdDecompressor().decompress(compressed)
+        return data
+
+
+def get_blob_store(agents_dir: Path) -> BlobStore:
+    """The store for an _agenttree checkout (a sibling of it)."""
+    return BlobStore(agents_dir.parent / BLOB_STORE_DIR)
+
+
+def _agents_dir_for(issue_dir: Path) -> Optional[Path]:
+    """The _agenttree dir containing issue_dir, if it's an issues/<dir>."""
+    if issue_dir.parent.name != "issues":
+        return None
+    return issue_dir.parent.parent
+
+
+def pointer_path(issue_dir: Path, name: str) -> Path:
+    return issue_dir / f"{name}{POINTER_SUFFIX}"
+
+
+def _read_pointer(path: Path) -> list[dict[str, Any]]:
+    try:
+        data = yaml_load(path.read_text())
+    except (OSError, ValueError) as e:
+        log.debug("Unreadable blob pointer %s: %s", path, e)
+        return []
+    segments = data.get("segments") if isinstance(data, dict) else None
+    return [s for s in segments or [] if isinstance(s, dict) and s.get("sha256")]
+
+
+def _read_segments(store: BlobStore, pointer: Path) -> Optional[str]:
+    """Concatenate a pointer's segments, or None if any object is missing."""
+    parts = []
+    for segment in _read_pointer(pointer):
+        try:
+            parts.append(store.get(str(segment["sha256"])).decode(errors="replace"))
+        except (KeyError, RuntimeError) as e:
+            log.warning("Blob for %s is unavailable: %s", pointer, e)
+            return None
+    return "".join(parts)
+
+
+def write_artifact(issue_dir: Path, name: str, content: str, append: bool = False) -> Path:
+    """Store an issue artifact: in the blob store if it's one of
+    STORED_ARTIFACTS, else as a plain file.
+
+    Args:
+        issue_dir: The issue's directory (_agenttree/issues/<dir>)
+        name: Artifact file name, e.g. "ci_feedback.md"
+        content: Text to store
+        append: Add content after the existing artifact instead of replacing it
+
+    Returns:
+        The file to commit for this artifact: the pointer for a stored
+        artifact, otherwise the plain file
+    """
+    from agenttree.agents_repo import register_touched_paths
+
+    plain_path = issue_dir / name
+    pointer = pointer_path(issue_dir, name)
+    agents_dir = _agents_dir_for(issue_dir)
+    issue_dir.mkdir(parents=True, exist_ok=True)
+
+    if agents_dir is None or name not in STORED_ARTIFACTS:
+        if append:
+            with open(plain_path, "a") as f:
+                f.write(content)
+        else:
+            atomic_write_text(plain_path, content)
+        if agents_dir is not None:
+            register_touched_paths(agents_dir, plain_path)
+        return plain_path
+
+    store = get_blob_store(agents_dir)
+    segments = _read_pointer(pointer) if append else []
+
+    # Fold in a plain file committed before this artifact moved to the store
+    if plain_path.exists():
+        if append and not pointer.exists():
+            legacy = plain_path.read_bytes()
+            if legacy:
+                segments.append({"sha256": store.put(legacy), "size": len(legacy)})
+        plain_path.unlink()
+        register_touched_paths(agents_dir, plain_path)
+
+    data = content.encode()
+    segments.append({"sha256": store.put(data), "size": len(data)})
+    atomic_write_text(pointer, yaml_dump({"name": name, "segments": segments}))
+
+    register_touched_paths(agents_dir, pointer)
+    return pointer
+
+
+def read_artifact(issue_dir: Path, name: str) -> Optional[str]:
+    """Read an issue artifact from its plain file or the blob store.
+
+    Returns:
+        The artifact text, or None if it doesn't exist or any of its
+        objects is missing from this host's store (e.g. written on another
+        host)
+    """
+    plain_path = issue_dir / name
+    if plain_path.exists():
+        return plain_path.read_text()
+    pointer = pointer_path(issue_dir, name)
+    agents_dir = _agents_dir_for(issue_dir)
+    if agents_dir is None or not pointer.exists():
+        return None
+    return _read_segments(get_blob_store(agents_dir), pointer)
+
+
+def artifact_exists(issue_dir: Path, name: str) -> bool:
+    """True if the artifact has a plain file or a pointer."""
+    return (issue_dir / name).exists() or pointer_path(issue_dir, name).exists()
@@ -5,12 +5,12 @@ This package contains the CLI commands organized into submodules:
 - issues: Issue management (create, list, show, doc)
 - workflow: Workflow commands (status, next, approve, defer, shutdown, rollback)
 - notes: Notes management (show, search, archive)
-- server: Server commands (start, server, run, stop-all)
+- server: Server commands (start, server, run, stop-all, stalls, heartbeat)
 - remote: Remote agent management (list, start)
 - setup: Setup commands (init, upgrade, setup, preflight)
 - dev: Development commands (test, lint, sync)
 - hooks: Hook management (check)
-- misc: Miscellaneous commands (auto-merge, context-init, tui, cleanup)
+- misc: Miscellaneous commands (auto-merge, context-init, tui, cleanup, merge-driver)
 """
 
 # Main CLI group
@@ -21,8 +21,14 @@ from agenttree.cli.notes import notes
 from agenttree.cli.remote import remote
 from agenttree.cli.cli_hooks import hooks_group
 from agenttree.cli.dev import test, lint, sync_command
-from agenttree.cli.misc import auto_merge, context_init, cleanup_command, tui_command
-from agenttree.cli.server import start_all, server, run_command, stop_all, stalls
+from agenttree.cli.misc import (
+    auto_merge,
+    context_init,
+    cleanup_command,
+    tui_command,
+    merge_driver_command,
+)
+from agenttree.cli.server import start_all, server, run_command, stop_all, stalls, heartbeat_stats
 from agenttree.cli.mcp_cmd import mcp_serve
 from agenttree.cli.issues import issue
 from agenttree.cli.setup import init, upgrade, setup as setup_cmd, preflight, migrate_docs
@@ -73,8 +79,10 @@ main.add_command(auto_merge)
 main.add_command(context_init)
 main.add_command(cleanup_command)
 main.add_command(tui_command)
+main.add_command(merge_driver_command)
 main.add_command(stop_all)
 main.add_command(stalls)
+main.add_command(heartbeat_stats)
 main.add_command(mcp_serve)
 main.add_command(stage_status)
 main.add_command(stage_next)
@@ -234,13 +234,19 @@ def issue_create(
     is_flag=True,
     help="Show only issues waiting for human review"
 )
+@click.option(
+    "--archived",
+    is_flag=True,
+    help="List archived issues instead (see 'agenttree issue archive')"
+)
 def issue_list(
     stage: str | None,
     priority: str | None,
     as_json: bool,
     show_all: bool,
     search: str | None,
-    waiting: bool
+    waiting: bool,
+    archived: bool,
 ) -> None:
     """List issues.
 
@@ -255,7 +261,12 @@ def issue_list(
         agenttree issue list --stage backlog
         agenttree issue list -s implement -p high
         agenttree issue list --json
+        agenttree issue list --archived --search login
     """
+    if archived:
+        _list_archived_issues(search or "", as_json)
+        return
+
     config = load_config()
     stage_filter = stage if stage else None
     priority_filter = Priority(priority) if priority else None
@@ -360,6 +371,67 @@ def issue_list(
     console.print(table)
 
 
+def _list_archived_issues(search: str, as_json: bool) -> None:
+    from agenttree.archive import search_archive
+    from agenttree.issues import get_agenttree_path
+
+    entries = search_archive(get_agenttree_path(), search)
+    if as_json:
+        import json
+        console.print(json.dumps(entries, indent=2))
+        return
+    if not entries:
+        console.print("[yellow]No archived issues found[/yellow]")
+        return
+
+    table = Table(title="Archived Issues")
+    table.add_column("ID", style="cyan")
+    table.add_column("Title", style="white")
+    table.add_column("Stage", style="magenta")
+    table.add_column("Archive", style="dim")
+    for entry in entries:
+        title = str(entry.get("title", ""))
+        table.add_row(
+            str(entry["id"]),
+            title[:40] + ("..." if len(title) > 40 else ""),
+            str(entry.get("stage", "")),
+            f"archive/{entry.get('pack', '')}",
+        )
+    console.print(table)
+
+
+@issue.command("archive")
+@click.option(
+    "--older-than", "max_age_days",
+    type=float,
+    default=30,
+    show_default=True,
+    help="Archive issues finished (accepted/abandoned) at least this many days ago"
+)
+@click.option("--dry-run", is_flag=True, help="Show what would be archived")
+def issue_archive(max_age_days: float, dry_run: bool) -> None:
+    """Pack long-finished issues into _agenttree/issues/archive/.
+
+    Each run packs the issues' files into a new tarball, and an index keeps
+    them searchable with 'agenttree issue list --archived'.
+
+    Examples:
+        agenttree issue archive --dry-run
+        agenttree issue archive --older-than 90
+    """
+    from agenttree.archive import compact_issues
+    from agenttree.issues import get_agenttree_path
+
+    issues = compact_issues(get_agenttree_path(), max_age_days=max_age_days, dry_run=dry_run)
+    if not issues:
+        console.print(f"[dim]No issues finished more than {max_age_days:g} days ago[/dim]")
+        return
+    verb = "Would archive" if dry_run else "Archived"
+    console.print(f"[green]{verb} {len(issues)} issue(s):[/green]")
+    for issue in issues:
+        console.print(f"  #{issue.id} {issue.title} [dim]({issue.stage})[/dim]")
+
+
 @issue.command("show")
 @click.argument("issue_id")
 @click.option("--json", "as_json", is_flag=True, help="Output full issue as JSON")
@@ -383,7 +455,19 @@ def issue_show(issue_id: str, as_json: bool, field_name: str | None) -> None:
     issue = get_issue_func(issue_id)
 
     if not issue:
-        console.print(f"[red]Issue {issue_id} not found[/red]")
+        from agenttree.archive import load_archive_index
+        from agenttree.issues import get_agenttree_path
+
+        try:
+            archived = load_archive_index(get_agenttree_path()).get(normalize_issue_id(issue_id))
+        except ValueError:
+            archived = None
+        if archived:
+            console.print(
+                f"[yellow]Issue {issue_id} is archived in issues/archive/{archived['pack']}[/yellow]"
+            )
+        else:
+            console.print(f"[red]Issue {issue_id} not found[/red]")
         sys.exit(1)
 
     # Machine-readable output modes
@@ -617,3 +617,18 @@ def tui_command() -> None:
 
     app = TUIApp()
     app.run()
+
+
+@click.command("merge-driver", hidden=True)
+@click.argument("kind", type=click.Choice(["issue", "history"]))
+@click.argument("base", type=click.Path(path_type=Path))
+@click.argument("ours", type=click.Path(path_type=Path))
+@click.argument("theirs", type=click.Path(path_type=Path))
+def merge_driver_command(kind: str, base: Path, ours: Path, theirs: Path) -> None:
+    """Git merge driver for _agenttree issue files (run by git, not by hand).
+
+    Registered by AgentsRepository.ensure_repo(); see agenttree.merge_driver.
+    """
+    from agenttree.merge_driver import run_driver
+
+    sys.exit(run_driver(kind, base, ours, theirs))
@@ -1,4 +1,4 @@
-"""Server commands (start, server, run, stop-all, stalls)."""
+"""Server commands (start, server, run, stop-all, stalls, heartbeat)."""
 
 import subprocess
 import sys
@@ -293,3 +293,59 @@ def stalls(threshold: int | None) -> None:
         console.print()
 
     console.print("[dim]Use 'agenttree send <id> \"message\"' to nudge a stalled agent[/dim]")
+
+
+@click.command("heartbeat")
+@click.option("--port", default=None, type=int, help="Server port (default: from port_range config)")
+@click.option("--json", "as_json", is_flag=True, help="Output raw statistics as JSON")
+def heartbeat_stats(port: int | None, as_json: bool) -> None:
+    """Show heartbeat tick timing from the running server.
+
+    Reports how long ticks take, how many overran the interval and how
+    many ticks were skipped as a result.
+
+    Examples:
+        agenttree heartbeat
+        agenttree heartbeat --json
+    """
+    import json
+    import urllib.error
+    import urllib.request
+
+    if port is None:
+        port = load_config().server_port
+
+    try:
+        with urllib.request.urlopen(f"http://localhost:{port}/health", timeout=5) as response:
+            stats = json.loads(response.read()).get("heartbeat")
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        console.print(f"[red]Could not reach the AgentTree server on port {port}: {e}[/red]")
+        sys.exit(1)
+
+    if not stats:
+        console.print("[yellow]Heartbeat not running yet[/yellow]")
+        return
+    if as_json:
+        console.print(json.dumps(stats, indent=2))
+        return
+
+    console.print(f"[bold]Heartbeat[/bold] every {stats['interval_s']:g}s")
+    console.print(f"  Ticks: {stats['ticks']}")
+    overrun_style = "yellow" if stats["overruns"] else "green"
+    console.print(
+        f"  Overruns: [{overrun_style}]{stats['overruns']}[/{overrun_style}]"
+        f" ({stats['skipped_ticks']} tick(s) skipped)"
+    )
+    if stats["ticks"]:
+        console.print(
+            f"  Duration: last {stats['last_duration_s']}s, "
+            f"mean {stats['mean_duration_s']}s, max {stats['max_duration_s']}s"
+        )
+        console.print("  Histogram (ticks at or under):")
+        previous = 0
+        for bound, cumulative in stats["duration_histogram"].items():
+            count = cumulative - previous
+            previous = cumulative
+            if count:
+                label = "longer" if bound == "+Inf" else f"{bound}s"
+                console.print(f"    {label:>8}  {count}")
@@ -50,10 +50,10 @@ def _time_in_stage(issue: Issue) -> str:
     """Compute time in current stage from last history entry."""
     from datetime import datetime, timezone
 
-    if not issue.history:
+    if not issue.last_history:
         return "?"
     try:
-        ts = issue.history[-1].timestamp
+        ts = issue.last_history.timestamp
         from agenttree.issues import parse_utc_timestamp
         stage_start = parse_utc_timestamp(ts)
         elapsed_min = int((datetime.now(timezone.utc) - stage_start).total_seconds() / 60)
@@ -2,10 +2,11 @@
 
 import logging
 from pathlib import Path
-import yaml
 from jinja2 import Template, UndefinedError
 from pydantic import BaseModel, ConfigDict, Field
 
+from agenttree.yamlio import yaml_load
+
 logger = logging.getLogger(__name__)
 
 # Default role for agents — used as parameter default across the codebase.
@@ -213,6 +214,9 @@ class HeartbeatConfig(BaseModel):
 
     interval_s: int = 10
     actions: list[str | dict] = Field(default_factory=list)
+    max_parallel: int = 1  # Above 1, actions run concurrently (writers need after: sync)
+    action_timeout_s: float = 120.0  # Default per-action deadline (override with timeout_s)
+    state_checkpoint_s: float = 30.0  # Web server writes heartbeat state at most this often
 
 
 class OnConfig(BaseModel):
@@ -479,6 +483,10 @@ class Config(BaseModel):
     on: OnConfig | None = None
     rate_limit_fallback: RateLimitFallbackConfig = Field(default_factory=RateLimitFallbackConfig)
     allow_self_approval: bool = False
+    # Minimum seconds between remote checks for read-only syncs, per process
+    sync_min_interval_s: float = 5.0
+    # Partial, sparse clones of _agenttree (see agenttree.sparse_checkout)
+    sparse_agents_repo: bool = False
     containers: dict[str, ContainerTypeConfig] = Field(default_factory=dict)
 
     # ── Port / path helpers ──────────────────────────────────────────
@@ -1177,7 +1185,7 @@ def load_config(path: Path | None = None) -> "Config":
         return cached[1]
 
     with open(config_file, "r") as f:
-        data = yaml.safe_load(f)
+        data = yaml_load(f)
 
     if data is None:
         return Config()
@@ -13,6 +13,8 @@ from typing import TYPE_CHECKING
 
 from rich.console import Console
 
+from agenttree.blob_store import BLOB_STORE_DIR
+
 log = logging.getLogger("agenttree.container")
 console = Console()
 
@@ -327,6 +329,11 @@ def build_container_command(
         agenttrees_dir = main_repo_dir / "_agenttree"
         if agenttrees_dir.exists():
             cmd.extend(["-v", f"{agenttrees_dir}:/workspace/_agenttree"])
+        # Blob store for transcripts kept out of _agenttree's git. Created
+        # up front so blobs written in the container land on the host.
+        blobs_dir = main_repo_dir / BLOB_STORE_DIR
+        blobs_dir.mkdir(exist_ok=True)
+        cmd.extend(["-v", f"{blobs_dir}:/workspace/{BLOB_STORE_DIR}"])
 
     # === 2. Tool mounts ===
     for host_path, container_path, mode in tool_config.container_mounts(abs_path, role, home):
@@ -874,6 +881,46 @@ def list_running_containers() -> list[str]:
         return []
 
 
+def list_running_container_names() -> list[str]:
+    """List the names of all running containers.
+
+    One runtime call, for callers checking many containers at once (see
+    snapshot.TickSnapshot); match names by prefix like is_container_running().
+
+    Returns:
+        Container names, or an empty list if there is no runtime or it fails
+    """
+    import json
+
+    runtime = get_container_runtime()
+    if not runtime.runtime:
+        return []
+
+    try:
+        if runtime.runtime == "container":
+            result = subprocess.run(
+                ["container", "list", "--format", "json"],
+                capture_output=True, text=True, timeout=10,
+            )
+            if result.returncode != 0:
+                return []
+            containers = json.loads(result.stdout) if result.stdout.strip() else []
+            return [
+                c["name"] for c in containers
+                if c.get("status") == "running" and c.get("name")
+            ]
+        else:
+            result = subprocess.run(
+                [runtime.runtime, "ps", "--format", "{{.Names}}"],
+                capture_output=True, text=True, timeout=10,
+            )
+            if result.returncode != 0:
+                return []
+            return [n.strip() for n in result.stdout.splitlines() if n.strip()]
+    except (subprocess.TimeoutExpired, subprocess.SubprocessError, json.JSONDecodeError):
+        return []
+
+
 def get_api_key_suffix(api_key: str) -> str:
     """Extract the suffix of an API key for Claude's approval system.
     
@@ -1005,6 +1052,9 @@ def start_container_detached(
         agenttrees_dir = main_repo_dir / "_agenttree"
         if agenttrees_dir.exists():
             cmd.extend(["-v", f"{agenttrees_dir}:/workspace/_agenttree"])
+        blobs_dir = main_repo_dir / BLOB_STORE_DIR
+        blobs_dir.mkdir(exist_ok=True)
+        cmd.extend(["-v", f"{blobs_dir}:/workspace/{BLOB_STORE_DIR}"])
     
     # Mount claude config directory
     claude_config_dir = home / ".claude"
@@ -19,23 +19,47 @@ Example config:
         actions:
           - sync
           - check_stalled_agents: { min_interval_s: 60 }
-          - check_ci_status: { min_interval_s: 120 }
+          - check_ci_status: { min_interval_s: 120, after: sync, timeout_s: 60 }
           - check_merged_prs: { min_interval_s: 30 }
       
       shutdown:
         - sync
         - stop_all_agents
 
+Heartbeat actions run one at a time in order by default. Set `max_parallel`
+above 1 to run them concurrently on a pool of that many threads, so one
+slow action doesn't hold up the rest. `after` names actions that must
+finish first in the same tick: anything that writes issues or commits to
+_agenttree should run `after: sync`, since sync pulls into the same working
+tree. Each action gets a deadline (`timeout_s`, default `action_timeout_s`):
+past it the tick stops waiting, reports the action as timed out and sets its
+`_cancel` event for actions that check it. Until a timed-out run finishes,
+later ticks skip that action. Startup and shutdown actions always run in order.
+Actions that change the shared event state do so under `event_state_lock`.
+
+Every action also gets `_snapshot`, a TickSnapshot of the config, issues,
+tmux sessions and containers shared by the whole tick (see snapshot.py).
+
 State is persisted in _agenttree/.heartbeat_state.yaml for rate limiting across restarts.
+The web server keeps it in memory instead (start_event_state_store): every
+load_event_state() there returns the same live dict, and the file is only
+rewritten, atomically, at most every `state_checkpoint_s` seconds (default
+30) while it changes, and once more on shutdown.
 """
 
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import yaml
 from rich.console import Console
 
+from agenttree.fileio import atomic_write_text, group_commit
+from agenttree.snapshot import TickSnapshot
+from agenttree.yamlio import yaml_dump, yaml_load
+
 console = Console()
 
 # Event types
@@ -43,40 +67,152 @@ STARTUP = "startup"
 SHUTDOWN = "shutdown"
 HEARTBEAT = "heartbeat"
 
+# Heartbeat scheduling defaults (overridable under on.heartbeat)
+DEFAULT_MAX_PARALLEL = 1
+DEFAULT_ACTION_TIMEOUT_S = 120.0
 
-def load_event_state(agents_dir: Path) -> dict[str, Any]:
-    """Load event/hook state from _agenttree/.heartbeat_state.yaml.
+# Action name -> future of a run that outlived its deadline and is still going
+_overdue: dict[str, Future[None]] = {}
 
-    Args:
-        agents_dir: Path to _agenttree directory
 
-    Returns:
-        State dict, empty if file doesn't exist
-    """
-    state_file = agents_dir / ".heartbeat_state.yaml"
+STATE_FILENAME = ".heartbeat_state.yaml"
+
+# Guards event state dicts, which concurrent heartbeat actions share
+event_state_lock = threading.RLock()
+DEFAULT_STATE_CHECKPOINT_S = 30.0
+
+
+def _read_state_file(agents_dir: Path) -> dict[str, Any]:
+    state_file = agents_dir / STATE_FILENAME
     if state_file.exists():
         try:
             with open(state_file) as f:
-                data = yaml.safe_load(f)
+                data = yaml_load(f)
                 return data if isinstance(data, dict) else {}
         except Exception:
             return {}
     return {}
 
 
+def _write_state_file(agents_dir: Path, state: dict[str, Any]) -> None:
+    try:
+        atomic_write_text(agents_dir / STATE_FILENAME, yaml_dump(state))
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not save event state: {e}[/yellow]")
+
+
+class EventStateStore:
+    """Event state kept in memory by a long-running process, checkpointed to disk."""
+
+    def __init__(self, agents_dir: Path, checkpoint_interval_s: float = DEFAULT_STATE_CHECKPOINT_S):
+        self.agents_dir = agents_dir
+        self.checkpoint_interval_s = checkpoint_interval_s
+        self.state = _read_state_file(agents_dir)
+        self._lock = event_state_lock
+        self._dirty = False
+        self._last_checkpoint = time.monotonic()
+
+    def replace(self, state: dict[str, Any]) -> None:
+        """Make state the store's contents and mark it changed."""
+        with self._lock:
+            if state is not self.state:
+                self.state.clear()
+                self.state.update(state)
+            self._dirty = True
+
+    def checkpoint(self, force: bool = False) -> bool:
+        """Write the state if it changed and the checkpoint interval has passed.
+
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty or (
+                not force and now - self._last_checkpoint < self.checkpoint_interval_s
+            ):
+                return False
+            _write_state_file(self.agents_dir, self.state)
+            self._dirty = False
+            self._last_checkpoint = now
+            return True
+
+
+_state_store: EventStateStore | None = None
+
+
+def start_event_state_store(
+    agents_dir: Path, checkpoint_interval_s: float = DEFAULT_STATE_CHECKPOINT_S
+) -> EventStateStore:
+    """Hold agents_dir's event state in memory in this process until stopped."""
+    global _state_store
+
+    stop_event_state_store()
+    _state_store = EventStateStore(agents_dir, checkpoint_interval_s)
+    return _state_store
+
+
+def stop_event_state_store() -> None:
+    """Write any unsaved state and go back to reading and writing the file."""
+    global _state_store
+
+    if _state_store is None:
+        return
+    store, _state_store = _state_store, None
+    store.checkpoint(force=True)
+
+
+def _store_for(agents_dir: Path) -> EventStateStore | None:
+    store = _state_store
+    return store if store is not None and store.agents_dir == agents_dir else None
+
+
+def load_event_state(agents_dir: Path) -> dict[str, Any]:
+    """Load event/hook state from _agenttree/.heartbeat_state.yaml.
+
+    With an in-memory store for agents_dir, returns its live dict instead.
+
+    Args:
+        agents_dir: Path to _agenttree directory
+
+    Returns:
+        State dict, empty if file doesn't exist
+    """
+    store = _store_for(agents_dir)
+    if store is not None:
+        return store.state
+    return _read_state_file(agents_dir)
+
+
 def save_event_state(agents_dir: Path, state: dict[str, Any]) -> None:
     """Save event/hook state to _agenttree/.heartbeat_state.yaml.
 
+    With an in-memory store for agents_dir, updates it and leaves the write
+    to its next checkpoint.
+
     Args:
         agents_dir: Path to _agenttree directory
         state: State dict to save
     """
-    state_file = agents_dir / ".heartbeat_state.yaml"
+    store = _store_for(agents_dir)
+    if store is not None:
+        store.replace(state)
+        return
+    with event_state_lock:
+        _write_state_file(agents_dir, state)
+
+
+def get_state_checkpoint_interval() -> float:
+    """Seconds between heartbeat state checkpoints (on.heartbeat.state_checkpoint_s)."""
+    from agenttree.config import load_config
+
     try:
-        with open(state_file, "w") as f:
-            yaml.dump(state, f, default_flow_style=False, sort_keys=False)
-    except Exception as e:
-        console.print(f"[yellow]Warning: Could not save event state: {e}[/yellow]")
+        heartbeat_config = (load_config().model_dump().get("on") or {}).get("heartbeat") or {}
+        if isinstance(heartbeat_config, dict) and heartbeat_config.get("state_checkpoint_s"):
+            return float(heartbeat_config["state_checkpoint_s"])
+    except Exception:
+        pass
+    return DEFAULT_STATE_CHECKPOINT_S
 
 
 def check_action_rate_limit(
@@ -149,10 +285,11 @@ def update_action_state(
         action_name: Identifier for this action
         state: State dict to update in place
     """
-    if action_name not in state:
-        state[action_name] = {}
+    with event_state_lock:
+        if action_name not in state:
+            state[action_name] = {}
 
-    state[action_name]["last_run_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        state[action_name]["last_run_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def parse_action_entry(
@@ -207,7 +344,7 @@ def fire_event(
     Returns:
         Dict with results: {"success": bool, "actions_run": int, "errors": list}
     """
-    from agenttree.actions import get_action, get_default_event_config
+    from agenttree.actions import get_default_event_config
     from agenttree.config import load_config
     
     results: dict[str, Any] = {
@@ -242,6 +379,8 @@ def fire_event(
     
     # Parse event config - can be a list or a dict with 'actions' key
     actions: list[str | dict[str, Any]] = []
+    max_parallel = 1
+    default_timeout = DEFAULT_ACTION_TIMEOUT_S
     
     if isinstance(event_config, list):
         # Simple list of actions
@@ -249,11 +388,16 @@ def fire_event(
     elif isinstance(event_config, dict):
         # Dict with optional 'actions' key
         actions = event_config.get("actions", [])
+        if event == HEARTBEAT:
+            max_parallel = int(event_config.get("max_parallel") or DEFAULT_MAX_PARALLEL)
+            default_timeout = float(event_config.get("action_timeout_s") or DEFAULT_ACTION_TIMEOUT_S)
         # If no 'actions' key, the dict itself might be actions
         if not actions:
             # Check if it looks like action entries
             for key in event_config:
-                if key not in ("interval_s", "actions"):
+                if key not in (
+                    "interval_s", "actions", "max_parallel", "action_timeout_s", "state_checkpoint_s",
+                ):
                     # Treat as single action config
                     actions = [event_config]
                     break
@@ -264,59 +408,225 @@ def fire_event(
     # Use caller-provided heartbeat count (web app tracks its own),
     # otherwise increment from persisted state
     if event == HEARTBEAT and heartbeat_count is None:
-        heartbeat_count = state.get("_heartbeat_count", 0) + 1
-        state["_heartbeat_count"] = heartbeat_count
+        with event_state_lock:
+            heartbeat_count = state.get("_heartbeat_count", 0) + 1
+            state["_heartbeat_count"] = heartbeat_count
     
-    # Execute each action
+    # One view of config, issues, tmux sessions and containers for every action
+    snapshot = TickSnapshot(agents_dir, config)
+
+    if max_parallel > 1:
+        _run_actions_parallel(
+            actions, agents_dir, state, heartbeat_count, verbose, results,
+            max_parallel, default_timeout, snapshot,
+        )
+    else:
+        # Execute each action. Issue saves made by the actions share a single
+        # directory fsync barrier at the end of the tick instead of paying one each.
+        with group_commit():
+            _run_actions(actions, agents_dir, state, heartbeat_count, verbose, results, snapshot)
+
+    # Save updated state (in memory in the web server, checkpointed to disk)
+    save_event_state(agents_dir, state)
+    store = _store_for(agents_dir)
+    if store is not None:
+        store.checkpoint()
+
+    return results
+
+
+def _should_run(
+    action_name: str,
+    action_config: dict[str, Any],
+    state: dict[str, Any],
+    heartbeat_count: int | None,
+    verbose: bool,
+    results: dict[str, Any],
+) -> bool:
+    """Check the rate limit and that the action exists, recording skips in results."""
+    from agenttree.actions import get_action
+
+    should_run, reason = check_action_rate_limit(
+        action_name, action_config, state, heartbeat_count
+    )
+    if not should_run:
+        if verbose:
+            console.print(f"[dim]{action_name}: {reason}[/dim]")
+        results["actions_skipped"] += 1
+        return False
+
+    if get_action(action_name) is None:
+        error = f"Unknown action: {action_name}"
+        results["errors"].append(error)
+        if verbose:
+            console.print(f"[yellow]Warning: {error}[/yellow]")
+        return False
+    return True
+
+
+def _record_failure(
+    action_name: str,
+    action_config: dict[str, Any],
+    error: str,
+    verbose: bool,
+    results: dict[str, Any],
+) -> None:
+    results["errors"].append(error)
+    # Check if action is optional
+    if action_config.get("optional", False):
+        if verbose:
+            console.print(f"[yellow]Warning: {error} (optional)[/yellow]")
+    else:
+        results["success"] = False
+        console.print(f"[red]Error: {error}[/red]")
+
+
+def _action_kwargs(action_config: dict[str, Any]) -> dict[str, Any]:
+    """Action config minus the scheduling keys, passed to the action function."""
+    return {k: v for k, v in action_config.items() if k not in ("after", "timeout_s")}
+
+
+def _run_actions(
+    actions: list[str | dict[str, Any]],
+    agents_dir: Path,
+    state: dict[str, Any],
+    heartbeat_count: int | None,
+    verbose: bool,
+    results: dict[str, Any],
+    snapshot: TickSnapshot | None = None,
+) -> None:
+    """Run each configured action in order, recording outcomes in results."""
+    from agenttree.actions import get_action
+
     for entry in actions:
         action_name, action_config = parse_action_entry(entry)
-        
-        # Check rate limit
-        should_run, reason = check_action_rate_limit(
-            action_name, action_config, state, heartbeat_count
-        )
-        
-        if not should_run:
-            if verbose:
-                console.print(f"[dim]{action_name}: {reason}[/dim]")
-            results["actions_skipped"] += 1
+        if not _should_run(action_name, action_config, state, heartbeat_count, verbose, results):
             continue
-        
-        # Get the action function
         action_fn = get_action(action_name)
-        if action_fn is None:
-            error = f"Unknown action: {action_name}"
-            results["errors"].append(error)
-            if verbose:
-                console.print(f"[yellow]Warning: {error}[/yellow]")
-            continue
-        
+        assert action_fn is not None  # _should_run() checked
+
         # Execute the action
         try:
             if verbose:
                 console.print(f"[dim]Running {action_name}...[/dim]")
             
-            action_fn(agents_dir, _event_state=state, **action_config)
+            action_fn(
+                agents_dir, _event_state=state, _snapshot=snapshot, **_action_kwargs(action_config)
+            )
             update_action_state(action_name, state)
             results["actions_run"] += 1
 
         except Exception as e:
-            error = f"{action_name} failed: {e}"
-            results["errors"].append(error)
             update_action_state(action_name, state)
-            
-            # Check if action is optional
-            if action_config.get("optional", False):
-                if verbose:
-                    console.print(f"[yellow]Warning: {error} (optional)[/yellow]")
-            else:
-                results["success"] = False
-                console.print(f"[red]Error: {error}[/red]")
-    
-    # Save updated state
-    save_event_state(agents_dir, state)
-    
-    return results
+            _record_failure(action_name, action_config, f"{action_name} failed: {e}", verbose, results)
+
+
+def _dependencies(action_config: dict[str, Any]) -> set[str]:
+    after = action_config.get("after") or []
+    return {after} if isinstance(after, str) else set(after)
+
+
+def _run_actions_parallel(
+    actions: list[str | dict[str, Any]],
+    agents_dir: Path,
+    state: dict[str, Any],
+    heartbeat_count: int | None,
+    verbose: bool,
+    results: dict[str, Any],
+    max_parallel: int,
+    default_timeout: float,
+    snapshot: TickSnapshot | None = None,
+) -> None:
+    """Run actions concurrently, honouring `after` ordering and per-action deadlines.
+
+    An action starts once every action it names in `after` has finished
+    (or been skipped, failed or timed out) in this tick; names not in the
+    action list are ignored. Ready actions start in config order, at most
+    max_parallel at a time. The tick lasts as long as its slowest chain.
+    """
+    from agenttree.actions import get_action
+
+    entries = [parse_action_entry(entry) for entry in actions]
+    names = {name for name, _ in entries}
+    pending = [
+        (name, config, _dependencies(config) & names) for name, config in entries
+    ]
+    done: set[str] = set()
+    # future -> (action name, action config, deadline, cancel event)
+    running: dict[Future[None], tuple[str, dict[str, Any], float, threading.Event]] = {}
+
+    def run(fn: Any, name: str, config: dict[str, Any], cancel: threading.Event) -> None:
+        # Issue saves within one action share a single directory fsync barrier
+        with group_commit():
+            if verbose:
+                console.print(f"[dim]Running {name}...[/dim]")
+            fn(
+                agents_dir, _event_state=state, _cancel=cancel, _snapshot=snapshot,
+                **_action_kwargs(config),
+            )
+
+    pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="heartbeat-action")
+    try:
+        while pending or running:
+            # Start every ready action, in config order, while workers are free
+            for item in list(pending):
+                name, config, deps = item
+                if len(running) >= max_parallel:
+                    break
+                if not deps <= done:
+                    continue
+                pending.remove(item)
+                overdue = _overdue.get(name)
+                if overdue is not None and not overdue.done():
+                    if verbose:
+                        console.print(f"[dim]{name}: previous run still in progress[/dim]")
+                    results["actions_skipped"] += 1
+                    done.add(name)
+                    continue
+                _overdue.pop(name, None)
+                if not _should_run(name, config, state, heartbeat_count, verbose, results):
+                    done.add(name)
+                    continue
+                cancel = threading.Event()
+                timeout = float(config.get("timeout_s") or default_timeout)
+                future = pool.submit(run, get_action(name), name, config, cancel)
+                running[future] = (name, config, time.monotonic() + timeout, cancel)
+
+            if not running:
+                if pending:
+                    cycle = ", ".join(name for name, _, _ in pending)
+                    results["errors"].append(f"Dependency cycle in heartbeat actions: {cycle}")
+                    results["success"] = False
+                    console.print(f"[red]Error: dependency cycle in heartbeat actions: {cycle}[/red]")
+                break
+
+            next_deadline = min(deadline for _, _, deadline, _ in running.values())
+            finished, _ = wait(
+                running, timeout=max(next_deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED
+            )
+            now = time.monotonic()
+            for future, (name, config, deadline, cancel) in list(running.items()):
+                if future in finished:
+                    error = future.exception()
+                    update_action_state(name, state)
+                    if error is None:
+                        results["actions_run"] += 1
+                    else:
+                        _record_failure(name, config, f"{name} failed: {error}", verbose, results)
+                elif now >= deadline:
+                    # Threads can't be killed: ask the action to stop, stop
+                    # waiting for it, and skip it until it's finished
+                    cancel.set()
+                    _overdue[name] = future
+                    update_action_state(name, state)
+                    timeout = float(config.get("timeout_s") or default_timeout)
+                    _record_failure(name, config, f"{name} timed out after {timeout:g}s", verbose, results)
+                else:
+                    continue
+                del running[future]
+                done.add(name)
+    finally:
+        pool.shutdown(wait=False)
 
 
 def get_heartbeat_interval(agents_dir: Path | None = None) -> int:
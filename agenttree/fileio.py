@@ -0,0 +1,133 @@
+"""Crash-safe file writes for AgentTree state files.
+
+Writers replace files atomically (temp file + os.replace), so concurrent
+readers such as the heartbeat thread and web requests never see a
+half-written issue.yaml.
+
+Every replaced file's data is fsynced before the rename, so a crash can't
+leave a renamed but empty or truncated file. By default the directory is
+fsynced right after the rename too. Inside a group_commit() block, the
+directory fsyncs (and the fsyncs of appended logs) are deferred and issued
+once per distinct path when the block exits, so a heartbeat tick that saves
+several issues pays for one barrier per directory. A crash before the
+barrier may lose the rename, leaving the previous complete file.
+"""
+
+import os
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+_local = threading.local()
+
+
+def _fsync_path(path: Path) -> None:
+    """fsync an existing file or directory by path."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path | str, content: str) -> None:
+    """Write text to path atomically.
+
+    The content is written to a temp file in the same directory, fsynced
+    and renamed over the target. Outside group_commit() the directory is
+    then fsynced; inside, it's queued for the group's barrier.
+
+    Args:
+        path: Destination file
+        content: Text to write
+    """
+    path = Path(path)
+    pending_dirs: set[Path] | None = getattr(_local, "pending_dirs", None)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if pending_dirs is None:
+        _fsync_path(path.parent)
+    else:
+        pending_dirs.add(path.parent)
+
+
+def append_text(path: Path | str, content: str) -> None:
+    """Append text to an append-only log file, creating it if needed.
+
+    Appends aren't atomic; readers of such logs should skip a torn last
+    line. Inside group_commit() the file's fsync is deferred to the group's
+    barrier as well, since a lost tail is just a torn line.
+
+    Args:
+        path: Log file
+        content: Text to append (normally whole lines)
+    """
+    path = Path(path)
+    pending: set[Path] | None = getattr(_local, "pending", None)
+    is_new = not path.exists()
+
+    with open(path, "a") as f:
+        f.write(content)
+        if pending is None:
+            f.flush()
+            os.fsync(f.fileno())
+
+    if pending is not None:
+        pending.add(path)
+    elif is_new:
+        _fsync_path(path.parent)
+
+
+@contextmanager
+def group_commit() -> Iterator[None]:
+    """Defer directory and append fsyncs on this thread to a single barrier.
+
+    Nested blocks join the outermost one. Each touched directory and
+    appended file is fsynced once, however many writes it saw.
+    """
+    if getattr(_local, "pending", None) is not None:
+        yield
+        return
+
+    _local.pending = set()
+    _local.pending_dirs = set()
+    try:
+        yield
+    finally:
+        pending: set[Path] = _local.pending
+        pending_dirs: set[Path] = _local.pending_dirs
+        _local.pending = None
+        _local.pending_dirs = None
+        _flush_pending(pending, pending_dirs)
+
+
+def _flush_pending(paths: set[Path], dirs: set[Path]) -> None:
+    """fsync each appended file, then each touched directory once, skipping vanished paths."""
+    dirs = set(dirs)
+    for path in paths:
+        try:
+            _fsync_path(path)
+        except FileNotFoundError:
+            continue
+        dirs.add(path.parent)
+    for directory in dirs:
+        try:
+            _fsync_path(directory)
+        except FileNotFoundError:
+            continue
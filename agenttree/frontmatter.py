@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Dict, Any, Tuple
 from datetime import datetime, timezone
 
+from agenttree.yamlio import yaml_dump, yaml_load
+
 
 def create_frontmatter(data: Dict[str, Any]) -> str:
     """Create YAML frontmatter block.
@@ -27,7 +29,7 @@ def create_frontmatter(data: Dict[str, Any]) -> str:
         >>> create_frontmatter({"title": "Test", "version": 1})
         '---\\ntitle: Test\\nversion: 1\\n---\\n\\n'
     """
-    yaml_content = yaml.dump(data, default_flow_style=False, sort_keys=False)
+    yaml_content = yaml_dump(data)
     return f"---\n{yaml_content}---\n\n"
 
 
@@ -57,7 +59,7 @@ def parse_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
         if len(parts) < 3:
             return {}, content
 
-        frontmatter = yaml.safe_load(parts[1])
+        frontmatter = yaml_load(parts[1])
         markdown = parts[2].strip()
 
         return frontmatter or {}, markdown
@@ -80,46 +82,14 @@ def get_git_context(repo_path: Path) -> Dict[str, Any]:
         >>> 'starting_commit' in ctx
         True
     """
-    try:
-        # Get current commit hash
-        current_commit = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        ).stdout.strip()
-
-        # Get current branch name
-        current_branch = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        ).stdout.strip()
-
-        # Get remote URL
-        repo_url = subprocess.run(
-            ["git", "config", "--get", "remote.origin.url"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        ).stdout.strip()
+    from agenttree.git_backend import get_git_backend
 
-        # Convert git@github.com:user/repo.git to https://github.com/user/repo
-        if repo_url.startswith("git@"):
-            repo_url = repo_url.replace(":", "/").replace("git@", "https://")
-        if repo_url.endswith(".git"):
-            repo_url = repo_url[:-4]
+    git = get_git_backend()
+    current_commit = git.head(repo_path)
+    current_branch = git.current_branch(repo_path)
+    repo_url = git.config_get(repo_path, "remote.origin.url")
 
-        return {
-            "repo_url": repo_url,
-            "starting_commit": current_commit,
-            "starting_branch": current_branch,
-        }
-    except subprocess.CalledProcessError:
+    if current_commit is None or current_branch is None or repo_url is None:
         # Git command failed, return minimal context
         return {
             "repo_url": None,
@@ -127,6 +97,18 @@ def get_git_context(repo_path: Path) -> Dict[str, Any]:
             "starting_branch": None,
         }
 
+    # Convert git@github.com:user/repo.git to https://github.com/user/repo
+    if repo_url.startswith("git@"):
+        repo_url = repo_url.replace(":", "/").replace("git@", "https://")
+    if repo_url.endswith(".git"):
+        repo_url = repo_url[:-4]
+
+    return {
+        "repo_url": repo_url,
+        "starting_commit": current_commit,
+        "starting_branch": current_branch,
+    }
+
 
 def get_commits_since(repo_path: Path, since_commit: str) -> list[Dict[str, str]]:
     """Get list of commits since a given commit.
@@ -0,0 +1,288 @@
+"""Git backends for read-mostly repository operations.
+
+Hot paths (the heartbeat, web requests showing ahead/behind counts, every
+sync of _agenttree) ask git small questions: what's HEAD, is the tree
+dirty, how far is this branch from main. Each subprocess call costs a
+fork/exec of several milliseconds, so when pygit2 (libgit2 bindings) is
+installed these are answered in-process instead.
+
+    pip install pygit2
+
+The subprocess backend is the fallback and the reference behaviour. Set
+AGENTTREE_GIT_BACKEND=subprocess to force it, or =pygit2 to require the
+in-process one. Anything the in-process backend can't handle falls back
+to subprocess for that call.
+
+Network operations (pull, push, fetch, ls-remote) always use the git CLI,
+so credential helpers and SSH config keep working.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from collections.abc import Sequence
+from typing import Any, Optional
+
+log = logging.getLogger("agenttree.git_backend")
+
+try:
+    import pygit2  # type: ignore[import-not-found]
+    HAS_PYGIT2 = True
+except ImportError:  # pragma: no cover - depends on environment
+    pygit2 = None
+    HAS_PYGIT2 = False
+
+GIT_BACKEND_ENV = "AGENTTREE_GIT_BACKEND"
+
+
+class GitBackend(ABC):
+    """Small set of local git queries and commits.
+
+    Query methods return None when the answer can't be determined (not a
+    repo, unborn HEAD, unknown revision), mirroring a failed git command.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def head(self, repo: Path) -> Optional[str]:
+        """Commit hash of HEAD."""
+
+    @abstractmethod
+    def current_branch(self, repo: Path) -> Optional[str]:
+        """Short branch name of HEAD ("HEAD" when detached)."""
+
+    @abstractmethod
+    def config_get(self, repo: Path, key: str) -> Optional[str]:
+        """Value of a git config key, e.g. "remote.origin.url"."""
+
+    @abstractmethod
+    def is_dirty(self, repo: Path) -> bool:
+        """True if there are staged, unstaged or untracked changes."""
+
+    @abstractmethod
+    def changed_files(self, repo: Path, paths: Sequence[str]) -> list[str]:
+        """The subset of paths (relative to the repo root) with uncommitted changes.
+
+        Only the given paths are examined, not the whole working tree.
+        """
+
+    @abstractmethod
+    def ahead_behind(self, repo: Path, local: str, upstream: str) -> Optional[tuple[int, int]]:
+        """Commits in local but not upstream, and in upstream but not local."""
+
+    @abstractmethod
+    def commit_all(self, repo: Path, message: str, paths: Optional[Sequence[str]] = None) -> bool:
+        """Stage changes (like `git add -A`) and commit them.
+
+        With paths, only those files are staged; each must exist or be
+        tracked (pass the result of changed_files()).
+        """
+
+
+class SubprocessBackend(GitBackend):
+    """Runs the git CLI for every operation."""
+
+    name = "subprocess"
+
+    def _run(self, repo: Path, *args: str, timeout: int = 10, strip: bool = True) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(repo), *args],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except (subprocess.SubprocessError, OSError):
+            return None
+        if result.returncode != 0:
+            return None
+        return str(result.stdout).strip() if strip else str(result.stdout)
+
+    def head(self, repo: Path) -> Optional[str]:
+        return self._run(repo, "rev-parse", "--verify", "-q", "HEAD") or None
+
+    def current_branch(self, repo: Path) -> Optional[str]:
+        return self._run(repo, "rev-parse", "--abbrev-ref", "HEAD") or None
+
+    def config_get(self, repo: Path, key: str) -> Optional[str]:
+        return self._run(repo, "config", "--get", key)
+
+    def is_dirty(self, repo: Path) -> bool:
+        return bool(self._run(repo, "-c", "core.untrackedCache=true", "status", "--porcelain"))
+
+    def changed_files(self, repo: Path, paths: Sequence[str]) -> list[str]:
+        if not paths:
+            return []
+        out = self._run(
+            repo, "status", "--porcelain", "-z", "--untracked-files=all", "--", *paths,
+            strip=False,  # the status columns may start with a space
+        )
+        changed: list[str] = []
+        entries = iter((out or "").split("\0"))
+        for entry in entries:
+            if len(entry) < 4:
+                continue
+            changed.append(entry[3:])
+            if "R" in entry[:2] or "C" in entry[:2]:
+                # Renames and copies are followed by the original path
+                changed.append(next(entries, ""))
+        return [path for path in changed if path]
+
+    def ahead_behind(self, repo: Path, local: str, upstream: str) -> Optional[tuple[int, int]]:
+        out = self._run(repo, "rev-list", "--left-right", "--count", f"{local}...{upstream}")
+        parts = out.split() if out else []
+        if len(parts) != 2:
+            return None
+        try:
+            return int(parts[0]), int(parts[1])
+        except ValueError:
+            return None
+
+    def commit_all(self, repo: Path, message: str, paths: Optional[Sequence[str]] = None) -> bool:
+        pathspec = ["--", *paths] if paths is not None else []
+        if self._run(repo, "add", "-A", *pathspec) is None:
+            return False
+        return self._run(repo, "commit", "-m", message) is not None
+
+
+class Pygit2Backend(GitBackend):
+    """Answers queries in-process through libgit2."""
+
+    name = "pygit2"
+
+    def __init__(self) -> None:
+        # libgit2 repository handles aren't safe to share between threads
+        self._local = threading.local()
+        self._fallback = SubprocessBackend()
+
+    def _open(self, repo: Path) -> Any:
+        """Open (and cache, per thread) the repository containing repo, or None."""
+        repos: dict[Path, Any] = self._local.__dict__.setdefault("repos", {})
+        cached = repos.get(repo)
+        if cached is not None:
+            return cached
+        try:
+            git_dir = pygit2.discover_repository(str(repo))
+            opened = pygit2.Repository(git_dir) if git_dir else None
+        except (pygit2.GitError, KeyError, ValueError):
+            opened = None
+        if opened is not None:
+            repos[repo] = opened
+        return opened
+
+    def _resolve(self, r: Any, rev: str) -> Any:
+        return r.revparse_single(rev).peel(pygit2.Commit).id
+
+    def head(self, repo: Path) -> Optional[str]:
+        r = self._open(repo)
+        if r is None or r.head_is_unborn:
+            return None
+        return str(r.head.target)
+
+    def current_branch(self, repo: Path) -> Optional[str]:
+        r = self._open(repo)
+        if r is None or r.head_is_unborn:
+            return None
+        if r.head_is_detached:
+            return "HEAD"
+        return str(r.head.shorthand)
+
+    def config_get(self, repo: Path, key: str) -> Optional[str]:
+        r = self._open(repo)
+        if r is None:
+            return None
+        try:
+            return str(r.config[key])
+        except KeyError:
+            return None
+
+    def is_dirty(self, repo: Path) -> bool:
+        r = self._open(repo)
+        if r is None:
+            return self._fallback.is_dirty(repo)
+        return any(
+            flags != pygit2.GIT_STATUS_CURRENT and not flags & pygit2.GIT_STATUS_IGNORED
+            for flags in r.status().values()
+        )
+
+    def changed_files(self, repo: Path, paths: Sequence[str]) -> list[str]:
+        r = self._open(repo)
+        if r is None:
+            return self._fallback.changed_files(repo, paths)
+        changed = []
+        for path in paths:
+            try:
+                flags = r.status_file(path)
+            except (KeyError, pygit2.GitError):
+                continue  # neither on disk nor tracked
+            if flags != pygit2.GIT_STATUS_CURRENT and not flags & pygit2.GIT_STATUS_IGNORED:
+                changed.append(path)
+        return changed
+
+    def ahead_behind(self, repo: Path, local: str, upstream: str) -> Optional[tuple[int, int]]:
+        r = self._open(repo)
+        if r is None:
+            return None
+        try:
+            ahead, behind = r.ahead_behind(self._resolve(r, local), self._resolve(r, upstream))
+        except (KeyError, ValueError, pygit2.GitError):
+            return None
+        return int(ahead), int(behind)
+
+    def commit_all(self, repo: Path, message: str, paths: Optional[Sequence[str]] = None) -> bool:
+        r = self._open(repo)
+        if r is None:
+            return self._fallback.commit_all(repo, message, paths)
+        try:
+            signature = r.default_signature
+        except (KeyError, pygit2.GitError):
+            # No user.name/user.email configured; let the git CLI report it
+            return self._fallback.commit_all(repo, message, paths)
+        try:
+            index = r.index
+            index.read()
+            if paths is None:
+                deleted = [
+                    path for path, flags in r.status().items()
+                    if flags & pygit2.GIT_STATUS_WT_DELETED
+                ]
+                index.add_all()
+            else:
+                deleted = [path for path in paths if not (Path(r.workdir) / path).exists()]
+                for path in paths:
+                    if path not in deleted:
+                        index.add(path)
+            for path in deleted:
+                index.remove(path)
+            index.write()
+            tree = index.write_tree()
+            parents = [] if r.head_is_unborn else [r.head.target]
+            if parents and r[parents[0]].tree_id == tree:
+                return False  # nothing to commit, like `git commit`
+            r.create_commit("HEAD", signature, signature, message, tree, parents)
+        except pygit2.GitError as e:
+            log.debug("pygit2 commit in %s failed, retrying with git: %s", repo, e)
+            return self._fallback.commit_all(repo, message, paths)
+        return True
+
+
+_backends: dict[str, GitBackend] = {}
+
+
+def get_git_backend() -> GitBackend:
+    """Return the configured backend (pygit2 when available)."""
+    choice = os.environ.get(GIT_BACKEND_ENV, "auto").lower()
+    backend = _backends.get(choice)
+    if backend is None:
+        if choice == "subprocess" or not HAS_PYGIT2:
+            if choice == "pygit2":
+                log.warning("%s=pygit2 but pygit2 isn't installed; using git subprocesses", GIT_BACKEND_ENV)
+            backend = SubprocessBackend()
+        else:
+            backend = Pygit2Backend()
+        _backends[choice] = backend
+    return backend
@@ -1,7 +1,8 @@
 """Git utility functions for AgentTree.
 
 This module provides common git operations used across the codebase.
-All functions use subprocess to call git directly.
+Most functions use subprocess to call git directly; read-only queries on
+hot paths go through agenttree.git_backend, which can answer in-process.
 """
 
 import re
@@ -211,20 +212,9 @@ def get_commits_ahead_behind_main(worktree_dir: str | None) -> tuple[int, int]:
     if not worktree_path.exists():
         return 0, 0
 
-    try:
-        result = subprocess.run(
-            ["git", "-C", str(worktree_path), "rev-list", "--left-right", "--count", "HEAD...main"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            parts = result.stdout.strip().split()
-            if len(parts) == 2:
-                return int(parts[0]), int(parts[1])
-        return 0, 0
-    except (subprocess.TimeoutExpired, ValueError, Exception):
-        return 0, 0
+    from agenttree.git_backend import get_git_backend
+    counts = get_git_backend().ahead_behind(worktree_path, "HEAD", "main")
+    return counts if counts is not None else (0, 0)
 
 
 def rebase_issue_branch(issue_id: int | str) -> tuple[bool, str]:
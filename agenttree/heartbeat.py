@@ -0,0 +1,120 @@
+"""Fixed-cadence heartbeat scheduling and tick statistics.
+
+The web server's heartbeat used to sleep `interval` seconds after each
+tick finished, so the real cadence was interval plus tick duration, and a
+slow tick silently stretched every later one. run_heartbeat() instead
+aims at fixed boundaries on the monotonic clock (origin, origin +
+interval, ...). A tick that runs past the next boundary is an overrun:
+the boundaries it covered are skipped rather than queued, and the next
+tick starts at the first boundary still ahead.
+
+HeartbeatStats keeps a histogram of tick durations, overrun and skipped
+tick counts. The web server reports them under "heartbeat" in /health,
+and `agenttree heartbeat` prints them.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+log = logging.getLogger("agenttree.heartbeat")
+
+# Upper bounds (seconds) of the tick duration histogram buckets
+TICK_BUCKETS_S = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def next_boundary(origin: float, interval: float, index: int, now: float) -> tuple[int, int]:
+    """Pick the next tick after tick `index` finished at `now`.
+
+    Returns:
+        (index of the first boundary after now, number of boundaries skipped)
+    """
+    next_index = max(math.floor((now - origin) / interval) + 1, index + 1)
+    return next_index, next_index - index - 1
+
+
+class HeartbeatStats:
+    """Tick counts, durations and overruns. Safe to read from any thread."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(TICK_BUCKETS_S) + 1)
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.last_s: float | None = None
+        self.last_tick_at: float | None = None  # wall clock, for display
+
+    def record(self, duration: float, skipped: int) -> None:
+        with self._lock:
+            self.ticks += 1
+            self.total_s += duration
+            self.max_s = max(self.max_s, duration)
+            self.last_s = duration
+            self.last_tick_at = time.time()
+            if skipped:
+                self.overruns += 1
+                self.skipped_ticks += skipped
+            for i, bound in enumerate(TICK_BUCKETS_S):
+                if duration <= bound:
+                    self._buckets[i] += 1
+                    break
+            else:
+                self._buckets[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-ready view, with a cumulative histogram keyed by bucket bound."""
+        with self._lock:
+            histogram: dict[str, int] = {}
+            running = 0
+            for bound, count in zip((*TICK_BUCKETS_S, math.inf), self._buckets):
+                running += count
+                histogram["+Inf" if bound == math.inf else f"{bound:g}"] = running
+            return {
+                "interval_s": self.interval,
+                "ticks": self.ticks,
+                "overruns": self.overruns,
+                "skipped_ticks": self.skipped_ticks,
+                "last_duration_s": None if self.last_s is None else round(self.last_s, 3),
+                "mean_duration_s": round(self.total_s / self.ticks, 3) if self.ticks else None,
+                "max_duration_s": round(self.max_s, 3),
+                "last_tick_at": self.last_tick_at,
+                "duration_histogram": histogram,
+            }
+
+
+async def run_heartbeat(
+    tick: Callable[[], Awaitable[Any]],
+    interval: float,
+    stats: HeartbeatStats,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+) -> None:
+    """Await tick() on fixed interval boundaries until cancelled.
+
+    Ticks never overlap. Errors from tick() are logged and don't stop the loop.
+    """
+    origin = clock()
+    index = 0
+    while True:
+        started = clock()
+        try:
+            await tick()
+        except Exception as e:
+            log.error("Heartbeat error: %s", e)
+        finished = clock()
+        index, skipped = next_boundary(origin, interval, index, finished)
+        stats.record(finished - started, skipped)
+        if skipped:
+            log.warning(
+                "Heartbeat tick took %.1fs (interval %gs); skipped %d tick(s)",
+                finished - started, interval, skipped,
+            )
+        await sleep(max(origin + index * interval - clock(), 0))
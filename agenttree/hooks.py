@@ -432,6 +432,7 @@ from agenttree.events import (
 )
 
 from agenttree import environment
+from agenttree.blob_store import write_artifact
 from agenttree.git_utils import has_commits_to_push, get_git_diff_stats, rebase_issue_branch
 from agenttree.pr_actions import get_pr_approval_status, _action_create_pr, _action_merge_pr
 
@@ -813,7 +814,7 @@ def run_builtin_validator(
 
                         feedback_content += "\n---\n\nPlease fix these issues and run `agenttree next` to re-submit.\n"
                         feedback_path = issue_dir / "ci_feedback.md"
-                        feedback_path.write_text(feedback_content)
+                        write_artifact(issue_dir, feedback_path.name, feedback_content)
                         console.print(f"[dim]Created {feedback_path}[/dim]")
 
                     check_names = ", ".join(c.name for c in failed)
@@ -1734,20 +1735,9 @@ def get_commits_ahead_behind_main(worktree_dir: Optional[str]) -> tuple[int, int
     if not worktree_path.exists():
         return 0, 0
 
-    try:
-        result = subprocess.run(
-            ["git", "-C", str(worktree_path), "rev-list", "--left-right", "--count", "HEAD...main"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            parts = result.stdout.strip().split()
-            if len(parts) == 2:
-                return int(parts[0]), int(parts[1])
-        return 0, 0
-    except (subprocess.TimeoutExpired, ValueError, Exception):
-        return 0, 0
+    from agenttree.git_backend import get_git_backend
+    counts = get_git_backend().ahead_behind(worktree_path, "HEAD", "main")
+    return counts if counts is not None else (0, 0)
 
 
 def get_repo_remote_name() -> str:
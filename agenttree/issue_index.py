@@ -0,0 +1,168 @@
+"""Persistent on-disk index of parsed issues.
+
+The in-process mtime cache in agenttree.issues only helps long-running
+processes. Every CLI invocation starts cold and would otherwise re-parse
+every issue.yaml. This module stores each issue's already-validated fields
+in a small SQLite file under _agenttree/, keyed by issue directory and
+tagged with the (mtime_ns, size, inode) signature of the YAML it came from.
+
+A cold `agenttree status` then costs one index read plus a stat() per
+issue; only files whose signature changed are re-parsed.
+
+The index is a pure cache: any SQLite error is logged and ignored, and the
+caller falls back to parsing YAML.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger("agenttree.issue_index")
+
+INDEX_FILENAME = ".issue_index.db"
+
+# Bump when the Issue model changes shape so stale rows are discarded.
+SCHEMA_VERSION = 2
+
+# (st_mtime_ns, st_size, st_ino) of an issue.yaml
+FileSignature = tuple[int, int, int]
+
+
+def file_signature(st: os.stat_result) -> FileSignature:
+    """Build the cache signature for a stat result."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _ensure_git_excluded(agents_dir: Path) -> None:
+    """Keep the index out of `git add -A` in the _agenttree repo.
+
+    Uses .git/info/exclude (local, never committed) so the shared template
+    repo doesn't need to know about the index.
+    """
+    git_dir = agents_dir / ".git"
+    if not git_dir.is_dir():
+        return
+    exclude = git_dir / "info" / "exclude"
+    pattern = f"{INDEX_FILENAME}*"
+    try:
+        if exclude.exists() and pattern in exclude.read_text().splitlines():
+            return
+        exclude.parent.mkdir(parents=True, exist_ok=True)
+        with open(exclude, "a") as f:
+            f.write(f"\n# AgentTree local issue index\n{pattern}\n")
+    except OSError as e:
+        log.debug("Could not update %s: %s", exclude, e)
+
+
+class IssueIndex:
+    """SQLite-backed map of issue dir name -> (file signature, issue fields).
+
+    Open one per load pass (connections are not shared across threads):
+
+        with IssueIndex.open(agents_dir) as index:
+            rows = index.load()
+            ...
+            index.upsert("042", sig, data)
+            index.prune(seen)
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    @classmethod
+    def open(cls, agents_dir: Path) -> Optional["IssueIndex"]:
+        """Open (creating if needed) the index for an _agenttree directory.
+
+        Returns:
+            IssueIndex, or None if the index can't be opened (read-only
+            mount, corrupt file, ...). Callers should then parse YAML directly.
+        """
+        db_path = agents_dir / INDEX_FILENAME
+        is_new = not db_path.exists()
+        try:
+            conn = sqlite3.connect(str(db_path), timeout=2.0)
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS issues")
+                conn.execute(
+                    "CREATE TABLE issues ("
+                    " dir TEXT PRIMARY KEY,"
+                    " mtime_ns INTEGER NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " inode INTEGER NOT NULL,"
+                    " data TEXT NOT NULL)"
+                )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+        except sqlite3.Error as e:
+            log.debug("Issue index unavailable at %s: %s", db_path, e)
+            return None
+        if is_new:
+            _ensure_git_excluded(agents_dir)
+        return cls(conn)
+
+    def __enter__(self) -> "IssueIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def load(self) -> dict[str, tuple[FileSignature, dict[str, Any]]]:
+        """Read every row of the index in one query."""
+        rows: dict[str, tuple[FileSignature, dict[str, Any]]] = {}
+        try:
+            for dir_name, mtime_ns, size, inode, data in self._conn.execute(
+                "SELECT dir, mtime_ns, size, inode, data FROM issues"
+            ):
+                rows[dir_name] = ((mtime_ns, size, inode), json.loads(data))
+        except (sqlite3.Error, ValueError) as e:
+            log.debug("Could not read issue index: %s", e)
+            return {}
+        return rows
+
+    def get(self, dir_name: str) -> Optional[tuple[FileSignature, dict[str, Any]]]:
+        """Read a single row, or None if the directory isn't indexed."""
+        try:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, inode, data FROM issues WHERE dir = ?", (dir_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            return (row[0], row[1], row[2]), json.loads(row[3])
+        except (sqlite3.Error, ValueError) as e:
+            log.debug("Could not read issue index row %s: %s", dir_name, e)
+            return None
+
+    def upsert(self, dir_name: str, sig: FileSignature, data: dict[str, Any]) -> None:
+        """Record the parsed fields for an issue directory."""
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO issues (dir, mtime_ns, size, inode, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (dir_name, sig[0], sig[1], sig[2], json.dumps(data)),
+            )
+        except sqlite3.Error as e:
+            log.debug("Could not update issue index for %s: %s", dir_name, e)
+
+    def prune(self, keep: set[str]) -> None:
+        """Delete rows for issue directories that no longer exist."""
+        try:
+            existing = {row[0] for row in self._conn.execute("SELECT dir FROM issues")}
+            stale = existing - keep
+            if stale:
+                self._conn.executemany(
+                    "DELETE FROM issues WHERE dir = ?", [(d,) for d in stale]
+                )
+        except sqlite3.Error as e:
+            log.debug("Could not prune issue index: %s", e)
+
+    def close(self) -> None:
+        """Commit pending writes and close the connection."""
+        try:
+            self._conn.commit()
+        except sqlite3.Error as e:
+            log.debug("Could not commit issue index: %s", e)
+        finally:
+            self._conn.close()
@@ -0,0 +1,285 @@
+"""Filesystem change feed for the issue cache in long-running processes.
+
+By default every list_issues() call stat()s every issue.yaml to notice
+changes. The web server and heartbeat call it constantly, so they can start
+a watcher instead: a background thread records which issue directories
+changed, and agenttree.issues re-stats only those. With no changes, listing
+issues is a pure in-memory read.
+
+On Linux the watcher uses inotify (through libc, no extra dependency).
+Elsewhere, or if inotify can't be initialised, it falls back to polling the
+issues directory from the background thread, which still keeps the stat
+sweep off the request path.
+
+The watcher never touches the caches itself. It only collects changed
+directory names; readers apply them via drain(). If events may have been
+lost (queue overflow, issues dir replaced), drain() returns None and the
+reader does a full sweep.
+
+Usage:
+    watcher = start_issue_watcher(get_issues_path())
+    ...
+    stop_issue_watcher()
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+log = logging.getLogger("agenttree.issue_watcher")
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_ISSUE_DIR_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_ATTRIB | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class IssueWatcher(ABC):
+    """Collects names of issue directories whose issue.yaml may have changed."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._lock = threading.Lock()
+        self._changed: set[str] = set()
+        # Until the reader has done one full sweep, it can't apply deltas
+        self._needs_full_scan = True
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"issue-watcher-{type(self).__name__}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self) -> Optional[set[str]]:
+        """Return and clear the changed directory names.
+
+        Returns:
+            Directory names under root that changed since the last drain, or
+            None if the caller must do a full sweep (first call, lost events,
+            or watcher thread died).
+        """
+        with self._lock:
+            if self._needs_full_scan or not self.alive:
+                self._needs_full_scan = False
+                self._changed.clear()
+                return None
+            changed, self._changed = self._changed, set()
+            return changed
+
+    def mark_changed(self, dir_name: str) -> None:
+        """Record an in-process write so the next drain sees it immediately."""
+        with self._lock:
+            self._changed.add(dir_name)
+
+    def _mark_full_scan(self) -> None:
+        with self._lock:
+            self._needs_full_scan = True
+
+    @abstractmethod
+    def _run(self) -> None:
+        """Watch root until stopped, recording changes (runs in the thread)."""
+
+
+class InotifyWatcher(IssueWatcher):
+    """Watches the issues dir and each issue dir with Linux inotify."""
+
+    def __init__(self, root: Path, fd: int, libc: ctypes.CDLL):
+        super().__init__(root)
+        self._fd = fd
+        self._libc = libc
+        self._wd_names: dict[int, Optional[str]] = {}  # wd -> issue dir name (None = root)
+
+    @classmethod
+    def create(cls, root: Path) -> Optional["InotifyWatcher"]:
+        """Initialise inotify, or return None where it isn't available."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError) as e:
+            log.debug("inotify unavailable: %s", e)
+            return None
+        if fd < 0:
+            log.debug("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+            return None
+        watcher = cls(root, fd, libc)
+        if not watcher._add_watch(root, None, _ROOT_MASK):
+            os.close(fd)
+            return None
+        for entry in root.iterdir():
+            if entry.is_dir():
+                watcher._add_watch(entry, entry.name, _ISSUE_DIR_MASK)
+        return watcher
+
+    def _add_watch(self, path: Path, name: Optional[str], mask: int) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            log.debug("inotify_add_watch %s failed: %s", path, os.strerror(ctypes.get_errno()))
+            return False
+        self._wd_names[wd] = name
+        return True
+
+    def stop(self, timeout: float = 2.0) -> None:
+        super().stop(timeout)
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                data = os.read(self._fd, 64 * 1024)
+            except OSError as e:
+                log.warning("Issue watcher stopped: %s", e)
+                return
+            self._handle(data)
+
+    def _handle(self, data: bytes) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._mark_full_scan()
+                continue
+            if mask & IN_IGNORED:
+                self._wd_names.pop(wd, None)
+                continue
+
+            if wd not in self._wd_names:
+                continue
+            dir_name = self._wd_names[wd]
+            if dir_name is None:
+                # Event on the issues dir itself
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._mark_full_scan()
+                elif name and mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._add_watch(self.root / name, name, _ISSUE_DIR_MASK)
+                    elif mask & IN_MOVED_FROM:
+                        # The watch follows the moved dir; drop it so events
+                        # aren't attributed to the old name
+                        for old_wd, old_name in list(self._wd_names.items()):
+                            if old_name == name:
+                                self._libc.inotify_rm_watch(self._fd, old_wd)
+                    self.mark_changed(name)
+            elif name == "issue.yaml":
+                self.mark_changed(dir_name)
+
+
+class PollingWatcher(IssueWatcher):
+    """Fallback that re-stats the issues dir from a background thread."""
+
+    def __init__(self, root: Path, interval: float = 2.0):
+        super().__init__(root)
+        self.interval = interval
+        self._signatures = self._snapshot()
+
+    def _snapshot(self) -> dict[str, tuple[int, int, int]]:
+        signatures: dict[str, tuple[int, int, int]] = {}
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return signatures
+        for entry in entries:
+            try:
+                st = os.stat(os.path.join(entry.path, "issue.yaml"))
+            except OSError:
+                continue
+            signatures[entry.name] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return signatures
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            current = self._snapshot()
+            previous = self._signatures
+            self._signatures = current
+            for name in previous.keys() | current.keys():
+                if previous.get(name) != current.get(name):
+                    self.mark_changed(name)
+
+
+_watcher: Optional[IssueWatcher] = None
+
+
+def start_issue_watcher(issues_path: Path, poll_interval: float = 2.0) -> Optional[IssueWatcher]:
+    """Start keeping the issue cache current for issues_path.
+
+    Prefers inotify and falls back to polling. Replaces any running watcher.
+
+    Args:
+        issues_path: The _agenttree/issues directory
+        poll_interval: Seconds between sweeps for the polling fallback
+
+    Returns:
+        The running watcher, or None if issues_path doesn't exist
+    """
+    global _watcher
+    from agenttree import issues
+
+    stop_issue_watcher()
+    if not issues_path.is_dir():
+        return None
+
+    watcher: IssueWatcher | None = InotifyWatcher.create(issues_path)
+    if watcher is None:
+        watcher = PollingWatcher(issues_path, poll_interval)
+    watcher.start()
+    _watcher = watcher
+    issues.set_issue_watcher(watcher)
+    log.info("Watching %s with %s", issues_path, type(watcher).__name__)
+    return watcher
+
+
+def stop_issue_watcher() -> None:
+    """Stop the running watcher; issue reads go back to stat sweeps."""
+    global _watcher
+    from agenttree import issues
+
+    if _watcher is None:
+        return
+    issues.set_issue_watcher(None)
+    _watcher.stop()
+    _watcher = None
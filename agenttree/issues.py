@@ -3,24 +3,49 @@
 This module handles CRUD operations for issues stored in _agenttree/issues/.
 """
 
+import functools
+import json
 import logging
 import re
+import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 
-import yaml
 from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 from agenttree.config import DEFAULT_ROLE
 
-from agenttree.agents_repo import sync_agents_repo
+from agenttree.agents_repo import register_touched_paths, sync_agents_repo
+from agenttree.blob_store import read_artifact
+from agenttree.fileio import append_text, atomic_write_text
 from agenttree.ids import slugify
+from agenttree.issue_index import FileSignature, IssueIndex, file_signature
+from agenttree.sparse_checkout import ensure_issue_materialized
+from agenttree.yamlio import yaml_dump, yaml_load
+
+if TYPE_CHECKING:
+    from agenttree.issue_watcher import IssueWatcher
 
 log = logging.getLogger("agenttree.issues")
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# Guards the module-level caches below, which the web server's request
+# threads and concurrent heartbeat actions share
+_cache_lock = threading.RLock()
+
+
+def _with_cache_lock(fn: _F) -> _F:
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _cache_lock:
+            return fn(*args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
 
 def parse_utc_timestamp(ts: str) -> datetime:
     """Parse an ISO timestamp string into a timezone-aware UTC datetime."""
@@ -32,39 +57,250 @@ def parse_utc_timestamp(ts: str) -> datetime:
 
 # Per-file mtime cache: only re-parse YAML files whose mtime changed.
 # Turns 146 YAML parses (~500ms) into 146 stat() calls (~1.5ms).
-_issue_file_cache: dict[Path, tuple[float, "Issue"]] = {}
+# Keyed by (mtime_ns, size, inode) so same-second rewrites are still detected.
+# Cold processes fall back to the persistent IssueIndex before parsing YAML.
+_issue_file_cache: dict[Path, tuple[FileSignature, "Issue"]] = {}
+
+# Issue ID -> issue.yaml path, built by the first full scan and kept current
+# from there. Lets get_issue() stat a single file instead of walking the
+# whole issues directory. _issue_id_index_root records which issues dir the
+# index (and the dependency graph) was built from.
+_issue_id_index: dict[int, Path] = {}
+_issue_id_index_root: Path | None = None
+
+
+class DependencyGraph:
+    """Forward and reverse dependency adjacency for all issues.
+
+    Each node also records the issue's current stage so completion can be
+    checked without loading the dependency. Built by the first full scan,
+    then maintained incrementally by Issue.save(), _load_all_issues()
+    (changed/deleted files only) and the issues that pulls and the issue
+    watcher report as changed, so queries cost O(degree) instead of a scan
+    over every issue.
+    """
+
+    def __init__(self) -> None:
+        self._deps: dict[int, tuple[int, ...]] = {}
+        self._dependents: dict[int, set[int]] = {}
+        self._stages: dict[int, str] = {}
+
+    def clear(self) -> None:
+        """Drop every node."""
+        self._deps.clear()
+        self._dependents.clear()
+        self._stages.clear()
+
+    def update(self, issue_id: int, dependencies: list[int], stage: str) -> None:
+        """Insert or replace a node's dependencies and stage."""
+        for old in self._deps.get(issue_id, ()):
+            rdeps = self._dependents.get(old)
+            if rdeps is not None:
+                rdeps.discard(issue_id)
+                if not rdeps:
+                    del self._dependents[old]
+        self._deps[issue_id] = tuple(dependencies)
+        for dep in dependencies:
+            self._dependents.setdefault(dep, set()).add(issue_id)
+        self._stages[issue_id] = stage
+
+    def remove(self, issue_id: int) -> None:
+        """Remove a node (its reverse edges from dependents are kept)."""
+        for old in self._deps.pop(issue_id, ()):
+            rdeps = self._dependents.get(old)
+            if rdeps is not None:
+                rdeps.discard(issue_id)
+                if not rdeps:
+                    del self._dependents[old]
+        self._stages.pop(issue_id, None)
+
+    def stage(self, issue_id: int) -> Optional[str]:
+        """Current stage of an issue, or None if it doesn't exist."""
+        return self._stages.get(issue_id)
+
+    def dependencies(self, issue_id: int) -> tuple[int, ...]:
+        """IDs this issue depends on."""
+        return self._deps.get(issue_id, ())
+
+    def dependents(self, issue_id: int) -> list[int]:
+        """IDs of issues that depend on this issue, sorted."""
+        return sorted(self._dependents.get(issue_id, ()))
+
+    def find_cycle(self, start: int, new_dependencies: list[int]) -> Optional[list[int]]:
+        """DFS from start, with start's edges replaced by new_dependencies.
 
+        Returns:
+            List of issue IDs forming the cycle (first == last), or None
+        """
+        def neighbors(node: int) -> tuple[int, ...] | list[int]:
+            return new_dependencies if node == start else self._deps.get(node, ())
+
+        path = [start]
+        on_path = {start}
+        visited = {start}
+        stack = [iter(neighbors(start))]
+
+        while stack:
+            nxt = next(stack[-1], None)
+            if nxt is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if nxt in on_path:
+                return path[path.index(nxt):] + [nxt]
+            if nxt in visited:
+                continue
+            visited.add(nxt)
+            path.append(nxt)
+            on_path.add(nxt)
+            stack.append(iter(neighbors(nxt)))
+
+        return None
 
+
+_dependency_graph = DependencyGraph()
+
+# issue.yaml paths changed behind the graph's back (pulls, watcher events,
+# deletions), re-read before the next dependency query
+_graph_stale: set[Path] = set()
+# Set when the issue watcher lost events, so only a full scan can catch up
+_graph_needs_sweep = False
+
+
+# Result of the last stat sweep, reused when an issue watcher reports
+# which directories changed (see agenttree.issue_watcher)
+_issue_watcher: Optional["IssueWatcher"] = None
+_last_scan: list[tuple[Path, FileSignature]] = []
+_last_scan_root: Path | None = None
+
+
+@_with_cache_lock
+def set_issue_watcher(watcher: Optional["IssueWatcher"]) -> None:
+    """Install (or remove, with None) the change feed used instead of stat sweeps."""
+    global _issue_watcher, _last_scan_root
+    _issue_watcher = watcher
+    _last_scan_root = None
+
+
+@_with_cache_lock
 def invalidate_issues_cache() -> None:
     """Clear the list_issues cache (call after any write to issue YAML)."""
+    global _issue_id_index_root, _last_scan_root
     _issue_file_cache.clear()
+    _summary_cache.clear()
+    _last_scan_root = None
+    _issue_id_index.clear()
+    _dependency_graph.clear()
+    _graph_stale.clear()
+    _issue_id_index_root = None
+
+
+# Signature that never matches a real file, used to force a re-read while
+# keeping the cached Issue around for dependency graph bookkeeping
+_STALE_SIGNATURE: FileSignature = (-1, -1, -1)
+
+
+@_with_cache_lock
+def evict_issue_paths(agents_path: Path, paths: list[str]) -> None:
+    """Forget cached data for issues touched by changed repo paths.
+
+    Called after a pull with the paths it changed (or after deleting issue
+    directories), so only those issues are re-read instead of clearing every
+    cache.
+
+    Args:
+        agents_path: Path to _agenttree directory
+        paths: Changed paths relative to agents_path (as from git diff --name-only)
+    """
+    issues_path = agents_path / "issues"
+    dir_names = set()
+    for path in paths:
+        parts = path.split("/")
+        if len(parts) > 2 and parts[0] == "issues":
+            dir_names.add(parts[1])
+
+    watcher = _issue_watcher
+    for name in dir_names:
+        yaml_path = issues_path / name / "issue.yaml"
+        cached = _issue_file_cache.get(yaml_path)
+        if cached is not None:
+            _issue_file_cache[yaml_path] = (_STALE_SIGNATURE, cached[1])
+        _summary_cache.pop(yaml_path, None)
+        _graph_stale.add(yaml_path)
+        if watcher is not None and watcher.root == issues_path:
+            watcher.mark_changed(name)
+
+
+_CONFLICT_START = "<<<<<<<"
+_CONFLICT_SEP = "=======\n"
+_CONFLICT_END = ">>>>>>>"
+
+
+def has_conflict_markers(content: str) -> bool:
+    """Cheap check for a line starting with a git conflict marker.
+
+    A substring search, so clean files (the common case) never pay for
+    line splitting.
+    """
+    return content.startswith(_CONFLICT_START) or f"\n{_CONFLICT_START}" in content
 
 
 def resolve_conflict_markers(content: str) -> tuple[str, bool]:
     """Resolve git merge conflict markers in content by keeping local (ours) changes.
 
     Handles conflict blocks like:
-                remote content
-        
+        <<<<<<< Updated upstream
+        remote content
+        =======
+        local content
+        >>>>>>> Stashed changes
+
+    Lines are scanned once, so the cost is linear in the file size. A block
+    that is never closed by `=======` and `>>>>>>>` is left unchanged.
+
     Args:
         content: File content that may contain conflict markers
 
     Returns:
         Tuple of (resolved_content, had_conflicts)
     """
-    # Pattern matches conflict blocks and captures local (ours) content
+    if not has_conflict_markers(content):
+        return content, False
+
+    out: list[str] = []
+    block: list[str] = []  # raw lines of the open block, kept in case it's unterminated
+    ours: list[str] = []
+    in_block = in_ours = False
+    resolved_any = False
+
     # Conflict markers can have various suffixes (HEAD, Updated upstream, Stashed changes, etc.)
-    pattern = re.compile(
-        r'<{7}[^\n]*\n'      # <<<<<<< marker with optional suffix
-        r'(?:.*?\n)*?'       # remote/theirs content (non-greedy)
-        r'={7}\n'            # ======= separator
-        r'((?:.*?\n)*?)'     # local/ours content (captured)
-        r'>{7}[^\n]*\n?',    # >>>>>>> marker with optional suffix
-        re.DOTALL
-    )
+    for line in content.splitlines(keepends=True):
+        if not in_block:
+            if line.startswith(_CONFLICT_START):
+                in_block, in_ours = True, False
+                block = [line]
+                ours = []
+            else:
+                out.append(line)
+            continue
 
-    resolved, count = pattern.subn(r'\1', content)
-    return resolved, count > 0
+        block.append(line)
+        if not in_ours:
+            if line == _CONFLICT_SEP:
+                in_ours = True
+        elif line.startswith(_CONFLICT_END):
+            out.extend(ours)
+            in_block = False
+            resolved_any = True
+        else:
+            ours.append(line)
+
+    if in_block:
+        out.extend(block)
+
+    if not resolved_any:
+        return content, False
+    return "".join(out), True
 
 
 def safe_yaml_load(file_path: Path | str) -> Any:
@@ -98,7 +334,7 @@ def safe_yaml_load(file_path: Path | str) -> Any:
         # Write the resolved content back to fix the file
         path.write_text(resolved_content)
 
-    return yaml.safe_load(resolved_content)
+    return yaml_load(resolved_content)
 
 
 class Priority(str, Enum):
@@ -117,10 +353,28 @@ class HistoryEntry(BaseModel):
     type: str = "transition"  # "transition" (normal), "rollback", etc.
 
 
+# Append-only stage history log, one JSON HistoryEntry per line, stored
+# next to issue.yaml. issue.yaml itself keeps only the latest entry.
+HISTORY_FILENAME = "history.jsonl"
+
+
+def _history_line(entry: HistoryEntry) -> str:
+    return json.dumps(entry.model_dump(mode="json", exclude_none=True)) + "\n"
+
+
 class Issue(BaseModel):
     """An issue in the agenttree workflow."""
     _yaml_path: Path | None = PrivateAttr(default=None)
 
+    # Full history, or None until history.jsonl is read (see `history`)
+    _history: list[HistoryEntry] | None = PrivateAttr(default=None)
+    _last_history: HistoryEntry | None = PrivateAttr(default=None)
+    # Entries appended since load that aren't in history.jsonl yet
+    _history_unsaved: list[HistoryEntry] = PrivateAttr(default_factory=list)
+    # history.jsonl must be rewritten from _history on save (history was
+    # replaced, or the issue still has a legacy inline history list)
+    _history_rewrite: bool = PrivateAttr(default=False)
+
     id: int
     slug: str = ""
     title: str = ""
@@ -144,7 +398,9 @@ class Issue(BaseModel):
     pr_url: Optional[str] = None
     relevant_url: Optional[str] = None
 
-    history: list[HistoryEntry] = Field(default_factory=list)
+    # Number of stage history entries. Stored in issue.yaml alongside the
+    # latest entry so list views never need to read history.jsonl.
+    history_count: int = 0
 
     agent_ensured: Optional[str] = None  # Dot path where custom agent was ensured
     needs_ui_review: bool = False  # If True, ui_review substage will run
@@ -161,6 +417,148 @@ class Issue(BaseModel):
     # Guard for manager hook re-entry (e.g., "implement.review", "implement.review:running")
     manager_hooks_executed: Optional[str] = None
 
+    def __init__(self, **data: Any) -> None:
+        history = data.pop("history", None) or []
+        super().__init__(**data)
+        self._init_history(
+            [HistoryEntry.model_validate(h) for h in history],
+            split="history_count" in data,
+        )
+
+    def _init_history(self, entries: list[HistoryEntry], split: bool) -> None:
+        """Set up history state from the `history` list read from storage.
+
+        Args:
+            entries: The inline history list (just the latest entry when split)
+            split: True if history_count was stored, i.e. the full history
+                lives in history.jsonl. Otherwise entries is the whole history
+                (legacy issue.yaml or a newly constructed Issue) and is moved
+                to history.jsonl on the next save.
+        """
+        self._last_history = entries[-1] if entries else None
+        if not split:
+            self._history = entries
+            self.history_count = len(entries)
+            self._history_rewrite = bool(entries)
+        elif len(entries) >= self.history_count:
+            self._history = entries
+
+    @property
+    def history(self) -> list[HistoryEntry]:
+        """Full stage history, read from history.jsonl on first access.
+
+        Use last_history when only the current stage entry is needed, and
+        append_history() to add entries.
+        """
+        if self._history is None:
+            self._history = self._read_history_log() + self._history_unsaved
+        return self._history
+
+    @history.setter
+    def history(self, entries: list[HistoryEntry]) -> None:
+        self._history = list(entries)
+        self._last_history = self._history[-1] if self._history else None
+        self.history_count = len(self._history)
+        self._history_unsaved = []
+        self._history_rewrite = True
+
+    @property
+    def last_history(self) -> HistoryEntry | None:
+        """Most recent history entry (entry into the current stage)."""
+        return self._last_history
+
+    @property
+    def history_path(self) -> Path | None:
+        """Path of this issue's history.jsonl, derived from _yaml_path."""
+        if self._yaml_path is not None:
+            return self._yaml_path.with_name(HISTORY_FILENAME)
+        return None
+
+    def append_history(self, entry: HistoryEntry) -> None:
+        """Record a history entry without loading the full history.
+
+        The entry is appended to history.jsonl on the next save().
+        """
+        if self._history is not None:
+            self._history.append(entry)
+        self._history_unsaved.append(entry)
+        self._last_history = entry
+        self.history_count += 1
+
+    def _read_history_log(self) -> list[HistoryEntry]:
+        """Parse history.jsonl, skipping torn or invalid lines."""
+        entries: list[HistoryEntry] = []
+        path = self.history_path
+        try:
+            lines = path.read_text().splitlines() if path is not None else []
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(HistoryEntry.model_validate_json(line))
+            except ValueError:
+                log.warning("Skipping invalid line in %s", path)
+        if not entries and self._last_history is not None:
+            entries = [self._last_history]
+        return entries
+
+    def _write_history_log(self) -> None:
+        """Persist history changes made since load to history.jsonl."""
+        path = self.history_path
+        if path is None:
+            return
+        if self._history_rewrite:
+            atomic_write_text(path, "".join(_history_line(h) for h in self.history))
+        elif self._history_unsaved:
+            append_text(path, "".join(_history_line(h) for h in self._history_unsaved))
+        self._history_unsaved = []
+        self._history_rewrite = False
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        """Dump fields plus the full `history`, which is a property rather
+        than a field now that it lives in history.jsonl.
+
+        Pass exclude={"history"} to skip reading history.jsonl.
+        """
+        include = kwargs.get("include")
+        exclude = kwargs.get("exclude")
+        data = super().model_dump(**kwargs)
+        if (include is not None and "history" not in include) or (exclude and "history" in exclude):
+            return data
+        history = [
+            h.model_dump(mode=kwargs.get("mode", "python"), exclude_none=kwargs.get("exclude_none", False))
+            for h in self.history
+        ]
+        fields: dict[str, Any] = {}
+        for key, value in data.items():
+            if key == "history_count":
+                fields["history"] = history
+            fields[key] = value
+        return fields
+
+    def _yaml_fields(self) -> dict[str, Any]:
+        """Fields as written to issue.yaml (latest history entry only)."""
+        data = self.model_dump(exclude_none=True, mode="json", exclude={"history"})
+        latest = self._last_history
+        tail = [latest.model_dump(mode="json", exclude_none=True)] if latest else []
+        fields: dict[str, Any] = {}
+        for key, value in data.items():
+            if key == "history_count":
+                fields["history"] = tail
+            fields[key] = value
+        return fields
+
+    def _index_fields(self) -> dict[str, Any]:
+        """Fields stored in the issue index; reloads via _init_history()."""
+        data = self._yaml_fields()
+        if self._history_rewrite:
+            # Not yet moved to history.jsonl: the inline list is all there is
+            del data["history_count"]
+            data["history"] = [h.model_dump(mode="json", exclude_none=True) for h in self.history]
+        return data
+
     @field_validator("id", mode="before")
     @classmethod
     def _coerce_id_to_int(cls, v: Any) -> int:
@@ -236,15 +634,31 @@ class Issue(BaseModel):
         Uses exclude_none=True so None-valued fields are omitted from YAML.
         This means setting a field to None effectively removes it on save.
 
+        The write is atomic (temp file + rename), so concurrent readers see
+        either the old or the new file. Inside fileio.group_commit() the
+        directory fsync is deferred to the group's barrier.
+
+        New history entries are appended to history.jsonl before issue.yaml
+        is replaced, so history_count never exceeds the log.
+
         Raises:
             RuntimeError: If _yaml_path is not set
         """
         if self._yaml_path is None:
             raise RuntimeError("Cannot save: _yaml_path not set (use from_yaml or set _yaml_path)")
-        data = self.model_dump(exclude_none=True, mode="json")
-        with open(self._yaml_path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-        _issue_file_cache.pop(self._yaml_path, None)
+        ensure_issue_materialized(self._yaml_path.parent)
+        self._write_history_log()
+        atomic_write_text(self._yaml_path, yaml_dump(self._yaml_fields()))
+        register_touched_paths(
+            self._yaml_path.parents[2], self._yaml_path, self._yaml_path.with_name(HISTORY_FILENAME)
+        )
+        with _cache_lock:
+            _issue_file_cache.pop(self._yaml_path, None)
+            if _issue_watcher is not None and _issue_watcher.root == self._yaml_path.parent.parent:
+                _issue_watcher.mark_changed(self._yaml_path.parent.name)
+            if _issue_id_index_root == self._yaml_path.parent.parent:
+                _issue_id_index[self.id] = self._yaml_path
+                _dependency_graph.update(self.id, self.dependencies, self.stage)
 
     @property
     def dir(self) -> Path | None:
@@ -323,6 +737,10 @@ def get_next_issue_number() -> int:
                 # Skip directories that aren't valid issue IDs
                 continue
 
+    # Archived issues keep their IDs
+    from agenttree.archive import load_archive_index
+    max_num = max([max_num, *load_archive_index(issues_path.parent)])
+
     return max_num + 1
 
 
@@ -416,6 +834,7 @@ def create_issue(
     # Create issue directory
     issue_dir = issues_path / dir_name
     issue_dir.mkdir(exist_ok=True)
+    ensure_issue_materialized(issue_dir)
 
     # Convert dependencies to ints
     deps_int: list[int] = []
@@ -527,6 +946,9 @@ def create_issue(
         attachments_section = "\n\n## Attachments\n\n" + "\n".join(attachment_lines) + "\n"
         with open(problem_path, "a") as f:
             f.write(attachments_section)
+        register_touched_paths(agents_path, *attachments_dir.iterdir())
+
+    register_touched_paths(agents_path, problem_path)
 
     # Sync after creating issue
     sync_agents_repo(agents_path, pull_only=False, commit_message=f"Create issue {issue_id}: {title}")
@@ -534,49 +956,321 @@ def create_issue(
     return issue
 
 
-def _load_all_issues() -> list[Issue]:
-    """Read all issue YAML files, using per-file mtime cache.
+@dataclass(frozen=True, slots=True)
+class IssueSummary:
+    """Read-only projection of an Issue for heartbeat scans and list views.
 
-    Only re-parses YAML files whose mtime changed since last read.
-    Stale cache entries (deleted issues) are pruned each call.
+    Built from the issue index (or an Issue already in memory) without
+    running pydantic validation. Attribute names match Issue, so code that
+    only reads these fields works with either.
     """
-    issues_path = get_issues_path()
-    if not issues_path.exists():
-        return []
 
-    seen_paths: set[Path] = set()
-    issues: list[Issue] = []
+    id: int
+    title: str
+    stage: str
+    flow: str
+    priority: Priority
+    labels: tuple[str, ...]
+    created: str
+    last_history: Optional[HistoryEntry]
 
+    @classmethod
+    def from_issue(cls, issue: Issue) -> "IssueSummary":
+        return cls(
+            id=issue.id,
+            title=issue.title,
+            stage=issue.stage,
+            flow=issue.flow,
+            priority=issue.priority,
+            labels=tuple(issue.labels),
+            created=issue.created,
+            last_history=issue.last_history,
+        )
+
+    @classmethod
+    def from_fields(cls, data: dict[str, Any]) -> "IssueSummary":
+        """Build from an issue index row (see Issue._index_fields())."""
+        history = data["history"]
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            stage=data["stage"],
+            flow=data["flow"],
+            priority=Priority(data["priority"]),
+            labels=tuple(data["labels"]),
+            created=data["created"],
+            last_history=HistoryEntry.model_construct(**history[-1]) if history else None,
+        )
+
+
+# Summaries handed out by list_issue_summaries(), keyed like _issue_file_cache
+_summary_cache: dict[Path, tuple[FileSignature, IssueSummary]] = {}
+
+
+def _issue_from_index(data: dict[str, Any], yaml_path: Path) -> Issue:
+    """Rebuild an Issue from index data without re-running validation.
+
+    Index rows are produced by _index_fields() of an already-validated Issue,
+    so model_construct() is safe and skips the pydantic validators.
+    """
+    fields = dict(data)
+    fields["priority"] = Priority(fields.get("priority", Priority.MEDIUM.value))
+    history = [HistoryEntry.model_construct(**h) for h in fields.pop("history", [])]
+    issue = Issue.model_construct(**fields)
+    issue._init_history(history, split="history_count" in data)
+    issue._yaml_path = yaml_path
+    return issue
+
+
+def _load_cache_misses(
+    agents_path: Path,
+    misses: list[tuple[int, Path, FileSignature]],
+    issues: list[Optional[Issue]],
+    seen_dirs: set[str] | None = None,
+) -> None:
+    """Resolve in-memory cache misses via the persistent index, then YAML.
+
+    Fills issues[slot] for each miss and refreshes both caches.
+    If seen_dirs is given (full scan), index rows for other dirs are pruned.
+    """
+    index = IssueIndex.open(agents_path)
+    rows: dict[str, tuple[FileSignature, dict[str, Any]]] = {}
+    if index and len(misses) == 1:
+        dir_name = misses[0][1].parent.name
+        row = index.get(dir_name)
+        if row is not None:
+            rows[dir_name] = row
+    elif index:
+        rows = index.load()
+
+    for slot, yaml_path, sig in misses:
+        dir_name = yaml_path.parent.name
+        row = rows.get(dir_name)
+        if row is not None and row[0] == sig:
+            try:
+                issue = _issue_from_index(row[1], yaml_path)
+            except Exception:
+                issue = None
+            if issue is not None:
+                _issue_file_cache[yaml_path] = (sig, issue)
+                issues[slot] = issue
+                continue
+
+        try:
+            issue = Issue.from_yaml(yaml_path)
+        except Exception as e:
+            log.debug("Skipping unreadable issue file %s: %s", yaml_path, e)
+            continue
+
+        _issue_file_cache[yaml_path] = (sig, issue)
+        issues[slot] = issue
+        if index:
+            index.upsert(dir_name, sig, issue._index_fields())
+
+    if index:
+        if seen_dirs is not None:
+            index.prune(seen_dirs)
+        index.close()
+
+
+@_with_cache_lock
+def _load_issue_file(yaml_path: Path) -> Optional[Issue]:
+    """Load a single issue.yaml through the same caches as _load_all_issues().
+
+    Costs one stat() when the in-memory cache is warm.
+    """
+    try:
+        sig = file_signature(yaml_path.stat())
+    except (FileNotFoundError, NotADirectoryError):
+        _issue_file_cache.pop(yaml_path, None)
+        return None
+
+    cached = _issue_file_cache.get(yaml_path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    slot: list[Optional[Issue]] = [None]
+    _load_cache_misses(yaml_path.parent.parent.parent, [(0, yaml_path, sig)], slot)
+    return slot[0]
+
+
+def _scan_issue_files(issues_path: Path) -> list[tuple[Path, FileSignature]]:
+    """Stat every issues/<dir>/issue.yaml, in directory order."""
+    files: list[tuple[Path, FileSignature]] = []
     for issue_dir in sorted(issues_path.iterdir()):
         if not issue_dir.is_dir() or issue_dir.name == "archive":
             continue
 
         yaml_path = issue_dir / "issue.yaml"
-        if not yaml_path.exists():
+        try:
+            files.append((yaml_path, file_signature(yaml_path.stat())))
+        except FileNotFoundError:
             continue
+    return files
+
+
+def _current_issue_files(issues_path: Path) -> list[tuple[Path, FileSignature]]:
+    """Current (issue.yaml, signature) list for issues_path.
+
+    With an issue watcher on issues_path, only the directories it reports
+    as changed are re-stat()ed and the rest of the last sweep is reused;
+    with no changes this does no I/O. Otherwise every issue is stat()ed.
+    """
+    global _last_scan, _last_scan_root, _graph_needs_sweep
+
+    watcher = _issue_watcher
+    changed: set[str] | None = None
+    if watcher is not None and watcher.root == issues_path:
+        changed = watcher.drain()
+        if _last_scan_root != issues_path:
+            changed = None
+        if changed is None:
+            # The watcher can't say what changed, so the graph can't either
+            _graph_needs_sweep = True
+
+    if changed is None:
+        files = _scan_issue_files(issues_path)
+    elif not changed:
+        return _last_scan
+    else:
+        files = [f for f in _last_scan if f[0].parent.name not in changed]
+        for name in changed:
+            yaml_path = issues_path / name / "issue.yaml"
+            if name == "archive":
+                continue
+            _graph_stale.add(yaml_path)
+            try:
+                files.append((yaml_path, file_signature(yaml_path.stat())))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        files.sort(key=lambda f: f[0].parent.name)
+
+    _last_scan = files
+    _last_scan_root = issues_path
+    return files
+
 
+@_with_cache_lock
+def _load_all_issues() -> list[Issue]:
+    """Read all issue YAML files, using per-file mtime cache.
+
+    Only re-parses YAML files whose mtime changed since last read.
+    Files not in the in-memory cache are looked up in the persistent
+    on-disk index first, so cold CLI invocations skip YAML parsing too.
+    With an issue watcher running, unchanged files aren't even stat()ed.
+    Stale cache entries (deleted issues) are pruned each call, and the
+    ID index and dependency graph are updated for changed files only.
+    """
+    global _issue_id_index_root, _graph_needs_sweep
+
+    issues_path = get_issues_path()
+    rebuild = _issue_id_index_root != issues_path
+    if not issues_path.exists():
+        _issue_id_index.clear()
+        _dependency_graph.clear()
+        _graph_stale.clear()
+        _graph_needs_sweep = False
+        _issue_id_index_root = issues_path
+        return []
+
+    seen_paths: set[Path] = set()
+    seen_dirs: set[str] = set()
+    issues: list[Optional[Issue]] = []
+    misses: list[tuple[int, Path, FileSignature]] = []
+
+    for yaml_path, sig in _current_issue_files(issues_path):
         seen_paths.add(yaml_path)
-        mtime = yaml_path.stat().st_mtime
+        seen_dirs.add(yaml_path.parent.name)
 
         cached = _issue_file_cache.get(yaml_path)
-        if cached is not None and cached[0] == mtime:
+        if cached is not None and cached[0] == sig:
             issues.append(cached[1])
             continue
 
-        try:
-            issue = Issue.from_yaml(yaml_path)
-        except Exception:
-            continue
+        misses.append((len(issues), yaml_path, sig))
+        issues.append(None)
+
+    # IDs whose files changed or disappeared since the last scan
+    removed_ids = {
+        _issue_file_cache[yaml_path][1].id
+        for _, yaml_path, _ in misses
+        if yaml_path in _issue_file_cache
+    }
 
-        _issue_file_cache[yaml_path] = (mtime, issue)
-        issues.append(issue)
+    if misses:
+        _load_cache_misses(issues_path.parent, misses, issues, seen_dirs)
 
     # Prune cache entries for deleted issues
     stale = set(_issue_file_cache) - seen_paths
     for p in stale:
+        removed_ids.add(_issue_file_cache[p][1].id)
         del _issue_file_cache[p]
 
-    return issues
+    loaded = [issue for issue in issues if issue is not None]
+
+    if rebuild:
+        _issue_id_index.clear()
+        _dependency_graph.clear()
+        changed: list[Issue] = loaded
+    else:
+        for issue_id in removed_ids:
+            _issue_id_index.pop(issue_id, None)
+            _dependency_graph.remove(issue_id)
+        changed = [i for i in (issues[slot] for slot, _, _ in misses) if i is not None]
+    for issue in changed:
+        if issue._yaml_path is not None:
+            _issue_id_index[issue.id] = issue._yaml_path
+        _dependency_graph.update(issue.id, issue.dependencies, issue.stage)
+    _issue_id_index_root = issues_path
+    _graph_stale.clear()
+    _graph_needs_sweep = False
+
+    return loaded
+
+
+def _refresh_graph_node(yaml_path: Path) -> None:
+    """Re-read one issue.yaml into the ID index and dependency graph."""
+    cached = _issue_file_cache.get(yaml_path)
+    old_id = cached[1].id if cached is not None else None
+    if old_id is None:
+        # Saved in this process since it was cached; deletions are rare
+        old_id = next((i for i, p in _issue_id_index.items() if p == yaml_path), None)
+
+    issue = _load_issue_file(yaml_path)
+    if old_id is not None and (issue is None or issue.id != old_id):
+        _issue_id_index.pop(old_id, None)
+        _dependency_graph.remove(old_id)
+    if issue is not None:
+        _issue_id_index[issue.id] = yaml_path
+        _dependency_graph.update(issue.id, issue.dependencies, issue.stage)
+
+
+@_with_cache_lock
+def _get_dependency_graph() -> DependencyGraph:
+    """Return the dependency graph, current with the issues on disk.
+
+    Only the first call for an issues dir (or the first after the caches
+    are invalidated) scans every issue. After that, Issue.save() keeps the
+    graph current and just the issues reported changed by pulls, deletions
+    or the issue watcher are re-read.
+    """
+    issues_path = get_issues_path()
+    watcher = _issue_watcher
+    if (
+        watcher is not None and watcher.root == issues_path
+        and _issue_id_index_root == issues_path
+    ):
+        # Applies the watcher's pending changes; no I/O when there are none
+        _current_issue_files(issues_path)
+
+    if _issue_id_index_root != issues_path or _graph_needs_sweep:
+        _load_all_issues()
+    else:
+        for yaml_path in sorted(_graph_stale):
+            if yaml_path.parent.parent == issues_path:
+                _refresh_graph_node(yaml_path)
+        _graph_stale.clear()
+    return _dependency_graph
 
 
 def list_issues(
@@ -596,8 +1290,8 @@ def list_issues(
     """
     if sync:
         agents_path = get_agenttree_path()
+        # The pull evicts just the issues it changed (see evict_issue_paths)
         sync_agents_repo(agents_path, pull_only=True)
-        invalidate_issues_cache()
 
     issues = _load_all_issues()
 
@@ -611,10 +1305,104 @@ def list_issues(
     return issues
 
 
+@_with_cache_lock
+def list_issue_summaries() -> list[IssueSummary]:
+    """List lightweight summaries of all issues, without syncing.
+
+    For callers that only read IssueSummary fields, such as heartbeat checks
+    that scan every issue. Issues already loaded in this process are
+    projected from the cache, and others are read straight from the
+    persistent index, so no Issue models are built or validated. Only files
+    without an up-to-date index row fall back to a full load.
+
+    Returns:
+        List of IssueSummary objects, in issue directory order
+    """
+    issues_path = get_issues_path()
+    if not issues_path.exists():
+        _summary_cache.clear()
+        return []
+
+    files = _current_issue_files(issues_path)
+    summaries: list[Optional[IssueSummary]] = []
+    misses: list[tuple[int, Path, FileSignature]] = []
+
+    for yaml_path, sig in files:
+        cached = _summary_cache.get(yaml_path)
+        if cached is not None and cached[0] == sig:
+            summaries.append(cached[1])
+            continue
+
+        full = _issue_file_cache.get(yaml_path)
+        if full is not None and full[0] == sig:
+            summary = IssueSummary.from_issue(full[1])
+            _summary_cache[yaml_path] = (sig, summary)
+            summaries.append(summary)
+            continue
+
+        misses.append((len(summaries), yaml_path, sig))
+        summaries.append(None)
+
+    if misses:
+        _load_summary_misses(issues_path.parent, misses, summaries)
+
+    for stale in set(_summary_cache) - {yaml_path for yaml_path, _ in files}:
+        del _summary_cache[stale]
+
+    return [s for s in summaries if s is not None]
+
+
+def _load_summary_misses(
+    agents_path: Path,
+    misses: list[tuple[int, Path, FileSignature]],
+    summaries: list[Optional[IssueSummary]],
+) -> None:
+    """Fill summary cache misses from index rows, else via a full load."""
+    rows: dict[str, tuple[FileSignature, dict[str, Any]]] = {}
+    index = IssueIndex.open(agents_path)
+    if index:
+        with index:
+            if len(misses) == 1:
+                row = index.get(misses[0][1].parent.name)
+                if row is not None:
+                    rows[misses[0][1].parent.name] = row
+            else:
+                rows = index.load()
+
+    unindexed: list[tuple[int, Path, FileSignature]] = []
+    for slot, yaml_path, sig in misses:
+        row = rows.get(yaml_path.parent.name)
+        if row is not None and row[0] == sig:
+            try:
+                summary = IssueSummary.from_fields(row[1])
+            except (KeyError, TypeError, ValueError):
+                unindexed.append((slot, yaml_path, sig))
+                continue
+            _summary_cache[yaml_path] = (sig, summary)
+            summaries[slot] = summary
+        else:
+            unindexed.append((slot, yaml_path, sig))
+
+    if not unindexed:
+        return
+
+    loaded: list[Optional[Issue]] = [None] * len(summaries)
+    _load_cache_misses(agents_path, unindexed, loaded)
+    for slot, yaml_path, sig in unindexed:
+        issue = loaded[slot]
+        if issue is not None:
+            summary = IssueSummary.from_issue(issue)
+            _summary_cache[yaml_path] = (sig, summary)
+            summaries[slot] = summary
+
+
 def get_issue(issue_id: int | str, sync: bool = True) -> Optional[Issue]:
     """Get a single issue by ID.
 
-    Routes through _load_all_issues() to benefit from the mtime cache.
+    Looks the issue up by ID (canonical directory name, then the ID index
+    built by the last full scan), so a warm lookup costs a single stat().
+    Falls back to a full scan only if this issues dir has never been scanned
+    (e.g. legacy "042-slug" directory names).
 
     Args:
         issue_id: Issue ID (int or string like "042", "42")
@@ -625,16 +1413,30 @@ def get_issue(issue_id: int | str, sync: bool = True) -> Optional[Issue]:
     """
     if sync:
         agents_path = get_agenttree_path()
+        # The pull evicts just the issues it changed (see evict_issue_paths)
         sync_agents_repo(agents_path, pull_only=True)
-        invalidate_issues_cache()
 
     # Normalize to int
-    from agenttree.ids import parse_issue_id
+    from agenttree.ids import format_issue_id, parse_issue_id
     if isinstance(issue_id, str):
         target_id = parse_issue_id(issue_id)
     else:
         target_id = issue_id
 
+    issues_path = get_issues_path()
+    candidates = [issues_path / format_issue_id(target_id) / "issue.yaml"]
+    indexed = _issue_id_index.get(target_id)
+    if indexed is not None and indexed.parent.parent == issues_path and indexed != candidates[0]:
+        candidates.append(indexed)
+
+    for yaml_path in candidates:
+        issue = _load_issue_file(yaml_path)
+        if issue is not None and issue.id == target_id:
+            return issue
+
+    if _issue_id_index_root == issues_path:
+        return None
+
     for issue in _load_all_issues():
         if issue.id == target_id:
             return issue
@@ -667,11 +1469,27 @@ def get_issue_dir(issue_id: int | str) -> Optional[Path]:
     issue_dir = issues_path / dir_name
 
     if issue_dir.exists() and issue_dir.is_dir():
+        ensure_issue_materialized(issue_dir)
         return issue_dir
 
     return None
 
 
+def _unmet_dependencies(issue: Issue, graph: DependencyGraph, config: Any) -> list[int]:
+    """IDs in issue.dependencies that are missing or not in a completion stage."""
+    unmet: list[int] = []
+    for dep_id in issue.dependencies:
+        dep_stage = graph.stage(dep_id)
+        if dep_stage is None:
+            # Finished issues may have been moved to the archive
+            from agenttree.archive import load_archive_index
+            dep_stage = load_archive_index(get_agenttree_path()).get(dep_id, {}).get("stage")
+        if dep_stage is None or not config.is_completion_stage(dep_stage):
+            # Missing dependencies are treated as unmet
+            unmet.append(dep_id)
+    return unmet
+
+
 def check_dependencies_met(issue: Issue) -> tuple[bool, list[int]]:
     """Check if all dependencies for an issue are met.
 
@@ -691,15 +1509,7 @@ def check_dependencies_met(issue: Issue) -> tuple[bool, list[int]]:
     from agenttree.config import load_config
     config = load_config()
 
-    unmet: list[int] = []
-    for dep_id in issue.dependencies:
-        dep_issue = get_issue(dep_id, sync=False)
-        if dep_issue is None:
-            # Dependency doesn't exist - treat as unmet
-            unmet.append(dep_id)
-        elif not config.is_completion_stage(dep_issue.stage):
-            unmet.append(dep_id)
-
+    unmet = _unmet_dependencies(issue, _get_dependency_graph(), config)
     return len(unmet) == 0, unmet
 
 
@@ -754,7 +1564,7 @@ def detect_circular_dependency(
 ) -> Optional[list[int]]:
     """Detect if adding dependencies would create a circular dependency.
 
-    Uses DFS to detect cycles in the dependency graph.
+    Uses DFS over the maintained dependency graph.
 
     Args:
         issue_id: The issue ID to check
@@ -774,42 +1584,7 @@ def detect_circular_dependency(
     else:
         target_id = issue_id
 
-    # Build adjacency list of all existing dependencies
-    dep_graph: dict[int, list[int]] = {}
-    for issue in list_issues(sync=False):
-        dep_graph[issue.id] = issue.dependencies.copy()
-
-    # Add the new dependencies we're validating
-    dep_graph[target_id] = new_dependencies.copy()
-
-    # DFS to detect cycle starting from issue_id
-    visited: set[int] = set()
-    path: list[int] = []
-    path_set: set[int] = set()
-
-    def dfs(node: int) -> Optional[list[int]]:
-        if node in path_set:
-            # Found cycle - return path from cycle start
-            cycle_start = path.index(node)
-            return path[cycle_start:] + [node]
-
-        if node in visited:
-            return None
-
-        visited.add(node)
-        path.append(node)
-        path_set.add(node)
-
-        for neighbor in dep_graph.get(node, []):
-            cycle = dfs(neighbor)
-            if cycle:
-                return cycle
-
-        path.pop()
-        path_set.remove(node)
-        return None
-
-    return dfs(target_id)
+    return _get_dependency_graph().find_cycle(target_id, new_dependencies)
 
 
 def get_blocked_issues(completed_issue_id: int | str) -> list[Issue]:
@@ -832,9 +1607,14 @@ def get_blocked_issues(completed_issue_id: int | str) -> list[Issue]:
     else:
         target_id = completed_issue_id
 
+    graph = _get_dependency_graph()
     blocked = []
-    for issue in list_issues(sync=False):
-        if config.is_resumable_stage(issue.stage) and target_id in issue.dependencies:
+    for dependent_id in graph.dependents(target_id):
+        stage = graph.stage(dependent_id)
+        if stage is None or not config.is_resumable_stage(stage):
+            continue
+        issue = get_issue(dependent_id, sync=False)
+        if issue is not None:
             blocked.append(issue)
 
     return blocked
@@ -861,8 +1641,9 @@ def get_dependent_issues(issue_id: int | str) -> list[Issue]:
         target_id = issue_id
 
     dependents = []
-    for issue in list_issues(sync=False):
-        if target_id in issue.dependencies:
+    for dependent_id in _get_dependency_graph().dependents(target_id):
+        issue = get_issue(dependent_id, sync=False)
+        if issue is not None:
             dependents.append(issue)
 
     return dependents
@@ -878,12 +1659,13 @@ def get_ready_issues() -> list[Issue]:
     config = load_config()
 
     ready = []
-    for issue in list_issues():
+    issues = list_issues()
+    graph = _get_dependency_graph()
+    for issue in issues:
         if not config.is_resumable_stage(issue.stage):
             continue
         if issue.dependencies:
-            all_met, _ = check_dependencies_met(issue)
-            if all_met:
+            if not _unmet_dependencies(issue, graph, config):
                 ready.append(issue)
         # Issues without dependencies in resumable stages can also be started
         # but they were likely put there intentionally, so don't auto-start
@@ -997,11 +1779,14 @@ def update_issue_stage(
         entry_kwargs["agent"] = agent
     if history_type is not None:
         entry_kwargs["type"] = history_type
-    history_entry = HistoryEntry(**entry_kwargs)
-    issue.history.append(history_entry)
+    issue.append_history(HistoryEntry(**entry_kwargs))
 
     issue.save()
 
+    # Let the stage scans react now instead of on their next heartbeat
+    from agenttree.stage_events import publish_stage_change
+    publish_stage_change(issue_dir, issue.id, old_stage, stage)
+
     if not skip_sync:
         agents_path = get_agenttree_path()
         sync_agents_repo(agents_path, pull_only=False, commit_message=f"Update issue {issue_id} to stage {stage}")
@@ -1435,7 +2220,7 @@ def save_session(session: AgentSession) -> None:
 
     try:
         with open(session_path, "w") as f:
-            yaml.dump(session.model_dump(mode="json"), f, default_flow_style=False, sort_keys=False)
+            yaml_dump(session.model_dump(mode="json"), f)
     except Exception as e:
         log.warning("Failed to save session for %s: %s", session.issue_id, e)
 
@@ -1623,16 +2408,16 @@ def get_issue_context(issue: Issue, include_docs: bool = True) -> dict:
                 context[var_name] = ""
 
     # Add CI feedback context variables for conditional stage routing
-    ci_feedback_path = issue_dir / "ci_feedback.md" if issue_dir else None
-    ci_feedback_exists = ci_feedback_path and ci_feedback_path.exists()
+    ci_feedback = read_artifact(issue_dir, "ci_feedback.md") if issue_dir else None
+    ci_feedback_exists = ci_feedback is not None
     context["ci_feedback_exists"] = ci_feedback_exists
 
     # Parse CI feedback to detect test failures vs review-only failures
     ci_has_test_failures = False
     ci_has_review_failures = False
 
-    if ci_feedback_exists and ci_feedback_path:
-        feedback_content = ci_feedback_path.read_text().lower()
+    if ci_feedback is not None:
+        feedback_content = ci_feedback.lower()
         # Look for test/lint failure patterns
         test_failure_patterns = ["pytest", "failed", "mypy", "error:"]
         ci_has_test_failures = any(pattern in feedback_content for pattern in test_failure_patterns)
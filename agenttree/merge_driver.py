@@ -0,0 +1,260 @@
+"""Git merge drivers for issue state in _agenttree.
+
+Hosts sync _agenttree with `git pull --no-rebase`. When two hosts update
+the same issue between syncs, git's line merge conflicts on issue.yaml (and
+on history.jsonl, where both sides appended at the end), the pull fails,
+and safe_yaml_load() later keeps only the local side of any leftover
+markers, dropping the remote's stage transition.
+
+These drivers merge the files structurally instead:
+
+- issue.yaml is merged field by field against the merge base. A field
+  changed on one side takes that side's value. If both sides changed it,
+  lists of plain values (labels, dependencies) get both sides' additions
+  and removals, and anything else goes to the side with the newer
+  `updated` timestamp (last writer wins). The latest history entry is the
+  newer of the two, and history_count counts both sides' new entries.
+- history.jsonl keeps every entry from both sides, deduplicated and
+  ordered by timestamp.
+
+The append-only archive index (issues/archive/index.jsonl) uses git's
+built-in union merge, which keeps both sides' new lines.
+
+AgentsRepository.ensure_repo() registers the drivers in the local git
+config and .git/info/attributes. Git runs them through the agenttree
+console script's hidden merge-driver command:
+
+    agenttree merge-driver issue %O %A %B
+    agenttree merge-driver history %O %A %B
+
+The merged result is written to the %A file. If a file can't be parsed,
+the driver falls back to `git merge-file` and reports the conflict.
+"""
+
+import json
+import logging
+import shlex
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from agenttree.yamlio import yaml_dump, yaml_load
+
+log = logging.getLogger("agenttree.merge_driver")
+
+ISSUE_DRIVER = "agenttree-issue"
+HISTORY_DRIVER = "agenttree-history"
+
+# Driver name -> (description, merge_driver subcommand, attributes pattern)
+_DRIVERS = {
+    ISSUE_DRIVER: ("AgentTree issue.yaml field merge", "issue", "issue.yaml"),
+    HISTORY_DRIVER: ("AgentTree history.jsonl union", "history", "history.jsonl"),
+}
+
+# Attributes pattern -> git's built-in merge driver
+_BUILTIN_MERGES = {
+    "issues/archive/index.jsonl": "union",
+}
+
+_MISSING: Any = object()
+
+
+def _entry_key(entry: Any) -> str:
+    return json.dumps(entry, sort_keys=True)
+
+
+def _entry_time(entry: Any) -> str:
+    return str(entry.get("timestamp") or "") if isinstance(entry, dict) else ""
+
+
+def _is_scalar_list(value: Any) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(v, (str, int, float, bool)) or v is None for v in value
+    )
+
+
+def _merge_list(base: list[Any], ours: list[Any], theirs: list[Any]) -> list[Any]:
+    """Three-way set merge: keep both sides' additions, apply both sides' removals."""
+    removed = {v for v in base if v not in ours or v not in theirs}
+    merged = [v for v in ours if v not in removed]
+    merged += [v for v in theirs if v not in merged and v not in removed]
+    return merged
+
+
+def _merge_field(base: Any, ours: Any, theirs: Any, theirs_wins: bool) -> Any:
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    if _is_scalar_list(ours) and _is_scalar_list(theirs):
+        return _merge_list(base if isinstance(base, list) else [], ours, theirs)
+    return theirs if theirs_wins else ours
+
+
+def merge_issue_data(
+    base: dict[str, Any], ours: dict[str, Any], theirs: dict[str, Any]
+) -> dict[str, Any]:
+    """Merge two versions of an issue.yaml document against their base.
+
+    Args:
+        base: The merge base (empty if the issue was created on both sides)
+        ours: The local version
+        theirs: The incoming version
+
+    Returns:
+        The merged document, with keys in the local version's order
+    """
+    # Last writer wins; ties break on content so every host picks the same side
+    theirs_wins = (str(theirs.get("updated") or ""), yaml_dump(theirs)) > (
+        str(ours.get("updated") or ""), yaml_dump(ours)
+    )
+
+    merged: dict[str, Any] = {}
+    for key in list(dict.fromkeys([*ours, *theirs])):
+        if key in ("history", "history_count"):
+            continue
+        value = _merge_field(
+            base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING), theirs_wins
+        )
+        if value is not _MISSING:
+            merged[key] = value
+
+    if ours.get("updated") or theirs.get("updated"):
+        merged["updated"] = max(str(ours.get("updated") or ""), str(theirs.get("updated") or ""))
+
+    base_history = base.get("history") or []
+    ours_history = ours.get("history") or []
+    theirs_history = theirs.get("history") or []
+    entries = list({
+        _entry_key(e): e for e in [*ours_history, *theirs_history]
+    }.values())
+    entries.sort(key=_entry_time)
+
+    if "history_count" in ours or "history_count" in theirs:
+        # Split format: full history is in history.jsonl, issue.yaml has the
+        # latest entry and the count
+        ours_count = int(ours.get("history_count", len(ours_history)))
+        theirs_count = int(theirs.get("history_count", len(theirs_history)))
+        base_count = int(base.get("history_count", len(base_history)))
+        count = max(ours_count + theirs_count - base_count, ours_count, theirs_count)
+        if entries:
+            merged["history"] = entries[-1:]
+        merged["history_count"] = count
+    elif entries:
+        merged["history"] = entries
+
+    # The latest history entry decides the stage, so the two stay consistent
+    if entries and isinstance(entries[-1], dict) and entries[-1].get("stage"):
+        latest = entries[-1]
+        owner = theirs if latest in theirs_history[-1:] else ours
+        if owner.get("stage") == latest["stage"]:
+            merged["stage"] = latest["stage"]
+
+    return merged
+
+
+def merge_history_lines(base: str, ours: str, theirs: str) -> str:
+    """Union two versions of history.jsonl, ordered by entry timestamp.
+
+    Entries are only ever appended, so the base adds nothing. Torn or
+    invalid lines are dropped, as readers skip them anyway.
+    """
+    entries: dict[str, Any] = {}
+    for text in (ours, theirs):
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries.setdefault(_entry_key(entry), (line, entry))
+    ordered = sorted(entries.values(), key=lambda item: _entry_time(item[1]))
+    return "".join(line + "\n" for line, _ in ordered)
+
+
+def _merge_issue_files(base: str, ours: str, theirs: str) -> str:
+    docs = [yaml_load(text) if text.strip() else {} for text in (base, ours, theirs)]
+    if not all(isinstance(doc, dict) for doc in docs):
+        raise ValueError("issue.yaml is not a mapping")
+    return yaml_dump(merge_issue_data(*docs))
+
+
+_MERGERS: dict[str, Callable[[str, str, str], str]] = {
+    "issue": _merge_issue_files,
+    "history": merge_history_lines,
+}
+
+
+def run_driver(kind: str, base_path: Path, ours_path: Path, theirs_path: Path) -> int:
+    """Merge theirs_path into ours_path as git expects of a merge driver.
+
+    Returns:
+        0 if merged cleanly, non-zero if ours_path was left with conflicts
+    """
+    try:
+        texts = [p.read_text() for p in (base_path, ours_path, theirs_path)]
+        merged = _MERGERS[kind](*texts)
+    except (OSError, ValueError, KeyError, yaml.YAMLError) as e:
+        log.warning("Structured %s merge failed, falling back to a line merge: %s", kind, e)
+        result = subprocess.run(
+            ["git", "merge-file", "-L", "ours", "-L", "base", "-L", "theirs",
+             str(ours_path), str(base_path), str(theirs_path)],
+            capture_output=True,
+        )
+        return result.returncode
+    ours_path.write_text(merged)
+    return 0
+
+
+def _agenttree_command() -> str:
+    """The agenttree console script for git to run, as a shell word.
+
+    The bare name when it's on PATH, so the setting survives reinstalls and
+    moved virtualenvs. Otherwise the script installed beside this
+    interpreter, if there is one.
+    """
+    if shutil.which("agenttree"):
+        return "agenttree"
+    beside = Path(sys.executable).parent / "agenttree"
+    return shlex.quote(str(beside)) if beside.exists() else "agenttree"
+
+
+def register_merge_drivers(agents_dir: Path) -> None:
+    """Configure git in agents_dir to use these drivers.
+
+    Settings go in the local .git/config and .git/info/attributes, so
+    nothing is committed and hosts without agenttree keep git's default
+    merge. Safe to call repeatedly; the driver command is refreshed in case
+    agenttree was installed somewhere else.
+    """
+    git_dir = agents_dir / ".git"
+    if not git_dir.is_dir():
+        return
+    agenttree = _agenttree_command()
+    for driver, (description, kind, _pattern) in _DRIVERS.items():
+        for key, value in (
+            ("name", description),
+            ("driver", f"{agenttree} merge-driver {kind} %O %A %B"),
+        ):
+            subprocess.run(
+                ["git", "-C", str(agents_dir), "config", f"merge.{driver}.{key}", value],
+                capture_output=True,
+                timeout=10,
+            )
+
+    attributes = git_dir / "info" / "attributes"
+    existing = attributes.read_text() if attributes.exists() else ""
+    lines = existing.splitlines()
+    wanted = [
+        f"{pattern} merge={driver}" for driver, (_description, _kind, pattern) in _DRIVERS.items()
+    ] + [f"{pattern} merge={driver}" for pattern, driver in _BUILTIN_MERGES.items()]
+    missing = [line for line in wanted if line not in lines]
+    if missing:
+        attributes.parent.mkdir(exist_ok=True)
+        prefix = "" if not existing or existing.endswith("\n") else "\n"
+        with open(attributes, "a") as f:
+            f.write(prefix + "\n".join(missing) + "\n")
+
@@ -0,0 +1,335 @@
+"""Background pushes of _agenttree commits, with retry and backoff.
+
+A write sync commits and pulls, then used to push inline with a 30s
+timeout. On a flaky network every CLI write stalled on that push, and a
+failed push just waited for the next caller to happen to sync.
+
+Now the push is queued instead. The queue is the set of local commits not
+yet on the upstream branch, so it survives restarts for free. A pusher
+drains it in the background:
+
+- In long-running processes (the web server) a PushWorker thread owns the
+  queue and is notified after each sync.
+- Elsewhere (CLI), request_push() starts a detached
+  `python -m agenttree.push_queue <agents_dir>` process, unless a pusher
+  already holds .git/agenttree-push.lock.
+
+Failed pushes back off exponentially (BACKOFF_BASE doubling up to
+BACKOFF_MAX, with jitter). Attempt counts, the next retry time and the last
+error are kept in .git/agenttree-push.json, so separate processes share
+one backoff schedule. queue_status() reports queue depth and the age of
+the oldest unpushed commit for the dashboard.
+
+Set AGENTTREE_PUSH_MODE=inline to push synchronously during the sync
+instead (the old behaviour).
+"""
+
+import fcntl
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Optional
+
+log = logging.getLogger("agenttree.push_queue")
+
+PUSH_MODE_ENV = "AGENTTREE_PUSH_MODE"
+PUSH_TIMEOUT = 30
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 600.0
+
+# How often an idle PushWorker re-checks for commits made by other processes
+WORKER_POLL_INTERVAL = 30.0
+
+# A detached pusher gives up after this long; the next sync starts another
+DETACHED_PUSHER_LIFETIME = 3600.0
+
+_STATE_FILE = "agenttree-push.json"
+_LOCK_FILE = "agenttree-push.lock"
+
+
+def push_in_background() -> bool:
+    """False if AGENTTREE_PUSH_MODE=inline."""
+    return os.environ.get(PUSH_MODE_ENV, "background").lower() != "inline"
+
+
+def _state_path(agents_dir: Path) -> Path:
+    return agents_dir / ".git" / _STATE_FILE
+
+
+def load_push_state(agents_dir: Path) -> dict[str, Any]:
+    try:
+        state = json.loads(_state_path(agents_dir).read_text())
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _save_push_state(agents_dir: Path, state: dict[str, Any]) -> None:
+    path = _state_path(agents_dir)
+    tmp = path.with_name(f"{path.name}.tmp")
+    try:
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+    except OSError as e:
+        log.debug("Could not save push state: %s", e)
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds to wait after `attempts` consecutive failures (with jitter)."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** max(attempts - 1, 0))
+    return random.uniform(delay / 2, delay)
+
+
+def unpushed_commit_times(agents_dir: Path) -> Optional[list[int]]:
+    """Commit times of local commits not on the upstream branch, newest first.
+
+    Returns:
+        The commit times, or None if there's no upstream to compare with
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(agents_dir), "log", "--format=%ct", "@{u}..HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (subprocess.SubprocessError, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    return [int(line) for line in result.stdout.split() if line.isdigit()]
+
+
+def queue_status(agents_dir: Path) -> dict[str, Any]:
+    """Queue depth, oldest unpushed commit age and retry state.
+
+    Returns:
+        {"depth": int, "oldest_age_s": float | None, "attempts": int,
+         "next_attempt_in_s": float | None, "last_error": str | None}
+    """
+    times = unpushed_commit_times(agents_dir) or []
+    state = load_push_state(agents_dir)
+    now = time.time()
+    next_attempt = float(state.get("next_attempt") or 0)
+    return {
+        "depth": len(times),
+        "oldest_age_s": round(now - min(times), 1) if times else None,
+        "attempts": int(state.get("attempts") or 0) if times else 0,
+        "next_attempt_in_s": round(next_attempt - now, 1) if times and next_attempt > now else None,
+        "last_error": state.get("last_error") if times else None,
+    }
+
+
+def push_now(agents_dir: Path) -> bool:
+    """Push once, recording the outcome in the shared backoff state.
+
+    Returns:
+        True if the push succeeded
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(agents_dir), "push"],
+            capture_output=True,
+            text=True,
+            timeout=PUSH_TIMEOUT,
+        )
+        error = None if result.returncode == 0 else (result.stderr or "").strip()
+    except subprocess.TimeoutExpired:
+        error = "push timed out"
+
+    state = load_push_state(agents_dir)
+    if error is None:
+        if state.get("attempts"):
+            log.info("Pushed _agenttree after %d failed attempt(s)", state["attempts"])
+        _save_push_state(agents_dir, {"attempts": 0, "last_success": time.time()})
+        return True
+
+    # Push failed - could be offline or permission issue
+    if "Could not resolve host" in error:
+        log.warning("Offline - changes committed locally but not pushed")
+    else:
+        log.warning("Failed to push changes: %s", error)
+    attempts = int(state.get("attempts") or 0) + 1
+    state.update(
+        attempts=attempts,
+        next_attempt=time.time() + backoff_delay(attempts),
+        last_error=error[-500:],
+    )
+    _save_push_state(agents_dir, state)
+    return False
+
+
+def retry_soon(agents_dir: Path) -> None:
+    """Cancel any backoff wait, e.g. after a pull showed the remote is reachable."""
+    state = load_push_state(agents_dir)
+    if float(state.get("next_attempt") or 0) > time.time():
+        state["next_attempt"] = 0
+        _save_push_state(agents_dir, state)
+
+
+def _try_lock(agents_dir: Path) -> Optional[IO[str]]:
+    """Take the pusher lock without blocking, or return None if it's held."""
+    try:
+        lock_fd = open(agents_dir / ".git" / _LOCK_FILE, "w")
+    except OSError:
+        return None
+    try:
+        fcntl.flock(lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_fd.close()
+        return None
+    return lock_fd
+
+
+def drain(
+    agents_dir: Path, stop: Optional[threading.Event] = None, until: Optional[float] = None
+) -> None:
+    """Push until no commits are queued, waiting out backoff between failures.
+
+    The caller must hold the pusher lock. Returns early when stop is set,
+    at the monotonic time `until`, or when there's no upstream branch.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set() and (until is None or time.monotonic() < until):
+        times = unpushed_commit_times(agents_dir)
+        if not times:
+            return
+        wait = float(load_push_state(agents_dir).get("next_attempt") or 0) - time.time()
+        if wait > 0:
+            # Wait in steps and re-read the state: retry_soon() may cancel it
+            stop.wait(min(wait, 5.0))
+            continue
+        push_now(agents_dir)
+
+
+def run_pusher(agents_dir: Path) -> None:
+    """Drain the queue if no other pusher is running (detached process body)."""
+    until = time.monotonic() + DETACHED_PUSHER_LIFETIME
+    while time.monotonic() < until:
+        lock_fd = _try_lock(agents_dir)
+        if lock_fd is None:
+            return
+        try:
+            drain(agents_dir, until=until)
+        finally:
+            lock_fd.close()
+        # A commit may have landed after our last check while we still held
+        # the lock, so its writer didn't start a pusher
+        if not unpushed_commit_times(agents_dir):
+            return
+
+
+class PushWorker:
+    """Thread that owns the push queue for one _agenttree in this process."""
+
+    def __init__(self, agents_dir: Path, poll_interval: float = WORKER_POLL_INTERVAL):
+        self.agents_dir = agents_dir
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_fd: Optional[IO[str]] = None
+
+    def start(self) -> bool:
+        """Start the thread, unless another process already owns the queue."""
+        self._lock_fd = _try_lock(self.agents_dir)
+        if self._lock_fd is None:
+            return False
+        self._thread = threading.Thread(target=self._run, name="push-worker", daemon=True)
+        self._thread.start()
+        return True
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._lock_fd is not None:
+            self._lock_fd.close()
+            self._lock_fd = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                drain(self.agents_dir, self._stop)
+            except Exception as e:
+                log.warning("Push worker error: %s", e)
+            self._wake.wait(self.poll_interval)
+
+
+_worker: Optional[PushWorker] = None
+
+
+def request_push(agents_dir: Path) -> None:
+    """Push queued commits in the background; returns immediately."""
+    worker = _worker
+    if worker is not None and worker.agents_dir == agents_dir:
+        worker.notify()
+        return
+
+    lock_fd = _try_lock(agents_dir)
+    if lock_fd is None:
+        return  # a pusher is already running and will pick up our commit
+    lock_fd.close()
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "agenttree.push_queue", str(agents_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        log.warning("Could not start background push: %s", e)
+
+
+def start_push_worker(agents_dir: Path) -> Optional[PushWorker]:
+    """Own the push queue for agents_dir from this process.
+
+    Returns:
+        The running worker, or None if agents_dir isn't a git repo or
+        another process is already pushing
+    """
+    global _worker
+
+    stop_push_worker()
+    if not (agents_dir / ".git").is_dir():
+        return None
+    worker = PushWorker(agents_dir)
+    if not worker.start():
+        return None
+    _worker = worker
+    return worker
+
+
+def stop_push_worker() -> None:
+    global _worker
+
+    if _worker is None:
+        return
+    worker, _worker = _worker, None
+    worker.stop()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python -m agenttree.push_queue AGENTS_DIR", file=sys.stderr)
+        return 2
+    run_pusher(Path(args[0]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
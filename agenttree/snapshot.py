@@ -0,0 +1,144 @@
+"""One shared view of the world per heartbeat tick.
+
+Each heartbeat action used to load the config, list every issue and ask
+tmux (`has-session` per issue) and the container runtime for itself, so a
+tick with seven actions scanned each resource seven times. fire_event()
+now builds one TickSnapshot per tick and passes it to every action as the
+`_snapshot` keyword argument.
+
+The snapshot holds the config, the parsed issues, the names of running
+tmux sessions and the names of running containers. Each resource is read
+on first use and at most once per tick, so a tick whose actions are all
+rate limited scans nothing, and the values never change once read.
+
+Issues in the snapshot come from the shared per-file cache and must be
+treated as read-only: an action that changes an issue re-reads it with
+Issue.from_yaml() first, as it did before. Resources started or stopped
+during the tick (an agent launched by an earlier action) show up in the
+next tick's snapshot.
+"""
+
+import logging
+import threading
+from collections.abc import Callable, Collection, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from agenttree.config import Config
+    from agenttree.issues import Issue
+
+log = logging.getLogger("agenttree.snapshot")
+
+T = TypeVar("T")
+
+
+class TickSnapshot:
+    """Config, issues, tmux sessions and containers as of one heartbeat tick.
+
+    Safe to share between the tick's action threads. Passing `issues`
+    scopes the snapshot to just those issues (see stage_events).
+    """
+
+    def __init__(
+        self,
+        agents_dir: Path,
+        config: Optional["Config"] = None,
+        issues: Optional[Iterable["Issue"]] = None,
+    ) -> None:
+        self.agents_dir = agents_dir
+        self._lock = threading.Lock()
+        # One lock per resource, so a slow tmux call doesn't hold up the issue scan
+        self._locks: dict[str, threading.Lock] = {}
+        self._values: dict[str, Any] = {}
+        if config is not None:
+            self._values["config"] = config
+        if issues is not None:
+            self._values["issues"] = tuple(issues)
+
+    def _get(self, name: str, loader: Callable[[], T]) -> T:
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._values:
+                self._values[name] = loader()
+            value: T = self._values[name]
+            return value
+
+    @property
+    def config(self) -> "Config":
+        from agenttree.config import load_config
+
+        return self._get("config", load_config)
+
+    @property
+    def issues(self) -> tuple["Issue", ...]:
+        """Every issue under agents_dir/issues (archive excluded), in directory order."""
+        return self._get("issues", lambda: _load_issues(self.agents_dir))
+
+    @property
+    def tmux_sessions(self) -> frozenset[str]:
+        from agenttree.tmux import list_sessions
+
+        return self._get("tmux_sessions", lambda: frozenset(s.name for s in list_sessions()))
+
+    @property
+    def containers(self) -> frozenset[str]:
+        """Names of running containers."""
+        from agenttree.container import list_running_container_names
+
+        return self._get("containers", lambda: frozenset(list_running_container_names()))
+
+    def session_exists(self, session_name: str) -> bool:
+        return session_name in self.tmux_sessions
+
+    def container_running(self, container_name: str) -> bool:
+        """Whether a running container's name starts with container_name.
+
+        Same matching as container.is_container_running() (names carry a
+        random suffix).
+        """
+        return any(name.startswith(container_name) for name in self.containers)
+
+    def issue_dirs(self, stages: Optional[Collection[str]] = None) -> list[Path]:
+        """Directories of the issues in `stages` (all issues if None)."""
+        return [
+            issue.dir for issue in self.issues
+            if issue.dir is not None and (stages is None or issue.stage in stages)
+        ]
+
+
+def _load_issues(agents_dir: Path) -> tuple["Issue", ...]:
+    from agenttree.issues import _load_issue_file, _scan_issue_files
+
+    issues_path = agents_dir / "issues"
+    if not issues_path.exists():
+        return ()
+    issues = []
+    for yaml_path, _ in _scan_issue_files(issues_path):
+        try:
+            issue = _load_issue_file(yaml_path)
+        except Exception as e:
+            log.debug("Skipping %s: %s", yaml_path, e)
+            continue
+        if issue is not None:
+            issues.append(issue)
+    return tuple(issues)
+
+
+def issue_dirs(
+    agents_dir: Path,
+    snapshot: Optional[TickSnapshot] = None,
+    stages: Optional[Collection[str]] = None,
+) -> list[Path]:
+    """Issue directories for a heartbeat scan to visit.
+
+    With a snapshot, only the issues it has in `stages`; without one,
+    every directory under issues/ (the caller filters as it reads them).
+    """
+    if snapshot is not None:
+        return snapshot.issue_dirs(stages)
+    issues_path = agents_dir / "issues"
+    if not issues_path.exists():
+        return []
+    return [d for d in issues_path.iterdir() if d.is_dir()]
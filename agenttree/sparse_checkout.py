@@ -0,0 +1,140 @@
+"""Sparse, partial clones of _agenttree.
+
+A full clone of _agenttree downloads every issue ever written: specs,
+reviews, attachments and history for hundreds of accepted or abandoned
+issues. With `sparse_agents_repo: true` in .agenttree.yaml, new clones are
+instead partial (`--filter=blob:none`, so file contents are fetched only
+when checked out) and sparse:
+
+    /*                       top-level files, skills/, templates/, ...
+    !/issues/*/              but no issue directories,
+    /issues/*/issue.yaml     except each issue's issue.yaml (so every issue
+                             still shows up in listings),
+    /issues/001/             and the full directory of each active issue.
+
+Everything else stays on the remote until needed. ensure_issue_materialized()
+adds an issue's directory to the checkout (fetching its files) the first
+time it's opened or written, so archived issues are fetched on demand.
+Full clones are unaffected; the checks here are a no-op for them.
+"""
+
+import logging
+import subprocess
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+log = logging.getLogger("agenttree.sparse_checkout")
+
+# Flags for `git clone` (or after `--` for `gh repo clone`)
+CLONE_ARGS = ["--filter=blob:none", "--sparse"]
+
+BASE_PATTERNS = ["/*", "!/issues/*/", "/issues/*/issue.yaml"]
+
+# agents_dir -> whether core.sparseCheckout is on (asked once per process)
+_sparse_repos: dict[Path, bool] = {}
+# agents_dir -> (mtime_ns of .git/info/sparse-checkout, its patterns)
+_patterns_cache: dict[Path, tuple[int, set[str]]] = {}
+
+
+def issue_pattern(dir_name: str) -> str:
+    return f"/issues/{dir_name}/"
+
+
+def sparse_patterns(issue_dirs: Iterable[str] = ()) -> list[str]:
+    """Checkout patterns for the base set plus the given issue directories."""
+    return BASE_PATTERNS + [issue_pattern(d) for d in sorted(issue_dirs)]
+
+
+def _git(agents_dir: Path, *args: str, timeout: int = 300) -> bool:
+    result = subprocess.run(
+        ["git", "-C", str(agents_dir), *args],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        log.warning("git %s failed in %s: %s", args[0], agents_dir, result.stderr.strip())
+        return False
+    return True
+
+
+def active_issue_dirs(agents_dir: Path) -> list[str]:
+    """Issue directories whose stage isn't a completion or abandon stage."""
+    from agenttree.config import load_config
+    from agenttree.yamlio import yaml_load
+
+    config = load_config(agents_dir.parent)
+    active = []
+    for yaml_path in sorted((agents_dir / "issues").glob("*/issue.yaml")):
+        try:
+            stage = str((yaml_load(yaml_path.read_text()) or {}).get("stage") or "")
+        except (OSError, ValueError, AttributeError):
+            active.append(yaml_path.parent.name)  # can't tell; keep it
+            continue
+        if not (config.is_completion_stage(stage) or config.is_abandon_stage(stage)):
+            active.append(yaml_path.parent.name)
+    return active
+
+
+def init_sparse_checkout(agents_dir: Path) -> bool:
+    """Narrow a `git clone --sparse` checkout to issue.yaml files and active issues.
+
+    Returns:
+        True if the checkout was configured
+    """
+    if not _git(agents_dir, "sparse-checkout", "set", "--no-cone", *sparse_patterns()):
+        return False
+    active = active_issue_dirs(agents_dir)
+    if active and not _git(agents_dir, "sparse-checkout", "add", *[issue_pattern(d) for d in active]):
+        return False
+    _sparse_repos[agents_dir] = True
+    log.info("Sparse checkout of %s with %d active issue(s)", agents_dir, len(active))
+    return True
+
+
+def is_sparse(agents_dir: Path) -> bool:
+    """True if agents_dir is a sparse checkout."""
+    cached = _sparse_repos.get(agents_dir)
+    if cached is None:
+        if not (agents_dir / ".git" / "info" / "sparse-checkout").exists():
+            cached = False
+        else:
+            from agenttree.git_backend import get_git_backend
+            value = get_git_backend().config_get(agents_dir, "core.sparseCheckout")
+            cached = (value or "").lower() == "true"
+        _sparse_repos[agents_dir] = cached
+    return cached
+
+
+def _current_patterns(agents_dir: Path) -> Optional[set[str]]:
+    path = agents_dir / ".git" / "info" / "sparse-checkout"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _patterns_cache.get(agents_dir)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    patterns = {line.strip() for line in path.read_text().splitlines() if line.strip()}
+    _patterns_cache[agents_dir] = (mtime, patterns)
+    return patterns
+
+
+def ensure_issue_materialized(issue_dir: Path) -> None:
+    """Check out an issue's full directory if a sparse clone left it out.
+
+    Call before reading or writing anything but issue.yaml. Costs a stat()
+    for sparse checkouts and nothing for full ones.
+    """
+    if issue_dir.parent.name != "issues":
+        return
+    agents_dir = issue_dir.parent.parent
+    if not is_sparse(agents_dir):
+        return
+    pattern = issue_pattern(issue_dir.name)
+    patterns = _current_patterns(agents_dir)
+    if patterns is None or pattern in patterns:
+        return
+    log.info("Fetching %s into the sparse checkout", issue_dir.name)
+    _git(agents_dir, "sparse-checkout", "add", pattern)
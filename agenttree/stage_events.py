@@ -0,0 +1,340 @@
+"""Stage transition events: in-process pub/sub plus a durable journal.
+
+check_manager_stages, check_custom_agent_stages and ensure_review_branches
+used to find their work only by scanning every issue on each heartbeat, so
+an issue entering a manager or custom agent stage waited up to a heartbeat
+interval for its hooks or agent. update_issue_stage() now publishes a
+StageTransition for every stage change:
+
+- subscribers registered in this process with subscribe() are called
+  right away, in the publishing thread
+- the transition is appended to _agenttree/.stage_events.jsonl (kept out
+  of git via .git/info/exclude), so transitions made by other processes
+  (`agenttree next` in an agent's shell, the CLI) reach the web server too
+
+The web server runs a StageEventDispatcher. It wakes on in-process events
+and checks the journal every poll_s seconds for the rest, takes the new
+entries (truncating the journal once they're read), and runs the three
+scans on a snapshot holding only the issues that moved, for the stages
+each one handles (the reactions in REACTIONS). The heartbeat keeps its
+own, slower, full scans as a safety net for events that never reach the
+journal, such as stage changes pulled in by git.
+
+The journal only holds transitions no dispatcher has taken yet. Writers
+cap it at MAX_JOURNAL_BYTES (when no server is reading it), since the
+safety-net scans cover anything dropped.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from agenttree.config import Config
+
+log = logging.getLogger("agenttree.stage_events")
+
+JOURNAL_FILENAME = ".stage_events.jsonl"
+MAX_JOURNAL_BYTES = 1 << 20
+DEFAULT_POLL_S = 1.0
+
+
+@dataclass(frozen=True)
+class StageTransition:
+    """An issue leaving from_stage and entering to_stage."""
+
+    issue_id: int
+    dir_name: str
+    from_stage: str
+    to_stage: str
+    timestamp: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, line: str) -> "StageTransition":
+        data = json.loads(line)
+        return cls(
+            issue_id=int(data["issue_id"]),
+            dir_name=str(data["dir_name"]),
+            from_stage=str(data["from_stage"]),
+            to_stage=str(data["to_stage"]),
+            timestamp=str(data["timestamp"]),
+        )
+
+
+Subscriber = Callable[[StageTransition], None]
+
+_subscribers: list[Subscriber] = []
+_subscribers_lock = threading.Lock()
+_excluded: set[Path] = set()
+
+
+def subscribe(callback: Subscriber) -> Callable[[], None]:
+    """Call callback for every transition published in this process.
+
+    Callbacks run in the publishing thread and should return quickly;
+    errors are logged and don't affect the publisher.
+
+    Returns:
+        A function that unsubscribes the callback
+    """
+    with _subscribers_lock:
+        _subscribers.append(callback)
+
+    def unsubscribe() -> None:
+        with _subscribers_lock:
+            if callback in _subscribers:
+                _subscribers.remove(callback)
+
+    return unsubscribe
+
+
+def publish(agents_dir: Path, transition: StageTransition) -> None:
+    """Record a transition in the journal and notify in-process subscribers."""
+    try:
+        append_journal(agents_dir, transition)
+    except OSError as e:
+        log.warning("Could not journal stage change of issue %s: %s", transition.issue_id, e)
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        try:
+            callback(transition)
+        except Exception as e:
+            log.warning("Stage event subscriber failed: %s", e)
+
+
+def publish_stage_change(issue_dir: Path, issue_id: int, from_stage: str, to_stage: str) -> None:
+    """Publish that the issue in issue_dir moved from from_stage to to_stage."""
+    publish(
+        issue_dir.parent.parent,
+        StageTransition(
+            issue_id=issue_id,
+            dir_name=issue_dir.name,
+            from_stage=from_stage,
+            to_stage=to_stage,
+            timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        ),
+    )
+
+
+def _ensure_git_excluded(agents_dir: Path) -> None:
+    """Keep the journal out of `git add -A` (locally, via info/exclude)."""
+    if agents_dir in _excluded:
+        return
+    git_dir = agents_dir / ".git"
+    if not git_dir.is_dir():
+        return
+    exclude = git_dir / "info" / "exclude"
+    try:
+        existing = exclude.read_text() if exclude.exists() else ""
+        if JOURNAL_FILENAME not in existing.splitlines():
+            exclude.parent.mkdir(parents=True, exist_ok=True)
+            prefix = "" if not existing or existing.endswith("\n") else "\n"
+            with open(exclude, "a") as f:
+                f.write(f"{prefix}# AgentTree stage event journal\n{JOURNAL_FILENAME}\n")
+        _excluded.add(agents_dir)
+    except OSError as e:
+        log.debug("Could not update %s: %s", exclude, e)
+
+
+def append_journal(agents_dir: Path, transition: StageTransition) -> None:
+    """Append one transition to the journal (under an exclusive lock)."""
+    _ensure_git_excluded(agents_dir)
+    with open(agents_dir / JOURNAL_FILENAME, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_size > MAX_JOURNAL_BYTES:
+                # Nobody is taking events; the safety-net scans cover them
+                f.truncate(0)
+            f.write(transition.to_json() + "\n")
+            f.flush()
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def take_journal(agents_dir: Path) -> list[StageTransition]:
+    """Read and clear every transition in the journal, oldest first."""
+    path = agents_dir / JOURNAL_FILENAME
+    try:
+        if path.stat().st_size == 0:
+            return []
+        f = open(path, "r+")
+    except FileNotFoundError:
+        return []
+    with f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            lines = f.read().splitlines()
+            f.truncate(0)
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    transitions = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            transitions.append(StageTransition.from_json(line))
+        except (ValueError, KeyError, TypeError) as e:
+            log.debug("Skipping bad journal line %r: %s", line, e)
+    return transitions
+
+
+def _reacts_to_manager_stages(config: "Config", transition: StageTransition) -> bool:
+    return transition.to_stage in config.get_manager_stages()
+
+
+def _reacts_to_custom_agent_stages(config: "Config", transition: StageTransition) -> bool:
+    return transition.to_stage in config.get_custom_role_stages()
+
+
+def _reacts_to_review_branches(config: "Config", transition: StageTransition) -> bool:
+    # Entering review needs a PR; a completed issue moved main, so the
+    # branches of everything in review may need updating
+    return transition.to_stage == "implement.review" or config.is_completion_stage(
+        transition.to_stage
+    )
+
+
+# Scan name -> whether a transition is relevant to it
+REACTIONS: dict[str, Callable[["Config", StageTransition], bool]] = {
+    "check_manager_stages": _reacts_to_manager_stages,
+    "check_custom_agent_stages": _reacts_to_custom_agent_stages,
+    "ensure_review_branches": _reacts_to_review_branches,
+}
+
+
+def handle_transitions(agents_dir: Path, transitions: list[StageTransition]) -> dict[str, int]:
+    """Run the scans that the transitions are relevant to, on just those issues.
+
+    ensure_review_branches runs over every issue in review when an issue
+    was completed (main moved); otherwise each scan sees only the issues
+    that moved, re-read from disk so a later transition wins.
+
+    Returns:
+        Scan name -> the count it returned, for the scans that ran
+    """
+    from agenttree import agents_repo
+    from agenttree.config import load_config
+    from agenttree.fileio import group_commit
+    from agenttree.issues import Issue
+    from agenttree.snapshot import TickSnapshot
+
+    config = load_config(agents_dir.parent)
+    relevant: dict[str, list[StageTransition]] = {}
+    for transition in transitions:
+        for name, reacts in REACTIONS.items():
+            if reacts(config, transition):
+                relevant.setdefault(name, []).append(transition)
+    if not relevant:
+        return {}
+
+    def moved_issues(items: list[StageTransition]) -> list[Issue]:
+        issues = []
+        for dir_name in dict.fromkeys(t.dir_name for t in items):
+            yaml_path = agents_dir / "issues" / dir_name / "issue.yaml"
+            try:
+                issues.append(Issue.from_yaml(yaml_path))
+            except Exception as e:
+                log.debug("Skipping stage event for %s: %s", dir_name, e)
+        return issues
+
+    results: dict[str, int] = {}
+    for name, items in relevant.items():
+        if name == "ensure_review_branches" and any(
+            config.is_completion_stage(t.to_stage) for t in items
+        ):
+            snapshot = TickSnapshot(agents_dir, config)
+        else:
+            snapshot = TickSnapshot(agents_dir, config, issues=moved_issues(items))
+        scan: Callable[..., int] = getattr(agents_repo, name)
+        try:
+            with group_commit():
+                results[name] = scan(agents_dir, snapshot=snapshot)
+        except Exception as e:
+            log.warning("%s failed for stage events: %s", name, e)
+    return results
+
+
+class StageEventDispatcher:
+    """Background thread that reacts to stage transitions as they happen."""
+
+    def __init__(self, agents_dir: Path, poll_s: float = DEFAULT_POLL_S) -> None:
+        self.agents_dir = agents_dir
+        self.poll_s = poll_s
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    def _on_transition(self, transition: StageTransition) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        self._unsubscribe = subscribe(self._on_transition)
+        self._thread = threading.Thread(
+            target=self._run, name="stage-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> dict[str, Any]:
+        """Take and handle whatever is in the journal now."""
+        transitions = take_journal(self.agents_dir)
+        if not transitions:
+            return {}
+        log.debug("Handling %d stage transition(s)", len(transitions))
+        return handle_transitions(self.agents_dir, transitions)
+
+    def _run(self) -> None:
+        # Transitions journaled while no server was running come first
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                log.error("Stage event dispatch failed: %s", e)
+            self._wake.wait(self.poll_s)
+            self._wake.clear()
+
+
+_dispatcher: Optional[StageEventDispatcher] = None
+
+
+def start_stage_event_dispatcher(
+    agents_dir: Path, poll_s: float = DEFAULT_POLL_S
+) -> StageEventDispatcher:
+    """React to stage transitions for agents_dir in this process until stopped."""
+    global _dispatcher
+
+    stop_stage_event_dispatcher()
+    _dispatcher = StageEventDispatcher(agents_dir, poll_s)
+    _dispatcher.start()
+    return _dispatcher
+
+
+def stop_stage_event_dispatcher() -> None:
+    global _dispatcher
+
+    if _dispatcher is None:
+        return
+    dispatcher, _dispatcher = _dispatcher, None
+    dispatcher.stop()
@@ -0,0 +1,317 @@
+"""Shared sync service that coalesces sync_agents_repo() calls.
+
+Most issue operations call sync_agents_repo() inline, and each call runs up
+to five git subprocesses. With several agents and the dashboard running,
+most of those calls overlap and, because the sync lock is non-blocking,
+many are silently skipped.
+
+The long-running web server hosts a SyncService listening on a Unix socket
+at _agenttree/.sync.sock. sync_agents_repo() in any host process hands its
+request to the service instead of running git itself:
+
+- Writers (pull_only=False) enqueue a commit intent and return at once.
+- Readers (pull_only=True) block until a pull that started after their
+  request has finished, so they still see fresh data.
+
+Requests that arrive within the debounce window share one batch: one
+commit (with the combined messages) and one pull, plus one push if any
+writer is in the batch. With no service running, sync_agents_repo() falls
+back to syncing inline as before.
+
+Protocol: one JSON object per line each way.
+    request:  {"pull_only": bool, "message": str | null, "paths": [str] | null, "wait": bool}
+    response: {"ok": bool}
+"""
+
+import json
+import logging
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger("agenttree.sync_service")
+
+SOCKET_NAME = ".sync.sock"
+DEFAULT_DEBOUNCE = 0.5
+
+# Upper bound for a reader waiting on a batch (commit + pull + push timeouts)
+REQUEST_TIMEOUT = 90.0
+
+
+class _Request:
+    """One caller's sync request, completed when its batch finishes."""
+
+    def __init__(self, pull_only: bool, message: Optional[str], paths: Optional[list[str]] = None):
+        self.pull_only = pull_only
+        self.message = message
+        self.paths = paths
+        self.result = False
+        self.done = threading.Event()
+
+    def finish(self, result: bool) -> None:
+        self.result = result
+        self.done.set()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_SocketServer"
+
+    def handle(self) -> None:
+        try:
+            data = json.loads(self.rfile.readline())
+            paths = data.get("paths")
+            request = self.server.service.submit(
+                bool(data.get("pull_only")),
+                data.get("message"),
+                [str(p) for p in paths] if isinstance(paths, list) else None,
+            )
+            ok = True
+            if data.get("wait", True):
+                ok = request.done.wait(REQUEST_TIMEOUT) and request.result
+            self.wfile.write(json.dumps({"ok": ok}).encode() + b"\n")
+        except (OSError, ValueError, AttributeError) as e:
+            log.debug("Bad sync request: %s", e)
+
+
+class _SocketServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, service: "SyncService"):
+        self.service = service
+        super().__init__(path, _Handler)
+
+
+class SyncService:
+    """Batches sync requests for one _agenttree repo into shared git runs."""
+
+    def __init__(self, agents_dir: Path, debounce: float = DEFAULT_DEBOUNCE):
+        self.agents_dir = agents_dir
+        self.debounce = debounce
+        self.socket_path = agents_dir / SOCKET_NAME
+        self._cond = threading.Condition()
+        self._pending: list[_Request] = []
+        self._first_pending_at = 0.0
+        self._stopping = False
+        self._server: Optional[_SocketServer] = None
+        self._threads: list[threading.Thread] = []
+        # Writers' paths from failed batches, committed by the next one
+        self._unsynced: set[str] = set()
+        # Counters for logging/tests
+        self.requests = 0
+        self.batches = 0
+
+    def start(self) -> bool:
+        """Bind the socket and start serving.
+
+        Returns:
+            False if another service already owns the socket or it can't be
+            bound (e.g. path too long for AF_UNIX)
+        """
+        path = str(self.socket_path)
+        if self.socket_path.exists():
+            if _ping(self.socket_path):
+                log.info("Sync service already running at %s", path)
+                return False
+            self.socket_path.unlink()
+        try:
+            self._server = _SocketServer(path, self)
+        except OSError as e:
+            log.warning("Could not start sync service at %s: %s", path, e)
+            return False
+
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="sync-service-socket", daemon=True),
+            threading.Thread(target=self._run, name="sync-service-worker", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Close the socket, then run any pending batch."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(REQUEST_TIMEOUT)
+        self._threads = []
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def submit(
+        self, pull_only: bool, message: Optional[str], paths: Optional[list[str]] = None
+    ) -> _Request:
+        """Queue a request for the next batch."""
+        request = _Request(pull_only, message, paths)
+        with self._cond:
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append(request)
+            self.requests += 1
+            self._cond.notify_all()
+        return request
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Let more requests join until the window closes
+                while not self._stopping:
+                    remaining = self._first_pending_at + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_Request]) -> None:
+        from agenttree.agents_repo import _sync_inline
+
+        pull_only = all(r.pull_only for r in batch)
+        messages = list(dict.fromkeys(r.message for r in batch if r.message))
+        if len(messages) > 1:
+            message: Optional[str] = f"Auto-sync: {len(messages)} updates\n\n" + "\n".join(messages)
+        else:
+            message = messages[0] if messages else None
+
+        # Commit only the writers' registered files (plus any a failed batch
+        # left behind), unless one wants everything
+        writers = [r for r in batch if not r.pull_only]
+        paths: Optional[list[str]] = None
+        if writers and all(r.paths is not None for r in writers):
+            paths = sorted({p for r in writers for p in r.paths or ()} | self._unsynced)
+
+        self.batches += 1
+        try:
+            # Readers were promised a fresh pull, so the batch can't reuse
+            # a recent one
+            result = _sync_inline(
+                self.agents_dir,
+                pull_only=pull_only,
+                commit_message=message,
+                paths=paths,
+                fresh=any(r.pull_only for r in batch),
+            )
+        except Exception as e:
+            log.warning("Sync batch failed: %s", e)
+            result = False
+        log.debug("Sync batch of %d request(s): %s", len(batch), result)
+        if result:
+            self._unsynced.clear()
+        else:
+            self._unsynced.update(p for r in writers for p in r.paths or ())
+        for request in batch:
+            request.finish(result)
+
+
+def _ping(socket_path: Path) -> bool:
+    """True if a service is accepting connections on socket_path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+_service: Optional[SyncService] = None
+
+
+def request_sync(
+    agents_dir: Path,
+    pull_only: bool,
+    commit_message: Optional[str] = None,
+    paths: Optional[list[str]] = None,
+) -> Optional[bool]:
+    """Hand a sync to the running service, if there is one.
+
+    Writers return as soon as their commit intent is queued; readers wait
+    for a pull that started after the request.
+
+    Args:
+        agents_dir: Path to _agenttree directory
+        pull_only: True for read syncs
+        commit_message: Commit message for write syncs
+        paths: Files to commit (relative to agents_dir), or None for all
+
+    Returns:
+        The sync result (True for a queued write), or None if no service is
+        available and the caller should sync inline
+    """
+    service = _service
+    if service is not None and service.agents_dir == agents_dir:
+        request = service.submit(pull_only, commit_message, paths)
+        if not pull_only:
+            return True
+        return request.done.wait(REQUEST_TIMEOUT) and request.result
+
+    socket_path = agents_dir / SOCKET_NAME
+    if not socket_path.exists():
+        return None
+
+    payload: dict[str, Any] = {
+        "pull_only": pull_only, "message": commit_message, "paths": paths, "wait": pull_only,
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(REQUEST_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None  # stale socket, nobody listening
+
+    try:
+        with sock, sock.makefile("rwb") as f:
+            f.write(json.dumps(payload).encode() + b"\n")
+            f.flush()
+            line = f.readline()
+        return bool(json.loads(line)["ok"])
+    except (OSError, ValueError, KeyError) as e:
+        # The request reached the service, so don't also sync inline
+        log.warning("Sync service request failed: %s", e)
+        return False
+
+
+def start_sync_service(agents_dir: Path, debounce: float = DEFAULT_DEBOUNCE) -> Optional[SyncService]:
+    """Start the sync service for agents_dir in this process.
+
+    Returns:
+        The running service, or None if agents_dir isn't a git repo or
+        another process already runs the service
+    """
+    global _service
+
+    stop_sync_service()
+    if not (agents_dir / ".git").exists():
+        return None
+    service = SyncService(agents_dir, debounce)
+    if not service.start():
+        return None
+    _service = service
+    log.info("Sync service listening on %s", service.socket_path)
+    return service
+
+
+def stop_sync_service() -> None:
+    """Stop the service; callers go back to syncing inline."""
+    global _service
+
+    if _service is None:
+        return
+    service, _service = _service, None
+    service.stop()
@@ -260,6 +260,8 @@ def save_tmux_history_to_file(session_name: str, output_path: Path, stage: str)
     """Save tmux session history to a file with timestamp header.
 
     Captures the full scrollback buffer and appends it to the output file.
+    Inside _agenttree the transcript goes to the blob store and the issue
+    directory gets a pointer (see agenttree.blob_store).
 
     Args:
         session_name: Name of the tmux session
@@ -297,14 +299,9 @@ def save_tmux_history_to_file(session_name: str, output_path: Path, stage: str)
     header += f"Captured: {timestamp}\n"
     header += f"{'='*60}\n\n"
 
-    # Ensure parent directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Append to file
-    with open(output_path, "a") as f:
-        f.write(header)
-        f.write(history)
-        f.write("\n")
+    # Append to the transcript (kept in the blob store, out of git)
+    from agenttree.blob_store import write_artifact
+    write_artifact(output_path.parent, output_path.name, header + history + "\n", append=True)
 
     return True
 
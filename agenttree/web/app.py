@@ -17,7 +17,7 @@ import subprocess
 import secrets
 import os
 import re
-from typing import Optional, AsyncIterator, Callable, Awaitable
+from typing import Any, Optional, AsyncIterator, Callable, Awaitable
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 import yaml
@@ -27,6 +27,7 @@ import hashlib
 from agenttree import __version__
 from agenttree.config import load_config, Config
 from agenttree.worktree import WorktreeManager
+from agenttree.heartbeat import HeartbeatStats, run_heartbeat
 from agenttree.hooks import get_repo_remote_name
 
 # Load config once at module level - server reload on .agenttree.yaml changes
@@ -91,10 +92,12 @@ BASE_DIR = Path(__file__).resolve().parent
 # Background heartbeat task handle
 _heartbeat_task: Optional[asyncio.Task] = None
 _heartbeat_count: int = 0
+_heartbeat_stats: Optional[HeartbeatStats] = None
 
 # Dedicated executor for heartbeat so it never competes with request handlers.
 # Heartbeat actions (sync, check_ci, check_stalled) can take 10-15s and would
 # starve asyncio.to_thread() calls in request handlers if sharing the default pool.
+# One tick at a time; fire_event() runs the tick's actions on its own pool.
 from concurrent.futures import ThreadPoolExecutor
 _heartbeat_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="heartbeat")
 
@@ -108,26 +111,45 @@ async def heartbeat_loop(interval: int = 10) -> None:
     - check_ci_status: Check GitHub CI status
     - check_merged_prs: Detect externally merged PRs
 
-    Actions are configured in .agenttree.yaml under on.heartbeat.
+    Actions are configured in .agenttree.yaml under on.heartbeat. Ticks
+    start on fixed interval boundaries; a tick that overruns skips the
+    boundaries it missed (see agenttree.heartbeat).
 
     Args:
         interval: Seconds between heartbeats (default: 10)
     """
-    global _heartbeat_count
-    from agenttree.events import fire_event, HEARTBEAT
+    global _heartbeat_stats
+    from agenttree.events import (
+        HEARTBEAT,
+        fire_event,
+        get_state_checkpoint_interval,
+        start_event_state_store,
+        stop_event_state_store,
+    )
+    from agenttree.stage_events import start_stage_event_dispatcher, stop_stage_event_dispatcher
 
     agents_dir = Path.cwd() / "_agenttree"
+    _heartbeat_stats = HeartbeatStats(interval)
+
+    async def tick() -> None:
+        global _heartbeat_count
+        _heartbeat_count += 1
+        count = _heartbeat_count
+        await asyncio.get_event_loop().run_in_executor(
+            _heartbeat_executor,
+            lambda: fire_event(HEARTBEAT, agents_dir, heartbeat_count=count)
+        )
 
-    while True:
-        try:
-            _heartbeat_count += 1
-            await asyncio.get_event_loop().run_in_executor(
-                _heartbeat_executor,
-                lambda: fire_event(HEARTBEAT, agents_dir, heartbeat_count=_heartbeat_count)
-            )
-        except Exception as e:
-            logger.error("Heartbeat error: %s", e)
-        await asyncio.sleep(interval)
+    # Keep heartbeat state in memory rather than re-reading and rewriting
+    # .heartbeat_state.yaml every tick
+    start_event_state_store(agents_dir, get_state_checkpoint_interval())
+    # React to stage changes as they happen; the heartbeat scans are the safety net
+    start_stage_event_dispatcher(agents_dir)
+    try:
+        await run_heartbeat(tick, interval, _heartbeat_stats)
+    finally:
+        stop_stage_event_dispatcher()
+        stop_event_state_store()
 
 
 @asynccontextmanager
@@ -147,6 +169,23 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     _heartbeat_task = asyncio.create_task(heartbeat_loop(interval))
     console.print(f"[green]✓ Started heartbeat events (every {interval}s)[/green]")
 
+    # Keep the issue cache current from filesystem events instead of
+    # stat()ing every issue on each request and heartbeat action
+    from agenttree.issue_watcher import start_issue_watcher, stop_issue_watcher
+    watcher = start_issue_watcher(issue_crud.get_issues_path())
+    if watcher:
+        console.print(f"[green]✓ Watching issues ({type(watcher).__name__})[/green]")
+
+    # Batch sync_agents_repo() calls from all host processes into shared git runs
+    from agenttree.sync_service import start_sync_service, stop_sync_service
+    if start_sync_service(issue_crud.get_agenttree_path()):
+        console.print("[green]✓ Started sync service[/green]")
+
+    # Push _agenttree commits in the background, retrying with backoff
+    from agenttree.push_queue import start_push_worker, stop_push_worker
+    if start_push_worker(issue_crud.get_agenttree_path()):
+        console.print("[green]✓ Started push worker[/green]")
+
     # Auto-start manager if not running (fallback for direct server start)
     from agenttree.tmux import session_exists
     config = load_config()
@@ -165,6 +204,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     yield  # Server runs here
 
     # Cleanup on shutdown
+    stop_sync_service()
+    stop_push_worker()
+    stop_issue_watcher()
     if _heartbeat_task:
         _heartbeat_task.cancel()
         try:
@@ -350,8 +392,8 @@ def convert_issue_to_web(issue: issue_crud.Issue, load_dependents: bool = False)
 
     # Calculate time in current stage from history
     time_in_stage = "0m"
-    if issue.history:
-        last_entry = issue.history[-1]
+    last_entry = issue.last_history
+    if last_entry:
         stage_entered = datetime.fromisoformat(last_entry.timestamp.replace("Z", "+00:00"))
         if stage_entered.tzinfo is None:
             stage_entered = stage_entered.replace(tzinfo=timezone.utc)
@@ -1536,8 +1578,40 @@ async def rebase_issue(
 
 @app.get("/health")
 async def health_check() -> dict:
-    """Health check endpoint."""
-    return {"status": "healthy", "service": "agenttree-web"}
+    """Health check endpoint, with heartbeat tick statistics once it's running."""
+    health: dict[str, Any] = {"status": "healthy", "service": "agenttree-web"}
+    if _heartbeat_stats is not None:
+        health["heartbeat"] = _heartbeat_stats.snapshot()
+    return health
+
+
+@app.get("/api/sync-status")
+async def get_sync_status(user: Optional[str] = Depends(get_current_user)) -> dict:
+    """Push queue status for _agenttree (see agenttree.push_queue).
+
+    Returns:
+        {"depth": int, "oldest_age_s": float | None, "attempts": int,
+         "next_attempt_in_s": float | None, "last_error": str | None}
+    """
+    from agenttree.push_queue import queue_status
+    return await asyncio.to_thread(queue_status, issue_crud.get_agenttree_path())
+
+
+@app.get("/sync-status", response_class=HTMLResponse)
+async def sync_status_badge(
+    request: Request, user: Optional[str] = Depends(get_current_user)
+) -> HTMLResponse:
+    """Header badge showing unpushed _agenttree commits (empty when in sync)."""
+    status = await get_sync_status(user)
+    oldest = status["oldest_age_s"]
+    return templates.TemplateResponse(
+        request,
+        "partials/sync_status.html",
+        {
+            "status": status,
+            "oldest_age": format_duration(int(oldest // 60)) if oldest is not None else "",
+        },
+    )
 
 
 # =============================================================================
@@ -118,10 +118,10 @@ def convert_issue_to_web(
 
     # Calculate time in current stage from history
     time_in_stage = "0m"
-    if issue.history:
+    last_entry = issue.last_history
+    if last_entry:
         from datetime import timezone
 
-        last_entry = issue.history[-1]
         try:
             # Handle both ISO format with and without timezone
             ts = last_entry.timestamp.replace("Z", "+00:00")
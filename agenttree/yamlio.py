@@ -0,0 +1,118 @@
+"""YAML load/dump for AgentTree state files, backed by libyaml when available.
+
+PyYAML ships optional C bindings (CSafeLoader/CSafeDumper) that parse and
+emit several times faster than the pure-Python implementation. They are not
+always installed (e.g. wheels built without libyaml), so every caller goes
+through yaml_load()/yaml_dump() here and gets the fastest available backend.
+
+Output stays byte-identical to `yaml.dump(..., default_flow_style=False)`
+so that issue.yaml diffs in _agenttree don't churn when the backend changes.
+The libyaml emitter wraps long double-quoted strings and lays out complex
+keys differently from the Python emitter, so the C dumper is only used for
+"plain" documents (see _is_plain); anything else uses the Python dumper.
+"""
+
+from typing import IO, Any, overload
+
+import yaml
+
+HAS_LIBYAML: bool = bool(getattr(yaml, "__with_libyaml__", False))
+
+if HAS_LIBYAML:
+    _FastLoader: type = yaml.CSafeLoader
+    _FastDumper: type | None = yaml.CSafeDumper
+else:
+    _FastLoader = yaml.SafeLoader
+    _FastDumper = None
+
+# Keys this long are emitted as "? key" complex keys, and the two emitters
+# disagree on the layout.
+_MAX_PLAIN_KEY_LEN = 128
+
+
+def yaml_load(stream: str | bytes | IO[str] | IO[bytes]) -> Any:
+    """Parse a YAML document with safe semantics (like yaml.safe_load).
+
+    Args:
+        stream: YAML text, bytes, or an open file
+
+    Returns:
+        Parsed YAML content
+
+    Raises:
+        yaml.YAMLError: If the document is invalid
+    """
+    return yaml.load(stream, Loader=_FastLoader)
+
+
+@overload
+def yaml_dump(data: Any, stream: None = None, sort_keys: bool = False) -> str: ...
+
+
+@overload
+def yaml_dump(data: Any, stream: IO[str], sort_keys: bool = False) -> None: ...
+
+
+def yaml_dump(data: Any, stream: IO[str] | None = None, sort_keys: bool = False) -> str | None:
+    """Serialize data to block-style YAML.
+
+    Produces the same bytes as
+    `yaml.dump(data, default_flow_style=False, sort_keys=sort_keys)`.
+
+    Args:
+        data: Object to serialize
+        stream: Optional file to write to
+        sort_keys: Sort mapping keys (PyYAML's default is True; ours is False)
+
+    Returns:
+        The YAML text, or None if written to stream
+    """
+    dumper = _FastDumper if _FastDumper is not None and _is_plain(data) else yaml.Dumper
+    result: str | None = yaml.dump(
+        data, stream, Dumper=dumper, default_flow_style=False, sort_keys=sort_keys
+    )
+    return result
+
+
+def _is_plain_str(s: str, max_len: int | None = None) -> bool:
+    """True for printable ASCII strings the C emitter renders identically."""
+    return s.isascii() and s.isprintable() and (max_len is None or len(s) < max_len)
+
+
+def _is_plain(data: Any) -> bool:
+    """Check that both emitters produce identical output for data.
+
+    Plain means: only dict/list/str/int/float/bool/None (exact types, so
+    enums and other subclasses take the Python path), strings that are
+    printable ASCII (no newlines, tabs, or escapes that trigger double-quoted
+    wrapping), non-empty keys shorter than _MAX_PLAIN_KEY_LEN, and no shared
+    containers (which would be emitted as anchors).
+    """
+    stack = [data]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        kind = type(node)
+        if kind is str:
+            if not _is_plain_str(node):
+                return False
+        elif kind is dict:
+            if id(node) in seen:
+                return False
+            seen.add(id(node))
+            for key, value in node.items():
+                key_kind = type(key)
+                if key_kind is str:
+                    if not key or not _is_plain_str(key, _MAX_PLAIN_KEY_LEN):
+                        return False
+                elif key_kind not in (int, bool):
+                    return False
+                stack.append(value)
+        elif kind is list:
+            if id(node) in seen:
+                return False
+            seen.add(id(node))
+            stack.extend(node)
+        elif node is not None and kind not in (int, float, bool):
+            return False
+    return True
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Compare pure-Python PyYAML against the libyaml-backed agenttree.yamlio.
+
+Usage:
+    python scripts/bench_yaml.py                      # synthetic issues
+    python scripts/bench_yaml.py _agenttree/issues    # real issue.yaml files
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agenttree.yamlio import HAS_LIBYAML, yaml_dump, yaml_load  # noqa: E402
+
+
+def synthetic_issues(count: int, history_len: int) -> list[str]:
+    docs = []
+    for i in range(1, count + 1):
+        data = {
+            "id": i,
+            "slug": f"issue-{i}",
+            "title": f"Issue number {i} with a reasonably descriptive title",
+            "created": "2025-01-01T00:00:00Z",
+            "updated": "2025-01-02T00:00:00Z",
+            "stage": "implement.code",
+            "priority": "medium",
+            "labels": ["backend", "perf"],
+            "dependencies": [max(1, i - 1)],
+            "history": [
+                {
+                    "stage": f"stage-{h}",
+                    "timestamp": "2025-01-01T00:00:00Z",
+                    "agent": h % 3,
+                    "type": "transition",
+                }
+                for h in range(history_len)
+            ],
+        }
+        docs.append(yaml.dump(data, default_flow_style=False, sort_keys=False))
+    return docs
+
+
+def load_dir(path: Path) -> list[str]:
+    return [p.read_text() for p in sorted(path.glob("*/issue.yaml"))]
+
+
+def timed(label: str, fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"  {label:<28} {elapsed * 1000:8.1f} ms")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("issues_dir", nargs="?", type=Path, help="directory of <id>/issue.yaml")
+    parser.add_argument("--count", type=int, default=146, help="synthetic issue count")
+    parser.add_argument("--history", type=int, default=20, help="history entries per issue")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = load_dir(args.issues_dir) if args.issues_dir else synthetic_issues(args.count, args.history)
+    if not docs:
+        print("No issue.yaml files found", file=sys.stderr)
+        return 1
+    parsed = [yaml.safe_load(d) for d in docs]
+
+    print(f"{len(docs)} documents, libyaml {'available' if HAS_LIBYAML else 'NOT available'}")
+    print("load:")
+    py_load = timed("yaml.safe_load", lambda: [yaml.safe_load(d) for d in docs], args.rounds)
+    c_load = timed("yamlio.yaml_load", lambda: [yaml_load(d) for d in docs], args.rounds)
+    print("dump:")
+    py_dump = timed(
+        "yaml.dump",
+        lambda: [yaml.dump(p, default_flow_style=False, sort_keys=False) for p in parsed],
+        args.rounds,
+    )
+    c_dump = timed("yamlio.yaml_dump", lambda: [yaml_dump(p) for p in parsed], args.rounds)
+
+    mismatches = sum(
+        yaml_dump(p) != yaml.dump(p, default_flow_style=False, sort_keys=False) for p in parsed
+    )
+    print(f"speedup: load {py_load / c_load:.1f}x, dump {py_dump / c_dump:.1f}x")
+    print(f"byte-identical dumps: {len(parsed) - mismatches}/{len(parsed)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,18 @@ def simulate_container_environment(monkeypatch):
     monkeypatch.setenv("AGENTTREE_CONTAINER", "1")
 
 
+@pytest.fixture(autouse=True)
+def subprocess_git_backend(monkeypatch):
+    """Use the git CLI backend so tests that mock subprocess.run see every call."""
+    monkeypatch.setenv("AGENTTREE_GIT_BACKEND", "subprocess")
+
+
+@pytest.fixture(autouse=True)
+def inline_push(monkeypatch):
+    """Push during the sync instead of from a background process."""
+    monkeypatch.setenv("AGENTTREE_PUSH_MODE", "inline")
+
+
 @pytest.fixture(autouse=True)
 def _clear_module_caches():
     """Clear module-level caches between tests to prevent cross-test pollution."""
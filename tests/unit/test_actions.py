@@ -106,6 +106,74 @@ class TestBuiltinActions:
         # Should not run git commands
         mock_run.assert_not_called()
 
+    def test_sync_goes_through_sync_service(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """sync hands the pull to a running sync service instead of running git."""
+        from agenttree.sync_service import SyncService
+
+        agents_dir = tmp_path / "_agenttree"
+        (agents_dir / ".git").mkdir(parents=True)
+        calls = []
+
+        def fake_sync(agents_dir, pull_only=False, commit_message=None, wait=None, paths=None, fresh=False):
+            calls.append((pull_only, fresh))
+            return True
+
+        monkeypatch.setattr("agenttree.agents_repo._sync_inline", fake_sync)
+        monkeypatch.setattr("agenttree.environment.is_running_in_container", lambda: False)
+        service = SyncService(agents_dir, debounce=0.01)
+        assert service.start()
+        try:
+            action = get_action("sync")
+            assert action is not None
+            action(agents_dir)
+        finally:
+            service.stop()
+
+        assert calls == [(True, True)]
+        assert service.batches == 1
+
+    def test_heartbeat_sync_skips_pull_when_upstream_unchanged(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A heartbeat tick probes the remote with ls-remote instead of pulling."""
+        import subprocess
+        from agenttree.events import HEARTBEAT, fire_event
+
+        monkeypatch.setattr("agenttree.agents_repo._last_remote_check", {})
+        monkeypatch.setattr("agenttree.environment.is_running_in_container", lambda: False)
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        seed = tmp_path / "seed"
+        subprocess.run(["git", "clone", "-q", str(remote), str(seed)], check=True, capture_output=True)
+        (seed / "README.md").write_text("hi\n")
+        for args in (["add", "-A"], ["-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", "init"],
+                     ["push", "-q", "origin", "HEAD"]):
+            subprocess.run(["git", "-C", str(seed), *args], check=True, capture_output=True)
+        agents_dir = tmp_path / "_agenttree"
+        subprocess.run(["git", "clone", "-q", str(remote), str(agents_dir)], check=True, capture_output=True)
+        for key, value in (("user.email", "t@example.com"), ("user.name", "t")):
+            subprocess.run(["git", "-C", str(agents_dir), "config", key, value], check=True)
+
+        commands: list[str] = []
+        real_run = subprocess.run
+
+        def recording_run(cmd, *args, **kwargs):
+            if cmd[0] == "git":
+                commands.append(cmd[3])
+            return real_run(cmd, *args, **kwargs)
+
+        config = MagicMock()
+        config.model_dump.return_value = {"on": {"heartbeat": {"actions": ["sync"]}}}
+        with patch("agenttree.config.load_config", return_value=config), \
+                patch("agenttree.agents_repo.subprocess.run", side_effect=recording_run):
+            results = fire_event(HEARTBEAT, agents_dir, heartbeat_count=1)
+
+        assert results["actions_run"] == 1
+        assert "ls-remote" in commands
+        assert "pull" not in commands
+
     @patch("agenttree.agents_repo.check_ci_status")
     def test_check_ci_status_delegates(
         self, mock_check: MagicMock, tmp_path: Path
@@ -117,7 +185,7 @@ class TestBuiltinActions:
         assert action is not None
         action(tmp_path)
         
-        mock_check.assert_called_once_with(tmp_path)
+        mock_check.assert_called_once_with(tmp_path, cancel=None, snapshot=None)
 
     @patch("agenttree.agents_repo.check_merged_prs")
     def test_check_merged_prs_delegates(
@@ -130,7 +198,7 @@ class TestBuiltinActions:
         assert action is not None
         action(tmp_path)
         
-        mock_check.assert_called_once_with(tmp_path)
+        mock_check.assert_called_once_with(tmp_path, snapshot=None)
 
 
 class TestDefaultEventConfigs:
@@ -208,7 +276,7 @@ class TestCheckStalledAgents:
         history_entry.timestamp = self._timestamp_ago(minutes_ago)
         issue = MagicMock(
             id=issue_id, title="Test Issue", stage=stage,
-            history=[history_entry],
+            last_history=history_entry,
         )
         return issue
 
@@ -224,7 +292,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_first_stall_notifies_manager(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -251,7 +319,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_not_renotified_too_soon(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -280,7 +348,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_renotifies_at_next_threshold(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -313,7 +381,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_stops_after_max_notifications(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -341,7 +409,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_resets_on_stage_change(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -374,7 +442,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_skips_parking_lot_stages(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -394,7 +462,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_skips_manager_stages(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -414,7 +482,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_role_aware_session_check(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -435,7 +503,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists", return_value=True)
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_running_agent_starts_count_at_one(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -458,7 +526,7 @@ class TestCheckStalledAgents:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists", return_value=True)
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_running_agent_not_rapid_fire(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -485,7 +553,7 @@ class TestCheckStalledAgents:
     @patch("agenttree.events.save_event_state")
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.issues.list_issue_summaries")
     @patch("agenttree.config.load_config")
     def test_shared_event_state_modifies_in_place_skips_save(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -510,3 +578,27 @@ class TestCheckStalledAgents:
 
         # Should NOT have called save_event_state (dispatcher does it)
         mock_save.assert_not_called()
+
+    @patch("agenttree.tmux.send_message", return_value="sent")
+    @patch("agenttree.tmux.session_exists", return_value=True)
+    @patch("agenttree.issues.list_issue_summaries")
+    @patch("agenttree.config.load_config")
+    def test_prunes_entries_for_gone_or_moved_issues(
+        self, mock_load_config: MagicMock, mock_list: MagicMock,
+        mock_exists: MagicMock, mock_send: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Entries for deleted issues or stages the issue has left are dropped."""
+        mock_load_config.return_value = self._make_config()
+        mock_list.return_value = [
+            self._make_issue("042", minutes_ago=1),
+            self._make_issue("043", stage="implement.review", minutes_ago=1),
+        ]
+        entry = {"stage": "implement.code", "count": 1, "last_at": self._timestamp_ago(5)}
+        shared_state: dict[str, Any] = {
+            "stall_notifications": {"042": entry, "043": entry, "007": entry},
+        }
+
+        check_stalled_agents(tmp_path, threshold_min=10, _event_state=shared_state)
+
+        assert shared_state["stall_notifications"] == {"042": entry}
@@ -1,11 +1,13 @@
 """Tests for agents repository management."""
 
 import subprocess
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import pytest
 
-from agenttree.agents_repo import AgentsRepository, sync_agents_repo
+from agenttree import agents_repo as agents_repo_mod
+from agenttree.agents_repo import AgentsRepository, pulled_paths, sync_agents_repo
 
 
 @pytest.fixture
@@ -269,17 +271,20 @@ class TestSyncAgentsRepo:
         """Test sync with pull_only=True succeeds."""
         # Mock responses for: status --porcelain (no changes), pull
         mock_run.side_effect = [
+            Mock(returncode=128, stdout=""),  # rev-parse @{u} (no upstream: full pull)
             Mock(returncode=0, stdout=""),  # status --porcelain (empty = no changes)
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # pull --no-rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
         ]
 
         result = sync_agents_repo(git_repo, pull_only=True)
 
         assert result is True
-        # Calls: status, pull
-        assert mock_run.call_count == 2
-        # Verify pull was called (at index 1: status, pull)
-        pull_call = mock_run.call_args_list[1][0][0]
+        # Calls: upstream probe, status, rev-parse, pull, rev-parse (no diff: HEAD unchanged)
+        assert mock_run.call_count == 5
+        # Verify pull was called (at index 3: probe, status, rev-parse, pull)
+        pull_call = mock_run.call_args_list[3][0][0]
         assert "pull" in pull_call
         assert "--no-rebase" in pull_call
 
@@ -288,7 +293,9 @@ class TestSyncAgentsRepo:
         """Test sync returns False when offline."""
         # Mock responses for: status --porcelain (no changes), pull (fails offline)
         mock_run.side_effect = [
+            Mock(returncode=128, stdout=""),  # rev-parse @{u} (no upstream: full pull)
             Mock(returncode=0, stdout=""),  # status --porcelain (empty = no changes)
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=1, stderr="Could not resolve host: github.com"),  # pull
         ]
 
@@ -301,7 +308,9 @@ class TestSyncAgentsRepo:
         """Test sync returns False when no remote configured."""
         # Mock responses for: status --porcelain (no changes), pull (fails no remote)
         mock_run.side_effect = [
+            Mock(returncode=128, stdout=""),  # rev-parse @{u} (no upstream: full pull)
             Mock(returncode=0, stdout=""),  # status --porcelain (empty = no changes)
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=1, stderr="fatal: no remote"),  # pull
         ]
 
@@ -315,8 +324,11 @@ class TestSyncAgentsRepo:
         import logging
         # Mock responses for: status --porcelain (no changes), pull (conflict)
         mock_run.side_effect = [
+            Mock(returncode=128, stdout=""),  # rev-parse @{u} (no upstream: full pull)
             Mock(returncode=0, stdout=""),  # status --porcelain (empty = no changes)
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=1, stderr="CONFLICT (content): Merge conflict in file.txt"),  # pull
+            Mock(returncode=0),  # merge --abort
         ]
 
         with caplog.at_level(logging.WARNING):
@@ -331,12 +343,14 @@ class TestSyncAgentsRepo:
     @patch("agenttree.agents_repo.subprocess.run")
     def test_sync_write_commits_and_pushes(self, mock_run, mock_push_pending, mock_check_manager, mock_check_merged, git_repo):
         """Test sync with write commits and pushes changes."""
-        # Mock responses for: status --porcelain (has changes), add, commit, pull, push
+        # Mock responses for: status --porcelain (has changes), add, commit, rev-parse, pull, rev-parse, push
         mock_run.side_effect = [
             Mock(returncode=0, stdout="M some_file.yaml"),  # status --porcelain (has changes)
             Mock(returncode=0),  # add -A
             Mock(returncode=0, stderr=""),  # commit
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # pull --no-rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # push
         ]
 
@@ -347,9 +361,9 @@ class TestSyncAgentsRepo:
         )
 
         assert result is True
-        assert mock_run.call_count == 5
+        assert mock_run.call_count == 7
 
-        # Verify commit message (commit is at index 2: status, add, commit, pull, push)
+        # Verify commit message (commit is at index 2: status, add, commit, ...)
         commit_call = mock_run.call_args_list[2]
         assert "commit" in commit_call[0][0]
         assert "Test commit" in commit_call[0][0]
@@ -360,27 +374,31 @@ class TestSyncAgentsRepo:
     @patch("agenttree.agents_repo.subprocess.run")
     def test_sync_write_no_changes(self, mock_run, mock_push_pending, mock_check_manager, mock_check_merged, git_repo):
         """Test sync with write but no changes to commit."""
-        # Mock responses for: status --porcelain (no changes), pull, push
+        # Mock responses for: status --porcelain (no changes), rev-parse, pull, rev-parse, push
         mock_run.side_effect = [
             Mock(returncode=0, stdout=""),  # status --porcelain (empty = no changes)
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # pull --no-rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # push
         ]
 
         result = sync_agents_repo(git_repo, pull_only=False)
 
         assert result is True
-        assert mock_run.call_count == 3  # status, pull, push (no commit since no changes)
+        assert mock_run.call_count == 5  # status, rev-parse, pull, rev-parse, push (no commit)
 
     @patch("agenttree.agents_repo.subprocess.run")
     def test_sync_write_push_offline(self, mock_run, git_repo, caplog):
         """Test sync handles offline push gracefully."""
         import logging
         mock_run.side_effect = [
+            Mock(returncode=0, stdout="M some_file.yaml"),  # status --porcelain (has changes)
             Mock(returncode=0),  # add -A
-            Mock(returncode=1),  # diff (has changes)
             Mock(returncode=0, stderr=""),  # commit
-            Mock(returncode=0, stderr=""),  # pull --rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
+            Mock(returncode=0, stderr=""),  # pull --no-rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=1, stderr="Could not resolve host"),  # push fails
         ]
 
@@ -390,6 +408,185 @@ class TestSyncAgentsRepo:
         assert result is False
         assert any("offline" in record.message.lower() for record in caplog.records)
 
+    def test_pull_evicts_only_changed_paths(self, tmp_path, monkeypatch):
+        """A real pull reports its changed paths; a no-op pull reports none."""
+        monkeypatch.setattr("agenttree.agents_repo._last_remote_check", {})
+        def git(cwd, *args):
+            subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True)
+
+        remote = tmp_path / "remote.git"
+        git(tmp_path, "init", "-q", "--bare", str(remote))
+        upstream = tmp_path / "upstream"
+        git(tmp_path, "clone", "-q", str(remote), str(upstream))
+        git(upstream, "config", "user.email", "t@example.com")
+        git(upstream, "config", "user.name", "t")
+        (upstream / "issues" / "001").mkdir(parents=True)
+        (upstream / "issues" / "001" / "issue.yaml").write_text("id: 1\n")
+        git(upstream, "add", "-A")
+        git(upstream, "commit", "-q", "-m", "init")
+        git(upstream, "push", "-q", "origin", "HEAD")
+
+        local = tmp_path / "_agenttree"
+        git(tmp_path, "clone", "-q", str(remote), str(local))
+
+        with patch("agenttree.issues.evict_issue_paths") as evict, \
+                patch("agenttree.issues.invalidate_issues_cache") as invalidate:
+            assert sync_agents_repo(local, pull_only=True) is True
+            evict.assert_not_called()
+
+            (upstream / "issues" / "002").mkdir()
+            (upstream / "issues" / "002" / "issue.yaml").write_text("id: 2\n")
+            git(upstream, "add", "-A")
+            git(upstream, "commit", "-q", "-m", "add 002")
+            git(upstream, "push", "-q", "origin", "HEAD")
+
+            agents_repo_mod._last_remote_check.clear()  # skip the min interval
+            assert sync_agents_repo(local, pull_only=True) is True
+            evict.assert_called_once_with(local, ["issues/002/issue.yaml"])
+            invalidate.assert_not_called()
+
+    def test_pull_only_skips_merge_when_upstream_unchanged(self, tmp_path, monkeypatch):
+        """The ls-remote probe avoids the pull, and the min interval avoids the probe."""
+        monkeypatch.setattr("agenttree.agents_repo._last_remote_check", {})
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        seed = tmp_path / "seed"
+        subprocess.run(["git", "clone", "-q", str(remote), str(seed)], check=True, capture_output=True)
+        (seed / "README.md").write_text("hi\n")
+        for args in (["add", "-A"], ["-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", "init"],
+                     ["push", "-q", "origin", "HEAD"]):
+            subprocess.run(["git", "-C", str(seed), *args], check=True, capture_output=True)
+        local = tmp_path / "_agenttree"
+        subprocess.run(["git", "clone", "-q", str(remote), str(local)], check=True, capture_output=True)
+
+        commands = []
+        real_run = subprocess.run
+
+        def recording_run(cmd, *args, **kwargs):
+            commands.append(cmd[3])
+            return real_run(cmd, *args, **kwargs)
+
+        with patch("agenttree.agents_repo.subprocess.run", side_effect=recording_run):
+            assert sync_agents_repo(local, pull_only=True) is True
+            assert "ls-remote" in commands
+            assert "pull" not in commands
+
+            commands.clear()
+            assert sync_agents_repo(local, pull_only=True) is True
+            assert commands == []
+
+    def test_pull_only_commits_when_upstream_unchanged(self, tmp_path, monkeypatch):
+        """Local changes are committed even when the pull is skipped."""
+        monkeypatch.setattr("agenttree.agents_repo._last_remote_check", {})
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        seed = tmp_path / "seed"
+        subprocess.run(["git", "clone", "-q", str(remote), str(seed)], check=True, capture_output=True)
+        (seed / "README.md").write_text("hi\n")
+        for args in (["add", "-A"], ["-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", "init"],
+                     ["push", "-q", "origin", "HEAD"]):
+            subprocess.run(["git", "-C", str(seed), *args], check=True, capture_output=True)
+        local = tmp_path / "_agenttree"
+        subprocess.run(["git", "clone", "-q", str(remote), str(local)], check=True, capture_output=True)
+        for key, value in (("user.email", "t@example.com"), ("user.name", "t")):
+            subprocess.run(["git", "-C", str(local), "config", key, value], check=True)
+        (local / "notes.md").write_text("local edit\n")
+
+        assert sync_agents_repo(local, pull_only=True) is True
+
+        status = subprocess.run(
+            ["git", "-C", str(local), "status", "--porcelain"], check=True, capture_output=True, text=True
+        ).stdout
+        assert status == ""
+
+    def test_write_sync_commits_only_registered_paths(self, tmp_path, monkeypatch):
+        """Registered paths are committed and pushed; other changes stay dirty."""
+        from agenttree.agents_repo import register_touched_paths
+
+        monkeypatch.setattr("agenttree.agents_repo._touched_paths", threading.local())
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        seed = tmp_path / "seed"
+        subprocess.run(["git", "clone", "-q", str(remote), str(seed)], check=True, capture_output=True)
+        (seed / "README.md").write_text("hi\n")
+        for args in (["add", "-A"], ["-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", "init"],
+                     ["push", "-q", "origin", "HEAD"]):
+            subprocess.run(["git", "-C", str(seed), *args], check=True, capture_output=True)
+        local = tmp_path / "_agenttree"
+        subprocess.run(["git", "clone", "-q", str(remote), str(local)], check=True, capture_output=True)
+        for key, value in (("user.email", "t@example.com"), ("user.name", "t")):
+            subprocess.run(["git", "-C", str(local), "config", key, value], check=True)
+
+        issue_yaml = local / "issues" / "001" / "issue.yaml"
+        issue_yaml.parent.mkdir(parents=True)
+        issue_yaml.write_text("id: 1\n")
+        (local / "scratch.md").write_text("unregistered\n")
+        register_touched_paths(local, issue_yaml)
+
+        assert sync_agents_repo(local, commit_message="Create issue 1") is True
+
+        def git_out(*args):
+            return subprocess.run(
+                ["git", "-C", str(local), *args], check=True, capture_output=True, text=True
+            ).stdout.strip()
+
+        assert git_out("show", "--name-only", "--format=", "HEAD") == "issues/001/issue.yaml"
+        assert "?? scratch.md" in git_out("status", "--porcelain").splitlines()
+        assert git_out("rev-parse", "HEAD") == git_out("rev-parse", "@{u}")
+
+    def test_pulled_paths_unknown_head_means_everything(self, tmp_path):
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        assert pulled_paths(repo, None) == []  # empty repo: HEAD unchanged
+        assert pulled_paths(repo, "abc123") is None
+
+    def test_concurrent_writers_piggyback(self, git_repo):
+        """Writers arriving during a sync share one follow-up sync."""
+        import threading
+        import time
+
+        runs = []
+        first_started = threading.Event()
+
+        def fake_git_sync(agents_dir, pull_only, commit_message, paths=None):
+            runs.append(commit_message)
+            first_started.set()
+            time.sleep(0.2)
+            return True
+
+        with patch("agenttree.agents_repo._run_git_sync", side_effect=fake_git_sync):
+            results = []
+            first = threading.Thread(target=lambda: results.append(sync_agents_repo(git_repo, commit_message="first")))
+            first.start()
+            assert first_started.wait(2)
+
+            waiters = [
+                threading.Thread(target=lambda i=i: results.append(sync_agents_repo(git_repo, commit_message=f"w{i}")))
+                for i in range(3)
+            ]
+            for t in waiters:
+                t.start()
+            for t in [first, *waiters]:
+                t.join(5)
+
+        assert results == [True] * 4
+        assert len(runs) == 2  # the in-flight sync plus exactly one follow-up
+
+    def test_held_lock_deadline(self, git_repo):
+        """Reads skip immediately and writes give up at the deadline."""
+        import fcntl
+        import time
+
+        with open(git_repo / ".sync.lock", "w") as held, \
+                patch("agenttree.agents_repo._run_git_sync") as git_sync:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            assert sync_agents_repo(git_repo, pull_only=True) is False
+
+            start = time.monotonic()
+            assert sync_agents_repo(git_repo, commit_message="x", wait=0.3) is False
+            assert time.monotonic() - start >= 0.3
+            git_sync.assert_not_called()
+
     @patch("agenttree.agents_repo.subprocess.run")
     def test_sync_timeout(self, mock_run, git_repo, caplog):
         """Test sync handles timeout gracefully."""
@@ -406,16 +603,18 @@ class TestSyncAgentsRepo:
     def test_sync_uses_default_commit_message(self, mock_run, git_repo):
         """Test sync uses default commit message when not provided."""
         mock_run.side_effect = [
+            Mock(returncode=0, stdout="M some_file.yaml"),  # status --porcelain (has changes)
             Mock(returncode=0),  # add -A
-            Mock(returncode=1),  # diff (has changes)
             Mock(returncode=0, stderr=""),  # commit
-            Mock(returncode=0, stderr=""),  # pull --rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
+            Mock(returncode=0, stderr=""),  # pull --no-rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # push
         ]
 
         sync_agents_repo(git_repo, pull_only=False)
 
-        # commit is at index 2: add, diff, commit, pull, push
+        # commit is at index 2: status, add, commit, ...
         commit_call = mock_run.call_args_list[2]
         assert "Auto-sync: update issue data" in commit_call[0][0]
 
@@ -425,10 +624,12 @@ class TestSyncAgentsRepo:
         # Note: The current implementation doesn't check commit return code,
         # so sync continues to pull/push even if commit fails
         mock_run.side_effect = [
+            Mock(returncode=0, stdout="M some_file.yaml"),  # status --porcelain (has changes)
             Mock(returncode=0),  # add -A
-            Mock(returncode=1),  # diff (has changes)
             Mock(returncode=1, stderr="error: unable to commit"),  # commit fails
-            Mock(returncode=0, stderr=""),  # pull --rebase (continues anyway)
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
+            Mock(returncode=0, stderr=""),  # pull --no-rebase
+            Mock(returncode=0, stdout="abc123\n"),  # rev-parse HEAD
             Mock(returncode=0, stderr=""),  # push
         ]
 
@@ -436,7 +637,7 @@ class TestSyncAgentsRepo:
 
         # Sync succeeds because commit failure isn't checked
         assert result is True
-        assert mock_run.call_count == 5
+        assert mock_run.call_count == 7
 
 
 @pytest.mark.usefixtures("host_environment")
@@ -0,0 +1,131 @@
+"""Tests for compaction of finished issues (agenttree.archive)."""
+
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from agenttree.archive import (
+    compact_issues,
+    load_archive_index,
+    read_archived_file,
+    search_archive,
+)
+from agenttree.yamlio import yaml_dump
+
+NOW = datetime(2026, 3, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    """Commit messages of write syncs (no git repo in these tests)."""
+    messages = []
+    monkeypatch.setattr(
+        "agenttree.agents_repo.sync_agents_repo",
+        lambda path, **kwargs: messages.append(kwargs.get("commit_message")) or True,
+    )
+    return messages
+
+
+@pytest.fixture
+def agents_dir(tmp_path, synced):
+    project = tmp_path / "project"
+    project.mkdir()
+    shutil.copy(Path(__file__).parents[2] / ".agenttree.yaml", project)  # defines the stages
+    agents_dir = project / "_agenttree"
+    for issue_id, stage, updated in (
+        (1, "accepted", "2026-01-10T00:00:00Z"),
+        (2, "not_doing", "2026-02-01T00:00:00Z"),
+        (3, "accepted", "2026-03-14T00:00:00Z"),  # finished too recently
+        (4, "implement.code", "2025-12-01T00:00:00Z"),  # still active
+    ):
+        issue_dir = agents_dir / "issues" / f"{issue_id:03d}"
+        issue_dir.mkdir(parents=True)
+        (issue_dir / "issue.yaml").write_text(yaml_dump({
+            "id": issue_id, "slug": f"issue-{issue_id}", "title": f"Fix login {issue_id}",
+            "created": updated, "updated": updated, "stage": stage, "labels": ["auth"],
+        }))
+        (issue_dir / "spec.md").write_text(f"spec {issue_id}\n")
+    return agents_dir
+
+
+def test_dry_run_changes_nothing(agents_dir):
+    issues = compact_issues(agents_dir, max_age_days=30, dry_run=True, now=NOW)
+
+    assert [i.id for i in issues] == [1, 2]
+    assert (agents_dir / "issues" / "001").exists()
+    assert not (agents_dir / "issues" / "archive").exists()
+
+
+def test_compaction_packs_run_and_indexes(agents_dir, synced):
+    archived = compact_issues(agents_dir, max_age_days=30, now=NOW)
+
+    assert [i.id for i in archived] == [1, 2]
+    issues = agents_dir / "issues"
+    assert sorted(p.name for p in issues.iterdir()) == ["003", "004", "archive"]
+    [pack] = (issues / "archive").glob("*.tar.gz")
+    assert pack.name.startswith("2026-03-15-")
+    index = load_archive_index(agents_dir)
+    assert index[1]["pack"] == index[2]["pack"] == pack.name
+    assert read_archived_file(agents_dir, 1, "spec.md") == "spec 1\n"
+    assert synced == ["Archive 2 finished issue(s)"]
+
+
+def test_packs_are_reproducible(agents_dir, tmp_path):
+    import os
+    from agenttree.archive import _write_pack
+
+    dirs = [agents_dir / "issues" / "001", agents_dir / "issues" / "002"]
+    _write_pack(tmp_path / "a.tar.gz", dirs)
+    for path in (agents_dir / "issues").rglob("*"):
+        os.utime(path, (1_000_000, 1_000_000))
+    _write_pack(tmp_path / "b.tar.gz", dirs)
+
+    assert (tmp_path / "a.tar.gz").read_bytes() == (tmp_path / "b.tar.gz").read_bytes()
+
+
+def test_repeat_compaction_adds_pack_and_appends_index(agents_dir):
+    compact_issues(agents_dir, max_age_days=30, now=NOW)
+    archive = agents_dir / "issues" / "archive"
+    [first_pack] = archive.glob("*.tar.gz")
+    first_bytes = first_pack.read_bytes()
+    first_index = (archive / "index.jsonl").read_text()
+    issue_dir = agents_dir / "issues" / "005"
+    issue_dir.mkdir()
+    (issue_dir / "issue.yaml").write_text(yaml_dump({
+        "id": 5, "slug": "late", "title": "Late", "created": "2026-01-20T00:00:00Z",
+        "updated": "2026-01-20T00:00:00Z", "stage": "accepted",
+    }))
+
+    compact_issues(agents_dir, max_age_days=30, now=NOW)
+
+    # Earlier packs and index lines are never rewritten
+    assert first_pack.read_bytes() == first_bytes
+    assert (archive / "index.jsonl").read_text().startswith(first_index)
+    assert len(list(archive.glob("*.tar.gz"))) == 2
+    assert read_archived_file(agents_dir, 1, "spec.md") == "spec 1\n"
+    assert read_archived_file(agents_dir, 5, "issue.yaml") is not None
+    assert sorted(load_archive_index(agents_dir)) == [1, 2, 5]
+
+
+def test_search_archive(agents_dir):
+    compact_issues(agents_dir, max_age_days=30, now=NOW)
+
+    assert [e["id"] for e in search_archive(agents_dir, "LOGIN")] == [2, 1]
+    assert [e["id"] for e in search_archive(agents_dir, "auth")] == [2, 1]
+    assert search_archive(agents_dir, "billing") == []
+
+
+def test_archived_issues_reserve_ids_and_satisfy_dependencies(agents_dir, monkeypatch):
+    from agenttree.issues import _dependency_graph, _unmet_dependencies, get_next_issue_number, Issue
+    from agenttree.config import load_config
+
+    compact_issues(agents_dir, max_age_days=30, now=NOW)
+    shutil.rmtree(agents_dir / "issues" / "003")
+    shutil.rmtree(agents_dir / "issues" / "004")
+    monkeypatch.chdir(agents_dir.parent)
+
+    assert get_next_issue_number() == 3
+    issue = Issue(id=9, slug="x", title="x", created="", updated="", dependencies=[1, 2])
+    assert _unmet_dependencies(issue, _dependency_graph, load_config(agents_dir.parent)) == [2]
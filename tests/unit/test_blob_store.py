@@ -0,0 +1,98 @@
+"""Tests for the issue artifact blob store (agenttree.blob_store)."""
+
+import threading
+
+import pytest
+
+from agenttree.blob_store import (
+    BLOB_STORE_DIR,
+    BlobStore,
+    get_blob_store,
+    pointer_path,
+    read_artifact,
+    write_artifact,
+)
+from agenttree.yamlio import yaml_load
+
+
+@pytest.fixture
+def issue_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("agenttree.agents_repo._touched_paths", threading.local())
+    path = tmp_path / "_agenttree" / "issues" / "001"
+    path.mkdir(parents=True)
+    return path
+
+
+def objects(tmp_path):
+    return sorted(p for p in (tmp_path / BLOB_STORE_DIR / "objects").rglob("*") if p.is_file())
+
+
+class TestBlobStore:
+    def test_put_get_roundtrip_and_dedup(self, tmp_path):
+        store = BlobStore(tmp_path / BLOB_STORE_DIR)
+        data = b"line of scrollback\n" * 1000
+
+        digest = store.put(data)
+        assert store.put(data) == digest
+        assert store.get(digest) == data
+        assert len(objects(tmp_path)) == 1
+        assert objects(tmp_path)[0].stat().st_size < len(data) // 10
+
+    def test_missing_object(self, tmp_path):
+        with pytest.raises(KeyError):
+            BlobStore(tmp_path).get("0" * 64)
+
+
+class TestArtifacts:
+    def test_transcript_appends_segments_without_working_copy(self, tmp_path, issue_dir):
+        from agenttree.agents_repo import _take_touched_paths
+
+        write_artifact(issue_dir, "tmux_history.log", "stage one\n", append=True)
+        write_artifact(issue_dir, "tmux_history.log", "stage two\n", append=True)
+
+        assert not (issue_dir / "tmux_history.log").exists()
+        pointer = yaml_load(pointer_path(issue_dir, "tmux_history.log").read_text())
+        assert [s["size"] for s in pointer["segments"]] == [10, 10]
+        assert read_artifact(issue_dir, "tmux_history.log") == "stage one\nstage two\n"
+        assert _take_touched_paths(tmp_path / "_agenttree") == ["issues/001/tmux_history.log.blob"]
+
+    def test_legacy_transcript_folded_in(self, issue_dir):
+        (issue_dir / "tmux_history.log").write_text("old capture\n")
+
+        write_artifact(issue_dir, "tmux_history.log", "new capture\n", append=True)
+
+        assert not (issue_dir / "tmux_history.log").exists()
+        assert read_artifact(issue_dir, "tmux_history.log") == "old capture\nnew capture\n"
+
+    def test_ci_feedback_stays_in_git(self, tmp_path, issue_dir):
+        from agenttree.agents_repo import _take_touched_paths
+
+        path = write_artifact(issue_dir, "ci_feedback.md", "# CI Failure Report\n")
+
+        assert path == issue_dir / "ci_feedback.md"
+        assert path.read_text() == "# CI Failure Report\n"
+        assert not pointer_path(issue_dir, "ci_feedback.md").exists()
+        assert objects(tmp_path) == []
+        assert _take_touched_paths(tmp_path / "_agenttree") == ["issues/001/ci_feedback.md"]
+
+    def test_missing_segment_reads_as_none(self, tmp_path, issue_dir):
+        write_artifact(issue_dir, "tmux_history.log", "here\n", append=True)
+        write_artifact(issue_dir, "tmux_history.log", "elsewhere\n", append=True)
+
+        # Another host has the pointer but not every object
+        objects(tmp_path)[0].unlink()
+
+        assert read_artifact(issue_dir, "tmux_history.log") is None
+
+    def test_outside_agenttree_writes_plain_file(self, tmp_path):
+        path = write_artifact(tmp_path, "ci_feedback.md", "report\n")
+
+        assert path == tmp_path / "ci_feedback.md"
+        assert path.read_text() == "report\n"
+        assert not pointer_path(tmp_path, "ci_feedback.md").exists()
+
+    def test_missing_artifact(self, issue_dir):
+        assert read_artifact(issue_dir, "ci_feedback.md") is None
+
+    def test_store_is_beside_agenttree(self, tmp_path):
+        assert get_blob_store(tmp_path / "_agenttree").root == tmp_path / BLOB_STORE_DIR
@@ -529,6 +529,42 @@ class TestIssueListCommand:
         assert len(data) == 1
         assert data[0]["id"] == 54
 
+    def test_issue_list_json_includes_history(self, cli_runner, mock_config, tmp_path):
+        """JSON output should include the full history read from history.jsonl."""
+        import json
+        from agenttree.cli import main
+        from agenttree.issues import HISTORY_FILENAME, HistoryEntry, Issue
+
+        mock_config.agents_dir = tmp_path / "_agenttree"
+        issue_dir = mock_config.agents_dir / "issues" / "055"
+        issue_dir.mkdir(parents=True)
+        mock_config.is_parking_lot.return_value = False
+        mock_config.is_human_review.return_value = False
+        mock_config.get_flow_stage_names.return_value = ["explore.define", "implement.code"]
+
+        entries = [
+            HistoryEntry(stage="explore.define", timestamp="2026-01-01T00:00:00Z"),
+            HistoryEntry(stage="implement.code", timestamp="2026-01-02T00:00:00Z", agent=1),
+        ]
+        (issue_dir / HISTORY_FILENAME).write_text(
+            "".join(e.model_dump_json(exclude_none=True) + "\n" for e in entries)
+        )
+        # As loaded from a split issue.yaml: only the latest entry inline
+        issue = Issue(
+            id=55, title="Test Issue", stage="implement.code",
+            history=[entries[-1].model_dump()], history_count=2,
+        )
+        issue._yaml_path = issue_dir / "issue.yaml"
+
+        with patch("agenttree.cli.issues.load_config", return_value=mock_config):
+            with patch("agenttree.cli.issues.list_issues_func", return_value=[issue]):
+                result = cli_runner.invoke(main, ["issue", "list", "--json"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert [h["stage"] for h in data[0]["history"]] == ["explore.define", "implement.code"]
+        assert data[0]["history_count"] == 2
+
     def test_issue_list_empty_with_search(self, cli_runner, mock_config, tmp_path):
         """Should show appropriate message when search returns no results."""
         from agenttree.cli import main
@@ -18,6 +18,8 @@ from agenttree.events import (
     parse_action_entry,
     fire_event,
     get_heartbeat_interval,
+    start_event_state_store,
+    stop_event_state_store,
 )
 
 
@@ -49,6 +51,47 @@ class TestLoadSaveEventState:
         assert loaded == original
 
 
+class TestEventStateStore:
+    """In-memory event state with periodic checkpoints."""
+
+    @pytest.fixture(autouse=True)
+    def _stop_store(self):
+        yield
+        stop_event_state_store()
+
+    def test_load_returns_live_state_without_reading_file(self, tmp_path: Path) -> None:
+        save_event_state(tmp_path, {"sync": {"last_run_at": "2026-01-01T00:00:00Z"}})
+        start_event_state_store(tmp_path)
+        (tmp_path / ".heartbeat_state.yaml").unlink()
+
+        state = load_event_state(tmp_path)
+        state["_heartbeat_count"] = 5
+
+        assert load_event_state(tmp_path) is state
+        assert state["sync"]["last_run_at"] == "2026-01-01T00:00:00Z"
+
+    def test_saves_are_checkpointed_not_written_each_time(self, tmp_path: Path) -> None:
+        store = start_event_state_store(tmp_path, checkpoint_interval_s=3600)
+        state_file = tmp_path / ".heartbeat_state.yaml"
+
+        save_event_state(tmp_path, {"count": 1})
+        assert store.checkpoint() is False
+        assert not state_file.exists()
+
+        assert store.checkpoint(force=True) is True
+        assert yaml.safe_load(state_file.read_text()) == {"count": 1}
+        assert store.checkpoint(force=True) is False  # unchanged since
+
+    def test_stop_flushes_and_returns_to_file(self, tmp_path: Path) -> None:
+        start_event_state_store(tmp_path, checkpoint_interval_s=3600)
+        save_event_state(tmp_path, {"count": 2})
+
+        stop_event_state_store()
+
+        assert load_event_state(tmp_path) == {"count": 2}
+        assert load_event_state(tmp_path) is not load_event_state(tmp_path)
+
+
 class TestCheckActionRateLimit:
     """Tests for rate limiting logic."""
 
@@ -229,6 +272,121 @@ class TestFireEvent:
         assert len(results["errors"]) == 1
 
 
+class TestParallelHeartbeat:
+    """Heartbeat actions run concurrently with `after` ordering and deadlines."""
+
+    @pytest.fixture
+    def fire(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        from agenttree import actions, events
+
+        monkeypatch.setattr(events, "_overdue", {})
+
+        def fire(heartbeat: dict, **fns):
+            for name, fn in fns.items():
+                monkeypatch.setitem(actions.ACTION_REGISTRY, name, fn)
+            config = MagicMock()
+            config.model_dump.return_value = {"on": {"heartbeat": {"max_parallel": 4, **heartbeat}}}
+            with patch("agenttree.config.load_config", return_value=config):
+                return fire_event(HEARTBEAT, tmp_path, heartbeat_count=1)
+
+        return fire
+
+    def test_runs_in_order_unless_max_parallel_set(self, fire) -> None:
+        order: list[str] = []
+
+        def record(name: str):
+            def action(agents_dir: Path, **kwargs) -> None:
+                order.append(name)
+            return action
+
+        results = fire(
+            {"max_parallel": None, "actions": [{"check": {"after": "sync"}}, "sync"]},
+            sync=record("sync"), check=record("check"),
+        )
+
+        assert results["actions_run"] == 2
+        assert order == ["check", "sync"]
+
+    def test_default_writers_run_after_sync(self) -> None:
+        from agenttree.actions import DEFAULT_EVENT_CONFIGS
+
+        writers = {
+            "push_pending_branches", "check_manager_stages", "ensure_review_branches",
+            "check_custom_agent_stages", "check_ci_status", "check_merged_prs", "compact_archive",
+        }
+        heartbeat = DEFAULT_EVENT_CONFIGS["heartbeat"]
+        assert isinstance(heartbeat, dict)
+        entries = dict(parse_action_entry(entry) for entry in heartbeat["actions"])
+        for name in writers:
+            assert entries[name].get("after") == "sync", name
+
+    def test_wall_time_is_slowest_action(self, fire) -> None:
+        import time
+
+        def slow(agents_dir: Path, **kwargs) -> None:
+            time.sleep(0.3)
+
+        start = time.monotonic()
+        results = fire({"actions": ["a", "b", "c"]}, a=slow, b=slow, c=slow)
+
+        assert results["actions_run"] == 3
+        assert time.monotonic() - start < 0.6
+
+    def test_after_orders_actions(self, fire) -> None:
+        import time
+
+        order: list[str] = []
+
+        def record(name: str, delay: float = 0):
+            def action(agents_dir: Path, **kwargs) -> None:
+                time.sleep(delay)
+                order.append(name)
+            return action
+
+        results = fire(
+            {"actions": [{"check": {"after": "sync"}}, "sync", "other"]},
+            sync=record("sync", 0.2), check=record("check"), other=record("other"),
+        )
+
+        assert results["success"] is True
+        assert order == ["other", "sync", "check"]
+
+    def test_deadline_cancels_and_skips_until_finished(self, fire) -> None:
+        import threading
+
+        release = threading.Event()
+        cancelled: list[bool] = []
+
+        def stuck(agents_dir: Path, _cancel: threading.Event, **kwargs) -> None:
+            release.wait(5)
+            cancelled.append(_cancel.is_set())
+
+        heartbeat = {"actions": [{"stuck": {"timeout_s": 0.1}}]}
+        results = fire(heartbeat, stuck=stuck)
+        assert results["errors"] == ["stuck timed out after 0.1s"]
+
+        results = fire(heartbeat, stuck=stuck)
+        assert results["actions_skipped"] == 1
+        assert results["errors"] == []
+
+        release.set()
+        for _ in range(50):
+            if cancelled:
+                break
+            threading.Event().wait(0.01)
+        assert cancelled == [True]
+
+    def test_dependency_cycle_reported(self, fire) -> None:
+        action = MagicMock()
+        results = fire(
+            {"actions": [{"a": {"after": "b"}}, {"b": {"after": "a"}}]}, a=action, b=action
+        )
+
+        assert results["success"] is False
+        assert "Dependency cycle" in results["errors"][0]
+        action.assert_not_called()
+
+
 class TestGetHeartbeatInterval:
     """Tests for heartbeat interval configuration."""
 
@@ -0,0 +1,83 @@
+"""Tests for agenttree.fileio atomic writes and group commit."""
+
+from unittest.mock import patch
+
+from agenttree.fileio import append_text, atomic_write_text, group_commit
+
+
+class TestAtomicWriteText:
+    def test_writes_content(self, tmp_path):
+        target = tmp_path / "issue.yaml"
+        atomic_write_text(target, "id: 1\n")
+        assert target.read_text() == "id: 1\n"
+
+    def test_replaces_inode(self, tmp_path):
+        """Readers holding the old file keep seeing complete old content."""
+        target = tmp_path / "issue.yaml"
+        target.write_text("old\n")
+        with open(target) as reader:
+            atomic_write_text(target, "new\n")
+            assert reader.read() == "old\n"
+        assert target.read_text() == "new\n"
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        target = tmp_path / "issue.yaml"
+        atomic_write_text(target, "a\n")
+        atomic_write_text(target, "b\n")
+        assert [p.name for p in tmp_path.iterdir()] == ["issue.yaml"]
+
+    def test_failed_write_keeps_original(self, tmp_path):
+        target = tmp_path / "issue.yaml"
+        target.write_text("original\n")
+        with patch("agenttree.fileio.os.replace", side_effect=OSError("disk full")):
+            try:
+                atomic_write_text(target, "new\n")
+            except OSError:
+                pass
+        assert target.read_text() == "original\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["issue.yaml"]
+
+
+class TestGroupCommit:
+    def test_directory_fsyncs_deferred_to_exit(self, tmp_path):
+        a = tmp_path / "a.yaml"
+        b = tmp_path / "b.yaml"
+        with patch("agenttree.fileio.os.fsync") as fsync:
+            with group_commit():
+                for i in range(5):
+                    atomic_write_text(a, f"{i}\n")
+                atomic_write_text(b, "b\n")
+                # Data is always fsynced before the rename
+                assert fsync.call_count == 6
+            # Plus one for the shared directory
+            assert fsync.call_count == 7
+        assert a.read_text() == "4\n"
+
+    def test_data_fsynced_before_rename(self, tmp_path):
+        target = tmp_path / "a.yaml"
+        calls: list[str] = []
+        with patch("agenttree.fileio.os.fsync", side_effect=lambda fd: calls.append("fsync")), \
+                patch("agenttree.fileio.os.replace", side_effect=lambda *a: calls.append("replace")):
+            with group_commit():
+                atomic_write_text(target, "x\n")
+        assert calls[:2] == ["fsync", "replace"]
+
+    def test_appends_deferred_to_exit(self, tmp_path):
+        log = tmp_path / "history.jsonl"
+        with patch("agenttree.fileio.os.fsync") as fsync:
+            with group_commit():
+                append_text(log, "1\n")
+                append_text(log, "2\n")
+                assert fsync.call_count == 0
+            # The log once, plus its directory
+            assert fsync.call_count == 2
+        assert log.read_text() == "1\n2\n"
+
+    def test_nested_blocks_join_outer(self, tmp_path):
+        target = tmp_path / "a.yaml"
+        with patch("agenttree.fileio.os.fsync") as fsync:
+            with group_commit():
+                with group_commit():
+                    atomic_write_text(target, "x\n")
+                assert fsync.call_count == 1
+            assert fsync.call_count == 2
@@ -0,0 +1,149 @@
+"""Tests for the git backends (agenttree.git_backend)."""
+
+import subprocess
+
+import pytest
+
+from agenttree.git_backend import (
+    HAS_PYGIT2,
+    GitBackend,
+    Pygit2Backend,
+    SubprocessBackend,
+    get_git_backend,
+)
+
+BACKENDS = [
+    pytest.param(SubprocessBackend, id="subprocess"),
+    pytest.param(
+        Pygit2Backend, id="pygit2",
+        marks=pytest.mark.skipif(not HAS_PYGIT2, reason="pygit2 not installed"),
+    ),
+]
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    git(path, "config", "user.email", "t@example.com")
+    git(path, "config", "user.name", "t")
+    git(path, "config", "remote.origin.url", "git@github.com:user/repo.git")
+    (path / "a.txt").write_text("a\n")
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+@pytest.mark.parametrize("backend_cls", BACKENDS)
+class TestBackends:
+    def test_queries_match_git(self, backend_cls, repo):
+        backend = backend_cls()
+        assert backend.head(repo) == git(repo, "rev-parse", "HEAD")
+        assert backend.current_branch(repo) == "main"
+        assert backend.config_get(repo, "remote.origin.url") == "git@github.com:user/repo.git"
+        assert backend.config_get(repo, "remote.nope.url") is None
+        assert backend.is_dirty(repo) is False
+
+    def test_ahead_behind(self, backend_cls, repo):
+        git(repo, "checkout", "-q", "-b", "feature")
+        for name in ("b", "c"):
+            (repo / f"{name}.txt").write_text(name)
+            git(repo, "add", "-A")
+            git(repo, "commit", "-q", "-m", name)
+        git(repo, "checkout", "-q", "main")
+        (repo / "d.txt").write_text("d")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "d")
+        git(repo, "checkout", "-q", "feature")
+
+        backend = backend_cls()
+        assert backend.ahead_behind(repo, "HEAD", "main") == (2, 1)
+        assert backend.ahead_behind(repo, "HEAD", "no-such-branch") is None
+
+    def test_commit_all(self, backend_cls, repo):
+        (repo / "a.txt").write_text("changed\n")
+        (repo / "new.txt").write_text("new\n")
+        (repo / "gone.txt").write_text("x")
+        backend = backend_cls()
+        assert backend.is_dirty(repo) is True
+
+        assert backend.commit_all(repo, "Update issue 1") is True
+        assert backend.is_dirty(repo) is False
+        assert git(repo, "log", "-1", "--format=%s") == "Update issue 1"
+        assert git(repo, "status", "--porcelain") == ""
+        assert backend.commit_all(repo, "Nothing") is False
+
+    def test_changed_files_scoped(self, backend_cls, repo):
+        (repo / "b.txt").write_text("b\n")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "b")
+        (repo / "a.txt").write_text("changed\n")
+        (repo / "b.txt").unlink()
+        (repo / "sub").mkdir()
+        (repo / "sub" / "new.txt").write_text("new\n")
+        (repo / "other.txt").write_text("not asked about\n")
+
+        backend = backend_cls()
+        asked = ["a.txt", "b.txt", "sub/new.txt", "missing.txt"]
+        assert sorted(backend.changed_files(repo, asked)) == ["a.txt", "b.txt", "sub/new.txt"]
+        assert backend.changed_files(repo, []) == []
+
+    def test_commit_only_given_paths(self, backend_cls, repo):
+        (repo / "b.txt").write_text("b\n")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "b")
+        (repo / "a.txt").write_text("changed\n")
+        (repo / "b.txt").unlink()
+        (repo / "new.txt").write_text("new\n")
+        (repo / "other.txt").write_text("left alone\n")
+
+        backend = backend_cls()
+        assert backend.commit_all(repo, "Scoped", ["a.txt", "b.txt", "new.txt"]) is True
+        assert git(repo, "show", "--name-status", "--format=", "HEAD").splitlines() == [
+            "M\ta.txt", "D\tb.txt", "A\tnew.txt",
+        ]
+        assert git(repo, "status", "--porcelain") == "?? other.txt"
+
+    def test_not_a_repo(self, backend_cls, tmp_path):
+        backend = backend_cls()
+        assert backend.head(tmp_path) is None
+        assert backend.ahead_behind(tmp_path, "HEAD", "main") is None
+
+
+def test_incomplete_backend_fails_on_creation():
+    class HeadOnly(GitBackend):
+        def head(self, repo):
+            return None
+
+    with pytest.raises(TypeError):
+        HeadOnly()  # type: ignore[abstract]
+
+
+def test_env_selects_backend(monkeypatch):
+    monkeypatch.setenv("AGENTTREE_GIT_BACKEND", "subprocess")
+    assert isinstance(get_git_backend(), SubprocessBackend)
+    monkeypatch.setenv("AGENTTREE_GIT_BACKEND", "pygit2")
+    expected = Pygit2Backend if HAS_PYGIT2 else SubprocessBackend
+    assert isinstance(get_git_backend(), expected)
+
+
+@pytest.mark.skipif(not HAS_PYGIT2, reason="pygit2 not installed")
+def test_pygit2_failure_falls_back_with_paths(repo, monkeypatch):
+    import pygit2
+
+    (repo / "a.txt").write_text("changed\n")
+    (repo / "other.txt").write_text("left alone\n")
+    def fail(*args):
+        raise pygit2.GitError("boom")
+
+    monkeypatch.setattr(pygit2.Repository, "create_commit", fail)
+
+    assert Pygit2Backend().commit_all(repo, "Scoped", ["a.txt"]) is True
+    assert git(repo, "show", "--name-only", "--format=", "HEAD") == "a.txt"
+    assert git(repo, "status", "--porcelain") == "?? other.txt"
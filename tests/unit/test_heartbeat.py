@@ -0,0 +1,92 @@
+"""Tests for fixed-cadence heartbeat scheduling (agenttree.heartbeat)."""
+
+import asyncio
+
+import pytest
+
+from agenttree.heartbeat import HeartbeatStats, next_boundary, run_heartbeat
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def run_ticks(durations: list[float], interval: float = 10):
+    """Run the scheduler with ticks of the given durations, then stop."""
+    clock = FakeClock()
+    stats = HeartbeatStats(interval)
+    starts: list[float] = []
+    remaining = list(durations)
+
+    async def tick() -> None:
+        if not remaining:
+            raise asyncio.CancelledError
+        starts.append(clock.now - 100.0)
+        clock.now += remaining.pop(0)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run_heartbeat(tick, interval, stats, clock=clock, sleep=clock.sleep))
+    return starts, stats
+
+
+def test_next_boundary():
+    assert next_boundary(0, 10, 0, 3) == (1, 0)
+    assert next_boundary(0, 10, 0, 25) == (3, 2)
+    assert next_boundary(0, 10, 4, 41) == (5, 0)
+
+
+def test_ticks_start_on_fixed_boundaries():
+    starts, stats = run_ticks([2, 3.5, 0.5])
+
+    assert starts == [0, 10, 20]
+    assert stats.overruns == 0
+
+
+def test_overrun_skips_missed_ticks_instead_of_queuing():
+    starts, stats = run_ticks([2, 25, 1])
+
+    assert starts == [0, 10, 40]
+    snapshot = stats.snapshot()
+    assert (snapshot["overruns"], snapshot["skipped_ticks"]) == (1, 2)
+    assert snapshot["max_duration_s"] == 25
+
+
+def test_tick_errors_are_counted_and_loop_continues():
+    clock = FakeClock()
+    stats = HeartbeatStats(10)
+    calls = []
+
+    async def tick() -> None:
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run_heartbeat(tick, 10, stats, clock=clock, sleep=clock.sleep))
+
+    assert len(calls) == 2
+    assert stats.ticks == 1
+
+
+def test_histogram_is_cumulative():
+    stats = HeartbeatStats(10)
+    for duration in (0.05, 0.3, 4, 200):
+        stats.record(duration, skipped=0)
+
+    histogram = stats.snapshot()["duration_histogram"]
+
+    assert histogram["0.1"] == 1
+    assert histogram["0.5"] == 2
+    assert histogram["5"] == 3
+    assert histogram["120"] == 3
+    assert histogram["+Inf"] == 4
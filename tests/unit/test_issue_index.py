@@ -0,0 +1,153 @@
+"""Tests for the persistent issue index (agenttree.issue_index)."""
+
+import subprocess
+
+import pytest
+import yaml
+
+from agenttree.issue_index import INDEX_FILENAME, IssueIndex
+from agenttree import issues as issues_mod
+from agenttree.issues import create_issue, invalidate_issues_cache, list_issues
+
+
+@pytest.fixture
+def agents_path(monkeypatch, tmp_path):
+    """Temporary _agenttree directory with sync disabled."""
+    path = tmp_path / "_agenttree"
+    (path / "issues").mkdir(parents=True)
+    monkeypatch.setattr("agenttree.issues.get_agenttree_path", lambda: path)
+    monkeypatch.setattr("agenttree.issues.sync_agents_repo", lambda *args, **kwargs: True)
+    return path
+
+
+class TestIssueIndex:
+    def test_round_trip(self, tmp_path):
+        index = IssueIndex.open(tmp_path)
+        assert index is not None
+        index.upsert("001", (1, 2, 3), {"id": 1, "title": "A"})
+        index.close()
+
+        with IssueIndex.open(tmp_path) as index:
+            rows = index.load()
+        assert rows == {"001": ((1, 2, 3), {"id": 1, "title": "A"})}
+
+    def test_prune_removes_missing_dirs(self, tmp_path):
+        with IssueIndex.open(tmp_path) as index:
+            index.upsert("001", (1, 1, 1), {"id": 1})
+            index.upsert("002", (1, 1, 1), {"id": 2})
+            index.prune({"002"})
+        with IssueIndex.open(tmp_path) as index:
+            assert set(index.load()) == {"002"}
+
+    def test_corrupt_file_returns_none(self, tmp_path):
+        (tmp_path / INDEX_FILENAME).write_text("not a database")
+        assert IssueIndex.open(tmp_path) is None
+
+    def test_excluded_from_git(self, tmp_path):
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        IssueIndex.open(tmp_path).close()
+        exclude = (tmp_path / ".git" / "info" / "exclude").read_text()
+        assert f"{INDEX_FILENAME}*" in exclude
+
+
+class TestLoadAllIssuesWithIndex:
+    def test_cold_load_uses_index(self, agents_path, monkeypatch):
+        """A fresh process (empty memory cache) should not re-parse YAML."""
+        create_issue("First")
+        create_issue("Second", dependencies=[1])
+        warm = list_issues(sync=False)
+
+        invalidate_issues_cache()
+        monkeypatch.setattr(
+            issues_mod.Issue, "from_yaml",
+            classmethod(lambda cls, path: pytest.fail("YAML was re-parsed")),
+        )
+        cold = list_issues(sync=False)
+
+        assert cold == warm
+        assert cold[1].dependencies == [1]
+        assert cold[1]._yaml_path == warm[1]._yaml_path
+
+    def test_external_edit_invalidates_row(self, agents_path):
+        issue = create_issue("Original")
+        list_issues(sync=False)
+        invalidate_issues_cache()
+
+        yaml_path = agents_path / "issues" / issue.dir_name / "issue.yaml"
+        data = yaml.safe_load(yaml_path.read_text())
+        data["title"] = "Edited outside agenttree"
+        yaml_path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+        assert list_issues(sync=False)[0].title == "Edited outside agenttree"
+
+
+class TestListIssueSummaries:
+    def test_summary_fields(self, agents_path):
+        create_issue("First", labels=["bug"])
+        issues_mod.update_issue_stage(1, "explore.research")
+
+        [summary] = issues_mod.list_issue_summaries()
+        assert summary.id == 1
+        assert summary.title == "First"
+        assert summary.stage == "explore.research"
+        assert summary.labels == ("bug",)
+        assert summary.last_history.stage == "explore.research"
+
+    def test_cold_summaries_skip_issue_models(self, agents_path, monkeypatch):
+        """Summaries come from index rows without building Issue objects."""
+        create_issue("First")
+        create_issue("Second")
+        list_issues(sync=False)
+
+        invalidate_issues_cache()
+        monkeypatch.setattr(
+            issues_mod.Issue, "from_yaml",
+            classmethod(lambda cls, path: pytest.fail("YAML was re-parsed")),
+        )
+        monkeypatch.setattr(
+            issues_mod, "_issue_from_index",
+            lambda data, path: pytest.fail("Issue model was built"),
+        )
+        assert [s.title for s in issues_mod.list_issue_summaries()] == ["First", "Second"]
+
+    def test_unindexed_file_falls_back_to_full_load(self, agents_path):
+        issue = create_issue("Original")
+        invalidate_issues_cache()
+        (agents_path / INDEX_FILENAME).unlink(missing_ok=True)
+
+        yaml_path = agents_path / "issues" / issue.dir_name / "issue.yaml"
+        data = yaml.safe_load(yaml_path.read_text())
+        data["stage"] = "plan.draft"
+        yaml_path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+        [summary] = issues_mod.list_issue_summaries()
+        assert summary.stage == "plan.draft"
+        assert list_issues(sync=False)[0].stage == "plan.draft"
+
+
+class TestEvictIssuePaths:
+    def test_only_changed_issue_reread(self, agents_path, monkeypatch):
+        create_issue("First")
+        create_issue("Second")
+        list_issues(sync=False)
+
+        reread = []
+        original = issues_mod._load_cache_misses
+        monkeypatch.setattr(
+            issues_mod, "_load_cache_misses",
+            lambda agents, misses, *args: reread.extend(m[1].parent.name for m in misses)
+            or original(agents, misses, *args),
+        )
+        issues_mod.evict_issue_paths(agents_path, ["issues/002/issue.yaml", "README.md"])
+        assert [i.title for i in list_issues(sync=False)] == ["First", "Second"]
+        assert reread == ["002"]
+
+    def test_evicted_issue_keeps_dependency_graph_consistent(self, agents_path):
+        create_issue("First")
+        create_issue("Second", dependencies=["1"])
+        list_issues(sync=False)
+
+        issues_mod.evict_issue_paths(agents_path, ["issues/002/history.jsonl"])
+        (agents_path / "issues" / "002" / "issue.yaml").unlink()
+        list_issues(sync=False)
+        assert issues_mod.get_dependent_issues(1) == []
@@ -0,0 +1,129 @@
+"""Tests for the issue cache change feed (agenttree.issue_watcher)."""
+
+import time
+
+import pytest
+import yaml
+
+from agenttree import issues as issues_mod
+from agenttree.issue_watcher import (
+    InotifyWatcher,
+    IssueWatcher,
+    PollingWatcher,
+    start_issue_watcher,
+    stop_issue_watcher,
+)
+from agenttree.issues import create_issue, list_issues
+
+
+@pytest.fixture
+def agents_path(monkeypatch, tmp_path):
+    """Temporary _agenttree directory with sync disabled."""
+    path = tmp_path / "_agenttree"
+    (path / "issues").mkdir(parents=True)
+    monkeypatch.setattr("agenttree.issues.get_agenttree_path", lambda: path)
+    monkeypatch.setattr("agenttree.issues.sync_agents_repo", lambda *args, **kwargs: True)
+    yield path
+    stop_issue_watcher()
+
+
+def wait_for_change(watcher, timeout=3.0):
+    """Poll until the watcher has recorded a change, returning the names."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with watcher._lock:
+            if watcher._changed:
+                return set(watcher._changed)
+        time.sleep(0.02)
+    return set()
+
+
+def edit_title(yaml_path, title):
+    data = yaml.safe_load(yaml_path.read_text())
+    data["title"] = title
+    yaml_path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+class TestWatchers:
+    def test_base_watcher_is_abstract(self, agents_path):
+        with pytest.raises(TypeError):
+            IssueWatcher(agents_path / "issues")  # type: ignore[abstract]
+
+    def test_first_drain_requests_full_scan(self, agents_path):
+        watcher = PollingWatcher(agents_path / "issues", interval=0.05)
+        watcher.start()
+        try:
+            assert watcher.drain() is None
+            assert watcher.drain() == set()
+        finally:
+            watcher.stop()
+
+    def test_polling_reports_changed_dir(self, agents_path):
+        issue = create_issue("First")
+        watcher = PollingWatcher(agents_path / "issues", interval=0.05)
+        watcher.start()
+        try:
+            watcher.drain()
+            edit_title(issue.dir / "issue.yaml", "Edited")
+            assert wait_for_change(watcher) == {issue.dir_name}
+        finally:
+            watcher.stop()
+
+    def test_inotify_reports_changed_and_new_dirs(self, agents_path):
+        issue = create_issue("First")
+        watcher = InotifyWatcher.create(agents_path / "issues")
+        if watcher is None:
+            pytest.skip("inotify not available")
+        watcher.start()
+        try:
+            watcher.drain()
+            edit_title(issue.dir / "issue.yaml", "Edited")
+            assert wait_for_change(watcher) == {issue.dir_name}
+            watcher.drain()
+
+            new_dir = agents_path / "issues" / "002"
+            new_dir.mkdir()
+            assert wait_for_change(watcher) == {"002"}
+            watcher.drain()
+            (new_dir / "issue.yaml").write_text("id: 2\n")
+            assert wait_for_change(watcher) == {"002"}
+        finally:
+            watcher.stop()
+
+    def test_dead_watcher_requests_full_scan(self, agents_path):
+        watcher = PollingWatcher(agents_path / "issues", interval=0.05)
+        watcher.start()
+        watcher.drain()
+        watcher.stop()
+        assert watcher.drain() is None
+
+
+class TestListIssuesWithWatcher:
+    def test_unchanged_issues_not_restatted(self, agents_path, monkeypatch):
+        create_issue("First")
+        create_issue("Second")
+        start_issue_watcher(agents_path / "issues")
+        assert [i.title for i in list_issues(sync=False)] == ["First", "Second"]
+
+        monkeypatch.setattr(
+            issues_mod, "_scan_issue_files",
+            lambda path: pytest.fail("full stat sweep with no changes"),
+        )
+        assert [i.title for i in list_issues(sync=False)] == ["First", "Second"]
+
+    def test_external_edit_picked_up(self, agents_path):
+        issue = create_issue("First")
+        watcher = start_issue_watcher(agents_path / "issues", poll_interval=0.05)
+        list_issues(sync=False)
+
+        edit_title(issue.dir / "issue.yaml", "Edited")
+        wait_for_change(watcher)
+        assert list_issues(sync=False)[0].title == "Edited"
+
+    def test_in_process_create_visible_immediately(self, agents_path):
+        create_issue("First")
+        start_issue_watcher(agents_path / "issues")
+        list_issues(sync=False)
+
+        create_issue("Second")
+        assert [i.title for i in list_issues(sync=False)] == ["First", "Second"]
@@ -1,11 +1,14 @@
 """Tests for agenttree.issues module."""
 
 import tempfile
+import threading
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from agenttree.issues import (
+    HistoryEntry,
     Issue,
     Priority,
     slugify,
@@ -20,6 +23,7 @@ from agenttree.issues import (
     update_issue_priority,
     load_skill,
     set_processing,
+    has_conflict_markers,
     resolve_conflict_markers,
     safe_yaml_load,
 )
@@ -95,6 +99,27 @@ pr_number: null
         assert "pr_number: null" in resolved
         assert "pr_number: 42" not in resolved
 
+    def test_unterminated_conflict_left_unchanged(self):
+        """A block missing its closing marker is not a conflict to resolve."""
+        content = "id: '001'\n<<<<<<< HEAD\nstage: research\n=======\nstage: implement\n"
+        resolved, had_conflicts = resolve_conflict_markers(content)
+        assert had_conflicts is False
+        assert resolved == content
+
+    def test_marker_must_start_line(self):
+        """Marker text inside a value is not a conflict."""
+        content = "title: 'see <<<<<<< in logs'\nstage: implement\n"
+        assert has_conflict_markers(content) is False
+        assert resolve_conflict_markers(content) == (content, False)
+
+    def test_long_history_with_unterminated_marker(self):
+        """Large files resolve in linear time (the old regex backtracked)."""
+        history = "- stage: explore\n  timestamp: '2025-01-01T00:00:00Z'\n" * 20000
+        content = "<<<<<<< HEAD\nhistory:\n" + history
+        resolved, had_conflicts = resolve_conflict_markers(content)
+        assert had_conflicts is False
+        assert resolved == content
+
 
 class TestSafeYamlLoad:
     """Tests for safe_yaml_load function."""
@@ -324,6 +349,26 @@ class TestIssueCRUD:
         assert (issue_dir / "issue.yaml").exists()
         assert (issue_dir / "problem.md").exists()
 
+    def test_create_issue_registers_touched_paths(self, temp_agenttrees, monkeypatch):
+        """Write syncs commit only the files the writer touched."""
+        from agenttree.agents_repo import _take_touched_paths
+
+        monkeypatch.setattr("agenttree.agents_repo._touched_paths", threading.local())
+        synced = []
+        monkeypatch.setattr(
+            "agenttree.issues.sync_agents_repo",
+            lambda agents_dir, pull_only=False, **kwargs: pull_only or synced.append(
+                _take_touched_paths(agents_dir)
+            ),
+        )
+        create_issue("Test Issue")
+
+        assert synced == [[
+            "issues/001/history.jsonl",
+            "issues/001/issue.yaml",
+            "issues/001/problem.md",
+        ]]
+
     def test_create_multiple_issues(self, temp_agenttrees):
         issue1 = create_issue("First Issue")
         issue2 = create_issue("Second Issue")
@@ -367,6 +412,29 @@ class TestIssueCRUD:
         issue = get_issue("999")
         assert issue is None
 
+    def test_get_issue_does_not_scan_all_issues(self, temp_agenttrees, monkeypatch):
+        """Lookup by ID should only touch that issue's yaml, not walk every issue."""
+        create_issue("First")
+        create_issue("Second")
+        list_issues(sync=False)
+
+        monkeypatch.setattr(
+            "agenttree.issues._load_all_issues",
+            lambda: pytest.fail("get_issue fell back to a full scan"),
+        )
+        assert get_issue(2, sync=False).title == "Second"
+        assert get_issue(999, sync=False) is None
+
+    def test_get_issue_legacy_directory_name(self, temp_agenttrees):
+        """Issues in legacy '042-slug' directories are still found via the ID index."""
+        legacy_dir = temp_agenttrees / "issues" / "042-legacy-issue"
+        legacy_dir.mkdir()
+        (legacy_dir / "issue.yaml").write_text("id: '042'\ntitle: Legacy\n")
+
+        issue = get_issue(42, sync=False)
+        assert issue is not None
+        assert issue.title == "Legacy"
+
 
     def test_create_issue_with_custom_stage(self, temp_agenttrees):
         """Test creating an issue with a custom starting stage."""
@@ -620,6 +688,9 @@ class TestDependencies:
         data["dependencies"] = [base.id]
         with open(yaml_path, "w") as f:
             yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+        # Outside writes reach the graph as pull (or watcher) changes
+        from agenttree.issues import evict_issue_paths, get_agenttree_path
+        evict_issue_paths(get_agenttree_path(), [f"issues/{issue_dir.name}/issue.yaml"])
 
         # Get dependents - should include all stages
         dependents = get_dependent_issues(base.id)
@@ -737,6 +808,73 @@ class TestDependencies:
         issue_c = create_issue("Issue C", dependencies=[issue_b.id])
         assert issue_c.dependencies == [2]
 
+    def test_dependency_graph_updated_on_save(self, temp_agenttrees_deps):
+        """Issue.save() should update the graph without a rescan."""
+        from agenttree.issues import _get_dependency_graph, get_issue
+
+        base = create_issue("Base")
+        dependent = create_issue("Dependent", stage="backlog", dependencies=[base.id])
+        graph = _get_dependency_graph()
+        assert graph.dependents(base.id) == [dependent.id]
+
+        issue = get_issue(dependent.id, sync=False)
+        issue.dependencies = []
+        issue.stage = "accepted"
+        issue.save()
+
+        assert graph.dependents(base.id) == []
+        assert graph.stage(dependent.id) == "accepted"
+
+    def test_dependency_graph_drops_deleted_issue(self, temp_agenttrees_deps):
+        """Deleting an issue directory should remove it from the graph."""
+        import shutil
+        from agenttree.issues import (
+            _get_dependency_graph, check_dependencies_met, evict_issue_paths,
+            get_agenttree_path, get_dependent_issues, get_issue_dir, update_issue_stage,
+        )
+
+        dep = create_issue("Dependency")
+        update_issue_stage(dep.id, "accepted")
+        dependent = create_issue("Dependent", dependencies=[dep.id])
+        assert check_dependencies_met(dependent) == (True, [])
+
+        shutil.rmtree(get_issue_dir(dependent.id))
+        assert get_dependent_issues(dep.id) == []
+
+        # Deletions reach the graph the way a pull reports them
+        dep_dir = get_issue_dir(dep.id)
+        shutil.rmtree(dep_dir)
+        evict_issue_paths(get_agenttree_path(), [f"issues/{dep_dir.name}/issue.yaml"])
+        assert check_dependencies_met(dependent) == (False, [dep.id])
+        assert _get_dependency_graph().stage(dependent.id) is not None
+
+    def test_dependency_queries_do_not_rescan(self, temp_agenttrees_deps, monkeypatch):
+        """Once built, the graph answers queries without a full scan."""
+        from agenttree import issues as issues_mod
+        from agenttree.issues import get_dependent_issues
+
+        base = create_issue("Base")
+        dependent = create_issue("Dependent", dependencies=[base.id])
+        assert [i.id for i in get_dependent_issues(base.id)] == [dependent.id]
+
+        monkeypatch.setattr(
+            issues_mod, "_load_all_issues", MagicMock(side_effect=AssertionError("full scan"))
+        )
+        other = create_issue("Other", dependencies=[base.id])
+        assert [i.id for i in get_dependent_issues(base.id)] == [dependent.id, other.id]
+
+    def test_dependency_graph_find_cycle(self):
+        """find_cycle should honor the proposed edges for the start node."""
+        from agenttree.issues import DependencyGraph
+
+        graph = DependencyGraph()
+        graph.update(1, [2], "backlog")
+        graph.update(2, [3], "backlog")
+        graph.update(3, [], "backlog")
+
+        assert graph.find_cycle(3, [4]) is None
+        assert graph.find_cycle(3, [1]) == [3, 1, 2, 3]
+
 
 class TestUpdateIssueStage:
     """Tests for update_issue_stage function."""
@@ -780,6 +918,71 @@ class TestUpdateIssueStage:
         assert updated.history[-1].stage == "explore.research"
         assert updated.history[-1].agent == 1
 
+    def test_history_split_into_log(self, temp_agenttrees):
+        """issue.yaml keeps the latest entry; history.jsonl has every entry."""
+        import yaml
+
+        issue = create_issue("Test Issue")
+        update_issue_stage("001", "explore.research")
+        update_issue_stage("001", "plan.draft")
+
+        data = yaml.safe_load(issue.dir.joinpath("issue.yaml").read_text())
+        assert [h["stage"] for h in data["history"]] == ["plan.draft"]
+        assert data["history_count"] == 3
+        lines = issue.dir.joinpath("history.jsonl").read_text().splitlines()
+        assert len(lines) == 3
+
+    def test_history_loaded_lazily(self, temp_agenttrees):
+        """Loading an issue doesn't read history.jsonl until history is used."""
+        from unittest.mock import patch
+
+        issue = create_issue("Test Issue")
+        update_issue_stage("001", "explore.research")
+
+        with patch.object(Issue, "_read_history_log", side_effect=AssertionError):
+            loaded = Issue.from_yaml(issue.dir / "issue.yaml")
+            assert loaded.last_history.stage == "explore.research"
+            assert loaded.history_count == 2
+        assert [h.stage for h in loaded.history] == ["explore.define", "explore.research"]
+
+    def test_legacy_inline_history_migrated_on_save(self, temp_agenttrees):
+        """An issue.yaml with the full history inline moves it to history.jsonl."""
+        import yaml
+
+        issue_dir = temp_agenttrees / "issues" / "001"
+        issue_dir.mkdir()
+        yaml_path = issue_dir / "issue.yaml"
+        yaml_path.write_text(yaml.dump({
+            "id": 1,
+            "stage": "plan.draft",
+            "history": [
+                {"stage": "explore.define", "timestamp": "2026-01-01T00:00:00Z"},
+                {"stage": "plan.draft", "timestamp": "2026-01-02T00:00:00Z"},
+            ],
+        }))
+
+        issue = Issue.from_yaml(yaml_path)
+        assert len(issue.history) == 2
+        issue.save()
+
+        reloaded = Issue.from_yaml(yaml_path)
+        assert reloaded.history_count == 2
+        assert [h.stage for h in reloaded.history] == ["explore.define", "plan.draft"]
+        assert len(yaml.safe_load(yaml_path.read_text())["history"]) == 1
+
+    def test_assigning_history_rewrites_log(self, temp_agenttrees):
+        """Replacing history (reset/reimplement) rewrites history.jsonl."""
+        create_issue("Test Issue")
+        update_issue_stage("001", "explore.research")
+
+        issue = get_issue("001")
+        issue.history = [HistoryEntry(stage="backlog", timestamp="2026-01-01T00:00:00Z", type="reset")]
+        issue.save()
+
+        reloaded = Issue.from_yaml(issue.dir / "issue.yaml")
+        assert [h.type for h in reloaded.history] == ["reset"]
+        assert len(issue.dir.joinpath("history.jsonl").read_text().splitlines()) == 1
+
     def test_update_issue_stage_not_found(self, temp_agenttrees):
         """Return None for non-existent issue."""
         result = update_issue_stage("999", "explore.define")
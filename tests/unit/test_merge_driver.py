@@ -0,0 +1,219 @@
+"""Tests for the issue.yaml / history.jsonl merge drivers (agenttree.merge_driver)."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from agenttree.merge_driver import (
+    merge_history_lines,
+    merge_issue_data,
+    register_merge_drivers,
+    run_driver,
+)
+from agenttree.yamlio import yaml_dump, yaml_load
+
+
+def entry(stage, timestamp):
+    return {"stage": stage, "timestamp": timestamp}
+
+
+BASE = {
+    "id": 1,
+    "title": "Login",
+    "updated": "2026-01-01T00:00:00Z",
+    "stage": "explore.define",
+    "labels": ["bug"],
+    "history": [entry("explore.define", "2026-01-01T00:00:00Z")],
+    "history_count": 1,
+}
+
+
+class TestMergeIssueData:
+    def test_fields_changed_on_one_side_each(self):
+        ours = {**BASE, "title": "Login page", "updated": "2026-01-01T00:05:00Z"}
+        theirs = {
+            **BASE,
+            "stage": "explore.research",
+            "history": [entry("explore.research", "2026-01-01T00:03:00Z")],
+            "history_count": 2,
+            "updated": "2026-01-01T00:03:00Z",
+        }
+
+        merged = merge_issue_data(BASE, ours, theirs)
+
+        assert merged["title"] == "Login page"
+        assert merged["stage"] == "explore.research"
+        assert merged["history"] == [entry("explore.research", "2026-01-01T00:03:00Z")]
+        assert merged["history_count"] == 2
+        assert merged["updated"] == "2026-01-01T00:05:00Z"
+
+    def test_both_changed_last_writer_wins(self):
+        ours = {**BASE, "title": "Ours", "updated": "2026-01-01T00:01:00Z"}
+        theirs = {**BASE, "title": "Theirs", "updated": "2026-01-01T00:02:00Z"}
+
+        assert merge_issue_data(BASE, ours, theirs)["title"] == "Theirs"
+        assert merge_issue_data(BASE, theirs, ours)["title"] == "Theirs"
+
+    def test_concurrent_transitions_keep_both_counts(self):
+        ours = {
+            **BASE, "stage": "explore.research", "updated": "2026-01-01T00:01:00Z",
+            "history": [entry("explore.research", "2026-01-01T00:01:00Z")], "history_count": 2,
+        }
+        theirs = {
+            **BASE, "stage": "backlog", "updated": "2026-01-01T00:02:00Z",
+            "history": [entry("backlog", "2026-01-01T00:02:00Z")], "history_count": 2,
+        }
+
+        merged = merge_issue_data(BASE, ours, theirs)
+
+        assert merged["stage"] == "backlog"
+        assert merged["history"] == [entry("backlog", "2026-01-01T00:02:00Z")]
+        assert merged["history_count"] == 3
+
+    def test_label_lists_merge_additions_and_removals(self):
+        ours = {**BASE, "labels": ["ui"]}  # removed bug, added ui
+        theirs = {**BASE, "labels": ["bug", "urgent"]}
+
+        assert merge_issue_data(BASE, ours, theirs)["labels"] == ["ui", "urgent"]
+
+    def test_field_removed_on_one_side(self):
+        base = {**BASE, "processing": "exit"}
+        ours = dict(BASE)  # processing cleared (None fields are omitted)
+        theirs = {**base, "title": "Renamed"}
+
+        merged = merge_issue_data(base, ours, theirs)
+
+        assert "processing" not in merged
+        assert merged["title"] == "Renamed"
+
+
+class TestMergeHistoryLines:
+    def test_union_ordered_by_timestamp(self):
+        base = json.dumps(entry("a", "1")) + "\n"
+        ours = base + json.dumps(entry("c", "3")) + "\n"
+        theirs = base + json.dumps(entry("b", "2")) + "\n" + '{"torn'
+
+        merged = merge_history_lines(base, ours, theirs)
+
+        assert [json.loads(line)["stage"] for line in merged.splitlines()] == ["a", "b", "c"]
+
+
+class TestRunDriver:
+    def test_writes_merge_to_ours(self, tmp_path):
+        paths = [tmp_path / name for name in ("base", "ours", "theirs")]
+        for path, doc in zip(paths, (BASE, {**BASE, "title": "Ours"}, {**BASE, "labels": ["bug", "ui"]})):
+            path.write_text(yaml_dump(doc))
+
+        assert run_driver("issue", *paths) == 0
+        merged = yaml_load(paths[1].read_text())
+        assert (merged["title"], merged["labels"]) == ("Ours", ["bug", "ui"])
+
+    def test_unparseable_falls_back_to_line_merge(self, tmp_path):
+        paths = [tmp_path / name for name in ("base", "ours", "theirs")]
+        for path, text in zip(paths, ("a: 1\n", "a: [\n", "a: 2\n")):
+            path.write_text(text)
+
+        assert run_driver("issue", *paths) != 0
+        assert "<<<<<<<" in paths[1].read_text()
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def agenttree_on_path(tmp_path, monkeypatch):
+    """An `agenttree` console script on PATH that runs this source tree.
+
+    Stands in for the installed entry point, so git can run the driver
+    whether or not agenttree is installed in this environment.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "agenttree"
+    source_root = Path(__file__).resolve().parents[2]
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"sys.path.insert(0, {str(source_root)!r})\n"
+        "from agenttree.cli import main\n"
+        "main()\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return script
+
+
+def test_register_uses_console_script(tmp_path, agenttree_on_path):
+    repo = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+
+    register_merge_drivers(repo)
+    register_merge_drivers(repo)
+
+    assert git(repo, "config", "merge.agenttree-issue.driver") == "agenttree merge-driver issue %O %A %B"
+    attributes = (repo / ".git" / "info" / "attributes").read_text().splitlines()
+    assert attributes == [
+        "issue.yaml merge=agenttree-issue",
+        "history.jsonl merge=agenttree-history",
+        "issues/archive/index.jsonl merge=union",
+    ]
+
+
+@pytest.fixture
+def two_clones(tmp_path, agenttree_on_path):
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    clones = []
+    for name in ("host_a", "host_b"):
+        clone = tmp_path / name
+        subprocess.run(["git", "clone", "-q", str(remote), str(clone)], check=True, capture_output=True)
+        git(clone, "config", "user.email", "t@example.com")
+        git(clone, "config", "user.name", name)
+        register_merge_drivers(clone)
+        clones.append(clone)
+
+    host_a, host_b = clones
+    issue_dir = host_a / "issues" / "001"
+    issue_dir.mkdir(parents=True)
+    (issue_dir / "issue.yaml").write_text(yaml_dump(BASE))
+    (issue_dir / "history.jsonl").write_text(json.dumps(BASE["history"][0]) + "\n")
+    git(host_a, "add", "-A")
+    git(host_a, "commit", "-q", "-m", "Create issue 1")
+    git(host_a, "push", "-q", "origin", "HEAD")
+    git(host_b, "pull", "-q")
+    return host_a, host_b
+
+
+def test_concurrent_hosts_merge_without_conflict(two_clones):
+    host_a, host_b = two_clones
+    transition = entry("explore.research", "2026-01-01T00:03:00Z")
+
+    yaml_a = host_a / "issues" / "001" / "issue.yaml"
+    yaml_a.write_text(yaml_dump({
+        **BASE, "stage": "explore.research", "updated": "2026-01-01T00:03:00Z",
+        "history": [transition], "history_count": 2,
+    }))
+    with open(host_a / "issues" / "001" / "history.jsonl", "a") as f:
+        f.write(json.dumps(transition) + "\n")
+    git(host_a, "commit", "-q", "-am", "Advance issue 1")
+    git(host_a, "push", "-q")
+
+    yaml_b = host_b / "issues" / "001" / "issue.yaml"
+    yaml_b.write_text(yaml_dump({**BASE, "labels": ["bug", "ui"], "updated": "2026-01-01T00:04:00Z"}))
+    git(host_b, "commit", "-q", "-am", "Label issue 1")
+
+    result = subprocess.run(["git", "-C", str(host_b), "pull", "--no-rebase"], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    merged = yaml_load(yaml_b.read_text())
+    assert merged["stage"] == "explore.research"
+    assert merged["labels"] == ["bug", "ui"]
+    assert merged["history_count"] == 2
+    assert "<<<<<<<" not in yaml_b.read_text()
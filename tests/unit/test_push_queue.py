@@ -0,0 +1,125 @@
+"""Tests for background pushes of _agenttree (agenttree.push_queue)."""
+
+import subprocess
+import time
+
+import pytest
+
+from agenttree import push_queue
+from agenttree.agents_repo import sync_agents_repo
+from agenttree.push_queue import (
+    BACKOFF_MAX,
+    PushWorker,
+    backoff_delay,
+    load_push_state,
+    push_now,
+    queue_status,
+    request_push,
+    retry_soon,
+    start_push_worker,
+    stop_push_worker,
+)
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def agents_dir(tmp_path):
+    """A clone of a bare remote with one pushed commit."""
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    local = tmp_path / "_agenttree"
+    subprocess.run(["git", "clone", "-q", str(remote), str(local)], check=True, capture_output=True)
+    git(local, "config", "user.email", "t@example.com")
+    git(local, "config", "user.name", "t")
+    (local / "README.md").write_text("hi\n")
+    git(local, "add", "-A")
+    git(local, "commit", "-q", "-m", "init")
+    git(local, "push", "-q", "-u", "origin", "HEAD")
+    yield local
+    stop_push_worker()
+
+
+def commit_locally(repo, name="note.md"):
+    (repo / name).write_text(name)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", f"Add {name}")
+
+
+def test_backoff_grows_with_jitter_and_caps():
+    for attempts in (1, 2, 5):
+        full = push_queue.BACKOFF_BASE * 2 ** (attempts - 1)
+        assert full / 2 <= backoff_delay(attempts) <= full
+    assert backoff_delay(50) <= BACKOFF_MAX
+
+
+class TestQueue:
+    def test_status_reports_depth_and_oldest_age(self, agents_dir):
+        assert queue_status(agents_dir)["depth"] == 0
+
+        commit_locally(agents_dir, "a.md")
+        commit_locally(agents_dir, "b.md")
+        status = queue_status(agents_dir)
+
+        assert status["depth"] == 2
+        assert 0 <= status["oldest_age_s"] < 60
+
+    def test_push_drains_queue(self, agents_dir):
+        commit_locally(agents_dir)
+
+        assert push_now(agents_dir) is True
+        assert queue_status(agents_dir)["depth"] == 0
+        assert git(agents_dir, "rev-parse", "HEAD") == git(agents_dir, "rev-parse", "@{u}")
+
+    def test_failed_push_backs_off_until_retry_soon(self, agents_dir, tmp_path):
+        commit_locally(agents_dir)
+        git(agents_dir, "remote", "set-url", "origin", str(tmp_path / "missing.git"))
+
+        assert push_now(agents_dir) is False
+        assert push_now(agents_dir) is False
+        status = queue_status(agents_dir)
+        assert status["attempts"] == 2
+        assert status["next_attempt_in_s"] > 0
+        assert status["last_error"]
+
+        retry_soon(agents_dir)
+        assert queue_status(agents_dir)["next_attempt_in_s"] is None
+        assert load_push_state(agents_dir)["attempts"] == 2
+
+
+class TestBackgroundPush:
+    def test_write_sync_queues_push(self, agents_dir, monkeypatch, host_environment):
+        monkeypatch.setenv("AGENTTREE_PUSH_MODE", "background")
+        monkeypatch.setattr("agenttree.agents_repo._last_remote_check", {})
+        requested = []
+        monkeypatch.setattr("agenttree.agents_repo.request_push", requested.append)
+        (agents_dir / "issue.yaml").write_text("id: 1\n")
+
+        assert sync_agents_repo(agents_dir, commit_message="Create issue 1") is True
+
+        assert requested == [agents_dir]
+        assert queue_status(agents_dir)["depth"] == 1
+
+    def test_worker_pushes_when_notified(self, agents_dir):
+        worker = start_push_worker(agents_dir)
+        assert worker is not None
+        commit_locally(agents_dir)
+
+        request_push(agents_dir)
+
+        deadline = time.monotonic() + 5
+        while queue_status(agents_dir)["depth"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert queue_status(agents_dir)["depth"] == 0
+
+    def test_only_one_worker_owns_the_queue(self, agents_dir):
+        first = PushWorker(agents_dir)
+        assert first.start()
+        try:
+            assert not PushWorker(agents_dir).start()
+        finally:
+            first.stop()
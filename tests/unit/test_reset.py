@@ -90,12 +90,12 @@ class TestResetIssue:
                 reset_issue(999, quiet=True)
 
     def test_reset_clears_all_files(self, mock_issue, issue_dir):
-        """Reset should remove all generated files except issue.yaml."""
+        """Reset should remove all generated files except issue.yaml and its history log."""
         with _patch_reset(mock_issue, issue_dir):
             reset_issue(42, quiet=True)
 
-        remaining = [f.name for f in issue_dir.iterdir() if not f.name.startswith(".")]
-        assert remaining == ["issue.yaml"]
+        remaining = sorted(f.name for f in issue_dir.iterdir() if not f.name.startswith("."))
+        assert remaining == ["history.jsonl", "issue.yaml"]
 
     def test_reset_resets_yaml_state(self, mock_issue, issue_dir):
         """Reset should reset issue.yaml to backlog with clean state."""
@@ -187,7 +187,7 @@ class TestNudgeConfig:
         mock_config.manager.nudge_agents = False
 
         with patch("agenttree.config.load_config", return_value=mock_config), \
-             patch("agenttree.issues.list_issues") as mock_list:
+             patch("agenttree.issues.list_issue_summaries") as mock_list:
 
             ensure_stage_agents(tmp_path)
 
@@ -201,7 +201,7 @@ class TestNudgeConfig:
         mock_config.manager.nudge_agents = False
 
         with patch("agenttree.config.load_config", return_value=mock_config), \
-             patch("agenttree.issues.list_issues") as mock_list:
+             patch("agenttree.issues.list_issue_summaries") as mock_list:
 
             check_stalled_agents(tmp_path)
 
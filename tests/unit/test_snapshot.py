@@ -0,0 +1,98 @@
+"""Tests for the shared per-tick heartbeat snapshot (agenttree.snapshot)."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agenttree.events import HEARTBEAT, fire_event
+from agenttree.snapshot import TickSnapshot, issue_dirs
+from agenttree.tmux import TmuxSession
+from agenttree.yamlio import yaml_dump
+
+
+@pytest.fixture
+def agents_dir(tmp_path: Path) -> Path:
+    agents_dir = tmp_path / "_agenttree"
+    for issue_id, stage in ((1, "implement.code"), (2, "implement.review"), (3, "accepted")):
+        issue_dir = agents_dir / "issues" / f"{issue_id:03d}"
+        issue_dir.mkdir(parents=True)
+        (issue_dir / "issue.yaml").write_text(yaml_dump({
+            "id": issue_id, "slug": f"issue-{issue_id}", "title": f"Issue {issue_id}",
+            "created": "2026-01-01T00:00:00Z", "updated": "2026-01-01T00:00:00Z",
+            "stage": stage, "pr_number": 10 + issue_id if issue_id > 1 else None,
+        }))
+    (agents_dir / "issues" / "archive").mkdir()
+    return agents_dir
+
+
+def test_issues_and_stage_filter(agents_dir: Path) -> None:
+    snapshot = TickSnapshot(agents_dir, config=MagicMock())
+
+    assert [i.id for i in snapshot.issues] == [1, 2, 3]
+    assert [d.name for d in snapshot.issue_dirs({"implement.review"})] == ["002"]
+    assert [d.name for d in issue_dirs(agents_dir, snapshot, {"accepted"})] == ["003"]
+    # Without a snapshot every issue directory is visited
+    assert sorted(d.name for d in issue_dirs(agents_dir)) == ["001", "002", "003", "archive"]
+
+
+def test_each_resource_is_read_once(agents_dir: Path) -> None:
+    sessions = [TmuxSession(name="proj-developer-001", windows=1, attached=False)]
+    with patch("agenttree.tmux.list_sessions", return_value=sessions) as list_sessions, \
+            patch("agenttree.container.list_running_container_names",
+                  return_value=["agenttree-proj-001-ab12"]) as list_containers:
+        snapshot = TickSnapshot(agents_dir, config=MagicMock())
+        for _ in range(3):
+            assert snapshot.session_exists("proj-developer-001")
+            assert not snapshot.session_exists("proj-developer-00")
+            assert snapshot.container_running("agenttree-proj-001")
+
+    assert list_sessions.call_count == 1
+    assert list_containers.call_count == 1
+
+
+def test_fire_event_shares_one_snapshot(
+    agents_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from agenttree import actions
+
+    seen: list[TickSnapshot] = []
+
+    def action(agents_dir: Path, _snapshot: TickSnapshot, **kwargs) -> None:
+        seen.append(_snapshot)
+        _snapshot.session_exists("x")
+
+    for name in ("a", "b", "c"):
+        monkeypatch.setitem(actions.ACTION_REGISTRY, name, action)
+    config = MagicMock()
+    config.model_dump.return_value = {"on": {"heartbeat": {"actions": ["a", "b", "c"]}}}
+
+    with patch("agenttree.config.load_config", return_value=config), \
+            patch("agenttree.tmux.list_sessions", return_value=[]) as list_sessions:
+        results = fire_event(HEARTBEAT, agents_dir, heartbeat_count=1)
+
+    assert results["actions_run"] == 3
+    assert len({id(s) for s in seen}) == 1
+    assert seen[0].config is config
+    assert list_sessions.call_count == 1
+
+
+def test_ci_scan_reads_only_matching_issues(agents_dir: Path) -> None:
+    from agenttree.agents_repo import check_ci_status
+    from agenttree.issues import Issue
+
+    read: list[str] = []
+    real_from_yaml = Issue.from_yaml
+
+    def tracking_from_yaml(path):
+        read.append(Path(path).parent.name)
+        return real_from_yaml(path)
+
+    snapshot = TickSnapshot(agents_dir, config=MagicMock())
+    snapshot.issues  # scanned once, up front
+    with patch("agenttree.environment.is_running_in_container", return_value=False), \
+            patch.object(Issue, "from_yaml", side_effect=tracking_from_yaml), \
+            patch("agenttree.github.get_pr_checks", return_value=[]):
+        check_ci_status(agents_dir, snapshot=snapshot)
+
+    assert read == ["002"]
@@ -0,0 +1,94 @@
+"""Tests for sparse, partial clones of _agenttree (agenttree.sparse_checkout)."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agenttree.sparse_checkout import (
+    CLONE_ARGS,
+    ensure_issue_materialized,
+    init_sparse_checkout,
+    is_sparse,
+    sparse_patterns,
+)
+from agenttree.yamlio import yaml_dump
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """A bare remote holding one active and one accepted issue."""
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    git(remote, "config", "uploadpack.allowfilter", "true")
+
+    seed = tmp_path / "seed"
+    subprocess.run(["git", "clone", "-q", str(remote), str(seed)], check=True, capture_output=True)
+    git(seed, "config", "user.email", "t@example.com")
+    git(seed, "config", "user.name", "t")
+    (seed / "README.md").write_text("notes\n")
+    (seed / "skills").mkdir()
+    (seed / "skills" / "implement.md").write_text("implement\n")
+    for dir_name, stage in (("001", "implement.code"), ("002", "accepted")):
+        issue_dir = seed / "issues" / dir_name
+        issue_dir.mkdir(parents=True)
+        (issue_dir / "issue.yaml").write_text(yaml_dump({"id": int(dir_name), "stage": stage}))
+        (issue_dir / "spec.md").write_text(f"spec {dir_name}\n")
+    git(seed, "add", "-A")
+    git(seed, "commit", "-q", "-m", "init")
+    git(seed, "push", "-q", "origin", "HEAD")
+    return remote
+
+
+@pytest.fixture
+def sparse_clone(remote, tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    shutil.copy(Path(__file__).parents[2] / ".agenttree.yaml", project)  # defines "accepted"
+    agents_dir = project / "_agenttree"
+    subprocess.run(
+        ["git", "clone", "-q", *CLONE_ARGS, f"file://{remote}", str(agents_dir)],
+        check=True,
+        capture_output=True,
+    )
+    assert init_sparse_checkout(agents_dir)
+    return agents_dir
+
+
+def test_patterns_add_issue_dirs():
+    assert sparse_patterns(["002", "001"])[-2:] == ["/issues/001/", "/issues/002/"]
+
+
+def test_clone_materializes_active_issues_only(sparse_clone):
+    assert is_sparse(sparse_clone)
+    assert (sparse_clone / "README.md").exists()
+    assert (sparse_clone / "skills" / "implement.md").exists()
+    assert (sparse_clone / "issues" / "001" / "spec.md").exists()
+    # Finished issues keep their issue.yaml so they still show in listings
+    assert (sparse_clone / "issues" / "002" / "issue.yaml").exists()
+    assert not (sparse_clone / "issues" / "002" / "spec.md").exists()
+
+
+def test_archived_issue_fetched_on_demand(sparse_clone):
+    issue_dir = sparse_clone / "issues" / "002"
+
+    ensure_issue_materialized(issue_dir)
+
+    assert (issue_dir / "spec.md").read_text() == "spec 002\n"
+
+
+def test_full_clone_is_untouched(remote, tmp_path):
+    agents_dir = tmp_path / "full"
+    subprocess.run(["git", "clone", "-q", str(remote), str(agents_dir)], check=True, capture_output=True)
+
+    ensure_issue_materialized(agents_dir / "issues" / "002")
+
+    assert not is_sparse(agents_dir)
+    assert not (agents_dir / ".git" / "info" / "sparse-checkout").exists()
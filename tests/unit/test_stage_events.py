@@ -0,0 +1,121 @@
+"""Tests for stage transition events (agenttree.stage_events)."""
+
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agenttree.stage_events import (
+    JOURNAL_FILENAME,
+    StageEventDispatcher,
+    StageTransition,
+    handle_transitions,
+    publish,
+    subscribe,
+    take_journal,
+)
+from agenttree.yamlio import yaml_dump
+
+
+def transition(issue_id: int, to_stage: str, from_stage: str = "implement.code") -> StageTransition:
+    return StageTransition(
+        issue_id=issue_id, dir_name=f"{issue_id:03d}", from_stage=from_stage,
+        to_stage=to_stage, timestamp="2026-01-01T00:00:00Z",
+    )
+
+
+@pytest.fixture
+def agents_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    shutil.copy(Path(__file__).parents[2] / ".agenttree.yaml", project)  # defines the stages
+    monkeypatch.chdir(project)
+    agents_dir = project / "_agenttree"
+    for issue_id, stage in ((1, "implement.code"), (2, "implement.review"), (3, "implement.review")):
+        issue_dir = agents_dir / "issues" / f"{issue_id:03d}"
+        issue_dir.mkdir(parents=True)
+        (issue_dir / "issue.yaml").write_text(yaml_dump({
+            "id": issue_id, "slug": f"issue-{issue_id}", "title": f"Issue {issue_id}",
+            "created": "2026-01-01T00:00:00Z", "updated": "2026-01-01T00:00:00Z", "stage": stage,
+        }))
+    return agents_dir
+
+
+def test_publish_journals_and_notifies(agents_dir: Path) -> None:
+    subprocess.run(["git", "init", "-q", str(agents_dir)], check=True)
+    seen: list[StageTransition] = []
+    unsubscribe = subscribe(seen.append)
+    try:
+        publish(agents_dir, transition(1, "implement.review"))
+    finally:
+        unsubscribe()
+    publish(agents_dir, transition(2, "accepted"))
+
+    assert [t.issue_id for t in seen] == [1]
+    assert [t.to_stage for t in take_journal(agents_dir)] == ["implement.review", "accepted"]
+    assert take_journal(agents_dir) == []
+    assert JOURNAL_FILENAME in (agents_dir / ".git" / "info" / "exclude").read_text().splitlines()
+
+
+def test_update_issue_stage_publishes(agents_dir: Path) -> None:
+    from agenttree.issues import update_issue_stage
+
+    seen: list[StageTransition] = []
+    unsubscribe = subscribe(seen.append)
+    try:
+        update_issue_stage(1, "implement.review", skip_sync=True, _issue_dir=agents_dir / "issues" / "001")
+    finally:
+        unsubscribe()
+
+    assert [(t.issue_id, t.from_stage, t.to_stage) for t in seen] == [
+        (1, "implement.code", "implement.review")
+    ]
+    assert [t.dir_name for t in take_journal(agents_dir)] == ["001"]
+
+
+def test_reactions_see_only_relevant_issues(agents_dir: Path) -> None:
+    calls: dict[str, list[int]] = {}
+
+    def record(name: str):
+        def scan(agents_dir: Path, snapshot) -> int:
+            calls[name] = [i.id for i in snapshot.issues]
+            return len(calls[name])
+        return scan
+
+    with patch("agenttree.agents_repo.check_manager_stages", record("check_manager_stages")), \
+            patch("agenttree.agents_repo.check_custom_agent_stages", record("check_custom_agent_stages")), \
+            patch("agenttree.agents_repo.ensure_review_branches", record("ensure_review_branches")):
+        assert handle_transitions(agents_dir, [transition(1, "implement.code", "explore.define")]) == {}
+
+        results = handle_transitions(agents_dir, [transition(2, "implement.review")])
+        assert results == {"check_manager_stages": 1, "ensure_review_branches": 1}
+        assert calls["check_manager_stages"] == [2]
+
+        # A completed issue moved main: every issue in review is rechecked
+        calls.clear()
+        handle_transitions(agents_dir, [transition(1, "accepted", "implement.review")])
+        assert sorted(calls["ensure_review_branches"]) == [1, 2, 3]
+
+
+def test_dispatcher_reacts_without_waiting_for_poll(agents_dir: Path) -> None:
+    handled = threading.Event()
+    batches: list[list[StageTransition]] = []
+
+    def fake_handle(agents_dir: Path, transitions: list[StageTransition]) -> dict[str, int]:
+        batches.append(transitions)
+        handled.set()
+        return {}
+
+    with patch("agenttree.stage_events.handle_transitions", fake_handle):
+        dispatcher = StageEventDispatcher(agents_dir, poll_s=60)
+        dispatcher.start()
+        try:
+            publish(agents_dir, transition(2, "implement.review"))
+            assert handled.wait(5)
+        finally:
+            dispatcher.stop()
+
+    assert [t.issue_id for t in batches[0]] == [2]
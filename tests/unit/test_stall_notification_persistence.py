@@ -31,7 +31,7 @@ def _make_issue(issue_id: int = 42, stage: str = "implement.code",
     history_entry.timestamp = _timestamp_ago(minutes_ago)
     return MagicMock(
         id=issue_id, title="Test Issue", stage=stage,
-        history=[history_entry],
+        last_history=history_entry,
     )
 
 
@@ -69,7 +69,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_stall_counts_persist_to_disk_after_fire_event(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -96,7 +96,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_stall_counts_accumulate_across_multiple_fire_events(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -136,7 +136,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_stops_alerting_after_max_notifications_across_fire_events(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -179,7 +179,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_other_actions_dont_clobber_stall_state(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -212,7 +212,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_intermediate_heartbeats_preserve_stall_state(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -264,7 +264,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_multiple_issues_tracked_independently(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -295,7 +295,7 @@ class TestStallNotificationPersistenceThroughFireEvent:
 
     @patch("agenttree.tmux.send_message", return_value="sent")
     @patch("agenttree.tmux.session_exists")
-    @patch("agenttree.issues.list_issues")
+    @patch("agenttree.snapshot._load_issues")
     @patch("agenttree.config.load_config")
     def test_stage_change_resets_count_through_fire_event(
         self, mock_load_config: MagicMock, mock_list: MagicMock,
@@ -0,0 +1,184 @@
+"""Tests for the shared sync service (agenttree.sync_service)."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from agenttree.agents_repo import sync_agents_repo
+from agenttree.sync_service import (
+    SOCKET_NAME,
+    SyncService,
+    request_sync,
+    start_sync_service,
+    stop_sync_service,
+)
+
+
+@pytest.fixture
+def agents_dir(tmp_path):
+    path = tmp_path / "_agenttree"
+    (path / ".git").mkdir(parents=True)
+    yield path
+    stop_sync_service()
+
+
+@pytest.fixture
+def inline_calls(monkeypatch):
+    """Record inline syncs instead of running git."""
+    calls = []
+
+    def fake_sync(agents_dir, pull_only=False, commit_message=None, wait=None, paths=None, fresh=False):
+        calls.append((pull_only, commit_message))
+        time.sleep(0.05)
+        return True
+
+    monkeypatch.setattr("agenttree.agents_repo._sync_inline", fake_sync)
+    return calls
+
+
+class TestSyncService:
+    def test_concurrent_requests_share_one_batch(self, agents_dir, inline_calls):
+        service = SyncService(agents_dir, debounce=0.3)
+        assert service.start()
+        try:
+            results = []
+            threads = [
+                threading.Thread(target=lambda i=i: results.append(
+                    request_sync(agents_dir, pull_only=False, commit_message=f"Update issue {i}")
+                ))
+                for i in range(3)
+            ] + [
+                threading.Thread(target=lambda: results.append(request_sync(agents_dir, pull_only=True)))
+                for _ in range(3)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(5)
+
+            assert results == [True] * 6
+            assert len(inline_calls) == 1
+            pull_only, message = inline_calls[0]
+            assert pull_only is False
+            assert message.startswith("Auto-sync: 3 updates")
+            assert all(f"Update issue {i}" in message for i in range(3))
+        finally:
+            service.stop()
+
+    def test_writer_returns_before_batch_runs(self, agents_dir, inline_calls):
+        service = SyncService(agents_dir, debounce=0.5)
+        assert service.start()
+        try:
+            assert request_sync(agents_dir, pull_only=False, commit_message="Create issue 1") is True
+            assert inline_calls == []
+        finally:
+            service.stop()
+        # Pending work is flushed on stop
+        assert inline_calls == [(False, "Create issue 1")]
+
+    def test_reader_waits_for_fresh_pull(self, agents_dir, inline_calls):
+        service = SyncService(agents_dir, debounce=0.05)
+        assert service.start()
+        try:
+            assert request_sync(agents_dir, pull_only=True) is True
+            assert inline_calls == [(True, None)]
+        finally:
+            service.stop()
+
+    def test_reader_batch_skips_min_interval(self, agents_dir, monkeypatch):
+        """A recent sync in this process doesn't stand in for a reader's pull."""
+        pulls = []
+        monkeypatch.setattr("agenttree.agents_repo._checked_remote_recently", lambda agents_dir: True)
+        monkeypatch.setattr(
+            "agenttree.agents_repo._run_git_sync",
+            lambda agents_dir, pull_only, commit_message, paths=None: pulls.append(pull_only) or True,
+        )
+        service = SyncService(agents_dir)
+
+        service._run_batch([service.submit(True, None, None)])
+
+        assert pulls == [True]
+
+    def test_second_service_does_not_start(self, agents_dir, inline_calls):
+        first = SyncService(agents_dir)
+        assert first.start()
+        try:
+            assert not SyncService(agents_dir).start()
+        finally:
+            first.stop()
+        assert not (agents_dir / SOCKET_NAME).exists()
+
+    def test_stale_socket_is_replaced(self, agents_dir, inline_calls):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(agents_dir / SOCKET_NAME))
+        stale.close()
+
+        assert request_sync(agents_dir, pull_only=True) is None
+        service = SyncService(agents_dir, debounce=0.05)
+        assert service.start()
+        service.stop()
+
+
+@pytest.mark.usefixtures("host_environment")
+class TestSyncAgentsRepoDelegation:
+    def test_inline_without_service(self, agents_dir, inline_calls):
+        assert sync_agents_repo(agents_dir, pull_only=True) is True
+        assert inline_calls == [(True, None)]
+
+    def test_delegates_to_running_service(self, agents_dir, inline_calls):
+        service = start_sync_service(agents_dir, debounce=0.2)
+        assert service is not None
+
+        assert sync_agents_repo(agents_dir, commit_message="Create issue 1") is True
+        assert sync_agents_repo(agents_dir, commit_message="Create issue 2") is True
+        assert sync_agents_repo(agents_dir, pull_only=True) is True
+
+        assert service.requests == 3
+        assert service.batches == 1
+        assert len(inline_calls) == 1
+
+    def test_registrations_are_per_thread_and_restored_on_failure(
+        self, agents_dir, monkeypatch
+    ):
+        from agenttree.agents_repo import register_touched_paths
+
+        monkeypatch.setattr("agenttree.agents_repo._touched_paths", threading.local())
+        committed = []
+        results = iter([False, True])
+
+        def fake_sync(agents_dir, pull_only=False, commit_message=None, wait=None, paths=None, fresh=False):
+            committed.append(paths)
+            return next(results)
+
+        monkeypatch.setattr("agenttree.agents_repo._sync_inline", fake_sync)
+        issue_yaml = agents_dir / "issues" / "001" / "issue.yaml"
+        other = threading.Thread(
+            target=register_touched_paths, args=(agents_dir, agents_dir / "issues" / "002" / "issue.yaml")
+        )
+        other.start()
+        other.join()
+        register_touched_paths(agents_dir, issue_yaml)
+
+        assert sync_agents_repo(agents_dir, commit_message="Update issue 1") is False
+        assert sync_agents_repo(agents_dir, commit_message="Update issue 1") is True
+        assert committed == [["issues/001/issue.yaml"]] * 2
+
+
+def test_failed_batch_paths_carried_to_next_batch(agents_dir, monkeypatch):
+    committed = []
+    results = iter([False, True])
+
+    def fake_sync(agents_dir, pull_only=False, commit_message=None, wait=None, paths=None, fresh=False):
+        committed.append(paths)
+        return next(results)
+
+    monkeypatch.setattr("agenttree.agents_repo._sync_inline", fake_sync)
+    service = SyncService(agents_dir)
+    service._run_batch([service.submit(False, "Update issue 1", ["issues/001/issue.yaml"])])
+    service._run_batch([service.submit(False, "Update issue 2", ["issues/002/issue.yaml"])])
+
+    assert committed == [
+        ["issues/001/issue.yaml"], ["issues/001/issue.yaml", "issues/002/issue.yaml"],
+    ]
@@ -48,7 +48,7 @@ def mock_issue():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "default"
-    mock.history = []  # Empty history for time_in_stage calculation
+    mock.last_history = None  # No history: time_in_stage falls back to 0m
     return mock
 
 
@@ -71,7 +71,7 @@ def mock_review_issue():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "default"
-    mock.history = []  # Empty history for time_in_stage calculation
+    mock.last_history = None  # No history: time_in_stage falls back to 0m
     return mock
 
 
@@ -87,6 +87,21 @@ class TestHealthCheck:
         assert data["status"] == "healthy"
         assert data["service"] == "agenttree-web"
 
+    def test_health_check_reports_heartbeat_stats(self, client, monkeypatch):
+        """Health check includes heartbeat tick statistics once running."""
+        from agenttree.heartbeat import HeartbeatStats
+        from agenttree.web import app as app_module
+
+        stats = HeartbeatStats(10)
+        stats.record(12.0, skipped=1)
+        monkeypatch.setattr(app_module, "_heartbeat_stats", stats)
+
+        heartbeat = client.get("/health").json()["heartbeat"]
+
+        assert heartbeat["ticks"] == 1
+        assert heartbeat["overruns"] == 1
+        assert heartbeat["duration_histogram"]["30"] == 1
+
 
 class TestRootRedirect:
     """Tests for root redirect."""
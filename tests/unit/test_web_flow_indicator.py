@@ -58,7 +58,7 @@ class TestConvertIssueToWebFlow:
         mock.processing = None
         mock.ci_escalated = False
         mock.flow = "default"
-        mock.history = []
+        mock.last_history = None
         return mock
 
     @patch("agenttree.web.utils.agent_manager")
@@ -30,7 +30,7 @@ def mock_issue_default_flow():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "default"
-    mock.history = [Mock(timestamp="2024-01-01T00:00:00Z")]
+    mock.last_history = Mock(timestamp="2024-01-01T00:00:00Z")
     return mock
 
 
@@ -53,7 +53,7 @@ def mock_issue_quick_flow():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "quick"
-    mock.history = [Mock(timestamp="2024-01-02T00:00:00Z")]
+    mock.last_history = Mock(timestamp="2024-01-02T00:00:00Z")
     return mock
 
 
@@ -76,7 +76,7 @@ def mock_issue_backlog():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "default"
-    mock.history = [Mock(timestamp="2024-01-03T00:00:00Z")]
+    mock.last_history = Mock(timestamp="2024-01-03T00:00:00Z")
     return mock
 
 
@@ -40,7 +40,7 @@ def mock_issue():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "default"
-    mock.history = []
+    mock.last_history = None
     return mock
 
 
@@ -62,7 +62,7 @@ def mock_issue_with_agent():
     mock.processing = None
     mock.ci_escalated = False
     mock.flow = "default"
-    mock.history = []
+    mock.last_history = None
     return mock
 
 
@@ -0,0 +1,100 @@
+"""Tests for agenttree.yamlio YAML backend selection."""
+
+import io
+from enum import Enum
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from agenttree import yamlio
+from agenttree.yamlio import _is_plain, yaml_dump, yaml_load
+
+
+def reference_dump(data):
+    return yaml.dump(data, default_flow_style=False, sort_keys=False)
+
+
+ISSUE_LIKE = {
+    "id": 42,
+    "slug": "fix-login",
+    "title": "Fix login: handle 'quoted' values & #hashes",
+    "stage": "implement.code",
+    "labels": ["bug", "yes", "null", "1.0"],
+    "dependencies": [],
+    "history": [{"stage": "explore", "timestamp": "2025-01-01T00:00:00Z", "agent": 1}],
+    "ci_escalated": False,
+    "score": 0.5,
+    "pr_number": None,
+}
+
+
+class TestYamlDump:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            ISSUE_LIKE,
+            {"title": "x" * 500},
+            {"notes": "line one\nline two \n"},
+            {"title": "café — ✓ " * 20},
+            {"tab": "a\tb" * 40, "cr": "a\rb"},
+            {"k" * 200: 1, "": "empty key"},
+            {"nested": {"deep": [{"a": [1, 2, {"b": "c"}]}]}},
+        ],
+    )
+    def test_matches_pure_python_output(self, data):
+        assert yaml_dump(data) == reference_dump(data)
+
+    def test_sort_keys(self):
+        data = {"b": 1, "a": 2}
+        assert yaml_dump(data, sort_keys=True) == "a: 2\nb: 1\n"
+
+    def test_writes_to_stream(self):
+        buf = io.StringIO()
+        assert yaml_dump({"a": 1}, buf) is None
+        assert buf.getvalue() == "a: 1\n"
+
+    def test_falls_back_without_libyaml(self):
+        with patch.object(yamlio, "_FastDumper", None):
+            assert yaml_dump(ISSUE_LIKE) == reference_dump(ISSUE_LIKE)
+
+
+class TestIsPlain:
+    def test_issue_data_is_plain(self):
+        assert _is_plain(ISSUE_LIKE)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"a": "multi\nline"},
+            {"a": "café"},
+            {"": 1},
+            {"k" * 128: 1},
+            {"a": (1, 2)},
+        ],
+    )
+    def test_rejects_divergent_data(self, data):
+        assert not _is_plain(data)
+
+    def test_rejects_str_subclasses(self):
+        class Color(str, Enum):
+            RED = "red"
+
+        assert not _is_plain({"color": Color.RED})
+
+    def test_rejects_shared_containers(self):
+        shared = ["x"]
+        assert not _is_plain({"a": shared, "b": shared})
+
+
+class TestYamlLoad:
+    def test_safe_semantics(self):
+        with pytest.raises(yaml.YAMLError):
+            yaml_load("a: !!python/object/apply:os.system ['true']\n")
+
+    def test_round_trip(self):
+        assert yaml_load(yaml_dump(ISSUE_LIKE)) == ISSUE_LIKE
+
+    def test_falls_back_without_libyaml(self):
+        with patch.object(yamlio, "_FastLoader", yaml.SafeLoader):
+            assert yaml_load("a: [1, 2]\n") == {"a": [1, 2]}